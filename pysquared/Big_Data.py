@@ -1,16 +1,22 @@
-import gc
+from __future__ import annotations
 
-import lib.adafruit_tca9548a as adafruit_tca9548a  # I2C Multiplexer
+import gc
 
 from .logger import Logger
 
 try:
-    from typing import Union
+    from typing import Callable, Optional, Union
+
+    import lib.adafruit_tca9548a as adafruit_tca9548a  # I2C Multiplexer
 
 except Exception:
     pass
 
 
+# I2C address of each face sensor, used to skip sensors missing from a channel scan
+SENSOR_ADDRESSES: dict[str, int] = {"MCP": 0x1B, "VEML": 0x10, "DRV": 0x5A}
+
+
 class Face:
     def __init__(
         self, add: int, pos: str, tca: adafruit_tca9548a.TCA9548A, logger: Logger
@@ -39,9 +45,23 @@ class Face:
         self.mcp = None
         self.veml = None
         self.drv = None
-
-    def sensor_init(self, senlist, address) -> None:
+        # addresses of the channel scan the sensors were last initialized from
+        self.devices: Optional[list[int]] = None
+
+    def sensor_init(
+        self, senlist, address, devices: Optional[list[int]] = None
+    ) -> bool:
+        """
+        :param devices: Addresses found on the face's TCA channel, sensors not in it are not initialized.
+            Every sensor is tried when None.
+
+        :return bool: False if a sensor that was tried failed to initialize.
+        """
         gc.collect()  # Force garbage collection before initializing sensors
+        ok: bool = True
+
+        if devices is not None:
+            senlist = [s for s in senlist if SENSOR_ADDRESSES[s] in devices]
 
         if "MCP" in senlist:
             try:
@@ -53,6 +73,7 @@ class Face:
                 self.sensors["MCP"] = True
             except Exception as e:
                 self.logger.error("Error Initializing Temperature Sensor", e)
+                ok = False
 
         if "VEML" in senlist:
             try:
@@ -64,6 +85,7 @@ class Face:
                 self.sensors["VEML"] = True
             except Exception as e:
                 self.logger.error("Error Initializing Light Sensor", e)
+                ok = False
 
         if "DRV" in senlist:
             try:
@@ -75,15 +97,27 @@ class Face:
                 self.sensors["DRV"] = True
             except Exception as e:
                 self.logger.error("Error Initializing Motor Driver", e)
+                ok = False
 
         gc.collect()  # Clean up after initialization
+        return ok
 
 
 class AllFaces:
-    def __init__(self, tca: adafruit_tca9548a.TCA9548A, logger: Logger) -> None:
+    def __init__(
+        self,
+        tca: adafruit_tca9548a.TCA9548A,
+        logger: Logger,
+        device_map: Optional[list[Optional[list[int]]]] = None,
+    ) -> None:
+        """
+        :param device_map: Cached addresses found on each TCA channel, sensors missing from it are skipped.
+        """
         self.tca: adafruit_tca9548a.TCA9548A = tca
         self.faces: list[Face] = []
         self.logger: Logger = logger
+        # channels with a sensor that failed to initialize or read
+        self.failed_channels: set[int] = set()
 
         # Create faces using a loop instead of individual variables
         positions: list[tuple[str, int]] = [
@@ -95,13 +129,51 @@ class AllFaces:
         ]
         for pos, addr in positions:
             face: Face = Face(addr, pos, tca, self.logger)
-            face.sensor_init(face.senlist, face.address)
             self.faces.append(face)
+            self.refresh_face(addr, device_map[addr] if device_map else None)
             gc.collect()  # Clean up after each face initialization
 
+    def refresh_face(self, channel: int, devices: Optional[list[int]] = None) -> None:
+        """
+        Initialize the sensors of one face again, usually after its channel was re-scanned.
+
+        :param int channel: TCA channel of the face.
+        :param devices: Addresses found on the channel.
+        """
+        face: Face = self.faces[channel]
+        face.sensors = {sensor: False for sensor in face.senlist}
+        face.devices = devices
+        if face.sensor_init(face.senlist, face.address, devices):
+            self.failed_channels.discard(channel)
+        else:
+            self.failed_channels.add(channel)
+
+    def refresh(
+        self,
+        devices: Callable[[int], list[int]],
+        invalidate: Callable[[int], None],
+        progress: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Re-initialize the faces whose channel failed a read or whose device map changed.
+
+        :param devices: Returns the addresses on a channel, re-scanning it if its map is missing or stale.
+        :param invalidate: Drops the device map of a channel so the next `devices` call re-scans it.
+        :param progress: Called after each face that was re-initialized.
+        """
+        for channel, face in enumerate(self.faces):
+            failed: bool = channel in self.failed_channels
+            if failed:
+                invalidate(channel)
+            current: list[int] = devices(channel)
+            if failed or current != face.devices:
+                self.refresh_face(channel, current)
+                if progress is not None:
+                    progress()
+
     def face_test_all(self) -> list[list[float]]:
         results: list[list[float]] = []
-        for face in self.faces:
+        for channel, face in enumerate(self.faces):
             if face:
                 try:
                     temp: Union[float, None] = (
@@ -112,5 +184,6 @@ class AllFaces:
                     )
                     results.append([temp, light])
                 except Exception:
+                    self.failed_channels.add(channel)
                     results.append([None, None])
         return results
@@ -0,0 +1,87 @@
+"""
+Records how long each piece of hardware takes to bring up.
+
+Durations are measured with `time.monotonic_ns` and kept per hardware key
+together with the number of attempts and whether the last one succeeded. The
+results are small enough to downlink as a compact text table.
+"""
+
+import time
+
+try:
+    from typing import Optional
+except ImportError:
+    pass
+
+# Key of the entry timing the whole boot, which contains every other entry
+BOOT_KEY = "boot"
+
+
+class BootProfiler:
+    """
+    Per device timing of hardware initialization.
+    """
+
+    def __init__(self) -> None:
+        # hardware key -> [total duration in ns, attempts, last attempt succeeded]
+        self._entries: dict[str, list] = {}
+        self._order: list[str] = []
+
+    def start(self) -> int:
+        """
+        Timestamp to pass to `record` once the work is done.
+        """
+        return time.monotonic_ns()
+
+    def record(self, key: str, start_ns: int, success: bool = True) -> None:
+        """
+        Add an attempt that started at `start_ns` to the entry of a key.
+        """
+        duration = time.monotonic_ns() - start_ns
+        entry: Optional[list] = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = [duration, 1, success]
+            self._order.append(key)
+        else:
+            entry[0] += duration
+            entry[1] += 1
+            entry[2] = success
+
+    def entries(self) -> list[tuple[str, int, int, bool]]:
+        """
+        The entries in the order they were first recorded.
+
+        :return list: Tuples of key, duration in ms, attempts and success.
+        """
+        result = []
+        for key in self._order:
+            duration, attempts, success = self._entries[key]
+            result.append((key, duration // 1000000, attempts, success))
+        return result
+
+    def total_ms(self) -> int:
+        """
+        Duration of the whole boot when it was recorded, else the sum of the entries.
+        """
+        boot: Optional[list] = self._entries.get(BOOT_KEY)
+        if boot is not None:
+            return boot[0] // 1000000
+        return sum(entry[0] for entry in self._entries.values()) // 1000000
+
+    def table(self) -> str:
+        """
+        Compact table for telemetry, `key:ms` per entry with `xN` for N attempts and `!` for a failure.
+        """
+        parts = []
+        for key, duration_ms, attempts, success in self.entries():
+            part = f"{key}:{duration_ms}"
+            if attempts > 1:
+                part += f"x{attempts}"
+            if not success:
+                part += "!"
+            parts.append(part)
+        return ",".join(parts)
+
+    def reset(self) -> None:
+        self._entries = {}
+        self._order = []
@@ -1,20 +1,35 @@
+from __future__ import annotations
+
+import json
 import random
+import struct
 import time
 
+from micropython import const
+
+from .config.compiled import StringTable
 from .config.config import Config
-from .hardware.rfm9x.manager import RFM9xManager
+from .file_reader import file_crc32
 from .hardware.rfm9x.modulation import RFM9xModulation
+from .log import store
 from .logger import Logger
-from .pysquared import Satellite
 
 try:
-    from typing import Any, Union
+    from typing import Any, Optional, Union
 
     import circuitpython_typing
+
+    from .hardware.rfm9x.manager import RFM9xManager
+    from .packet_sender import PacketSender
+    from .pysquared import Satellite
 except Exception:
     pass
 
 
+# Most log records sent in reply to a single query
+MAX_QUERY_RECORDS = const(256)
+
+
 class CommandDataHandler:
     """
     Constructor
@@ -25,6 +40,7 @@ class CommandDataHandler:
         config: Config,
         logger: Logger,
         radio_manager: RFM9xManager,
+        packet_sender: Optional[PacketSender] = None,
     ) -> None:
         self.logger: Logger = logger
         self._commands: dict[bytes, str] = {
@@ -34,17 +50,36 @@ class CommandDataHandler:
             b"8\x93": "query",
             b"\x96\xa2": "exec_cmd",
             b"\xa5\xb4": "joke_reply",
-            b"\x56\xc4": "FSK",
+            b"\x56\xc4": "fsk",
+            b"\x1c\x4c": "query_logs",
+            b"\x3c\x21": "set_config",
+            b"\x42\x50": "boot_profile",
+            b"\x54\x42": "tracebacks",
+            b"\x54\x4d": "downlink_telemetry",
+            b"\x46\x44": "downlink_file",
+            b"\x46\x43": "file_checksum",
         }
-        self._joke_reply: list[str] = config.joke_reply
+        self._config: Config = config
+        self._joke_reply: Union[list[str], StringTable] = config.joke_reply
         self._super_secret_code: bytes = config.super_secret_code.encode("utf-8")
         self._repeat_code: bytes = config.repeat_code.encode("utf-8")
+        config.subscribe("super_secret_code", self._on_code_change)
+        config.subscribe("repeat_code", self._on_code_change)
         self.logger.info(
             "The satellite has a super secret code!",
             super_secret_code=self._super_secret_code,
         )
 
         self.radio_manager = radio_manager
+        self.packet_sender = packet_sender
+
+    def _on_code_change(self, key: str, value: str) -> None:
+        setattr(self, "_" + key, value.encode("utf-8"))
+
+    def _report_progress(self) -> None:
+        # long commands keep the task running them checked in with the watchdog
+        if self.packet_sender is not None and self.packet_sender.progress is not None:
+            self.packet_sender.progress()
 
     ############### hot start helper ###############
     def hotstart_handler(self, cubesat: Satellite, msg: Any) -> None:
@@ -68,48 +103,47 @@ class CommandDataHandler:
     def message_handler(self, cubesat: Satellite, msg: bytearray) -> None:
         multi_msg: bool = False
         if len(msg) >= 10:  # [RH header 4 bytes] [pass-code(4 bytes)] [cmd 2 bytes]
-            if bytes(msg[4:8]) == self._super_secret_code:
-                # check if multi-message flag is set
-                if msg[3] & 0x08:
-                    multi_msg = True
-                # strip off RH header
-                msg: bytes = bytes(msg[4:])
-                cmd: bytes = msg[4:6]  # [pass-code(4 bytes)] [cmd 2 bytes] [args]
-                cmd_args: Union[bytes, None] = None
-                if len(msg) > 6:
-                    self.logger.info("This is a command with args")
-                try:
-                    cmd_args = msg[6:]  # arguments are everything after
-                    self.logger.info(
-                        "Here are the command arguments", cmd_args=cmd_args
-                    )
-                except Exception as e:
-                    self.logger.error("There was an error decoding the arguments", e)
+            if bytes(msg[4:8]) != self._super_secret_code:
+                self.logger.info("bad code?")
+                return
+
+            # check if multi-message flag is set
+            if msg[3] & 0x08:
+                multi_msg = True
+            # strip off RH header
+            msg: bytes = bytes(msg[4:])
+            cmd: bytes = msg[4:6]  # [pass-code(4 bytes)] [cmd 2 bytes] [args]
+            cmd_args: Union[bytes, None] = None
+            if len(msg) > 6:
+                cmd_args = msg[6:]  # arguments are everything after
+                self.logger.info("Here are the command arguments", cmd_args=cmd_args)
+
             if cmd in self._commands:
                 try:
+                    command = getattr(self, self._commands[cmd])
                     if cmd_args is None:
                         self.logger.info(
                             "There are no args provided", command=self._commands[cmd]
                         )
-                        # eval a string turns it into a func name
-                        eval(self._commands[cmd])(cubesat)
+                        command(cubesat)
                     else:
                         self.logger.info(
                             "running command with args",
                             command=self._commands[cmd],
                             cmd_args=cmd_args,
                         )
-                    eval(self._commands[cmd])(cubesat, cmd_args)
+                        command(cubesat, cmd_args)
                 except Exception as e:
                     self.logger.error("something went wrong!", e)
                     self.radio_manager.radio.send(str(e).encode())
             else:
                 self.logger.info("invalid command!")
                 self.radio_manager.radio.send(b"invalid cmd" + msg[4:])
-                # check for multi-message mode
-                if multi_msg:
-                    # TODO check for optional radio config
-                    self.logger.info("multi-message mode enabled")
+
+            # check for multi-message mode
+            if multi_msg:
+                # TODO check for optional radio config
+                self.logger.info("multi-message mode enabled")
                 response = self.radio_manager.radio.receive(
                     keep_listening=True,
                     with_ack=True,
@@ -130,19 +164,21 @@ class CommandDataHandler:
             self.logger.info("bad code?")
 
     ########### commands without arguments ###########
-    def noop(self) -> None:
+    def noop(self, cubesat: Satellite) -> None:
         self.logger.info("no-op")
 
     def hreset(self, cubesat: Satellite) -> None:
         self.logger.info("Resetting")
         try:
             self.radio_manager.radio.send(data=b"resetting")
-            cubesat.micro.on_next_reset(cubesat.micro.RunMode.NORMAL)
-            cubesat.micro.reset()
         except Exception:
             pass
+        # prepare_reset never raises, the reset must happen even if saving state fails
+        cubesat.prepare_reset()
+        cubesat.micro.on_next_reset(cubesat.micro.RunMode.NORMAL)
+        cubesat.micro.reset()
 
-    def fsk(self) -> None:
+    def fsk(self, cubesat: Satellite) -> None:
         self.radio_manager.set_modulation(RFM9xModulation.FSK)
 
     def joke_reply(self, cubesat: Satellite) -> None:
@@ -150,6 +186,24 @@ class CommandDataHandler:
         self.logger.info("Sending joke reply", joke=joke)
         self.radio_manager.radio.send(joke)
 
+    def boot_profile(self, cubesat: Satellite) -> None:
+        table: str = cubesat.boot_profiler.table()
+        self.logger.info("Sending boot profile", table=table)
+        self.radio_manager.radio.send(table)
+
+    def tracebacks(self, cubesat: Satellite) -> None:
+        """
+        Downlink the full tracebacks of the most recent errors, oldest first.
+        """
+        tracebacks: list[str] = self.logger.get_recent_tracebacks()
+        self.logger.info("Sending recent tracebacks", count=len(tracebacks))
+        if not tracebacks:
+            self.radio_manager.radio.send(b"no tracebacks")
+        elif self.packet_sender is None:
+            self.radio_manager.radio.send(b"no packet sender")
+        else:
+            self.packet_sender.send_data("\n".join(tracebacks))
+
     ########### commands with arguments ###########
 
     def shutdown(self, cubesat: Satellite, args: bytes) -> None:
@@ -183,6 +237,7 @@ class CommandDataHandler:
         )  # default 1 day
         # set hot start flag right before sleeping
         cubesat.f_hotstrt.toggle(True)
+        cubesat.flush_logs()
         alarm.exit_and_deep_sleep_until_alarms(time_alarm)
 
     def query(self, cubesat: Satellite, args: str) -> None:
@@ -193,3 +248,101 @@ class CommandDataHandler:
     def exec_cmd(self, cubesat: Satellite, args: str) -> None:
         self.logger.info("Executing command", args=args)
         exec(args)
+
+    def query_logs(self, cubesat: Satellite, args: bytes) -> None:
+        """
+        Downlink stored log records matching a time range and level range.
+
+        args: start time (u32), end time (u32), minimum level (u8), maximum level (u8)
+        and maximum number of records (u16, 0 for MAX_QUERY_RECORDS), little endian.
+        The oldest matches are sent first, encoded and packed one packet at a time.
+        """
+        start, end, min_level, max_level, limit = struct.unpack("<IIBBH", args)
+        if cubesat.log_sink is None or self.packet_sender is None:
+            self.radio_manager.radio.send(b"no log store")
+            return
+        limit = min(limit or MAX_QUERY_RECORDS, MAX_QUERY_RECORDS)
+
+        def encoded(count: int):
+            return store.encode_records(
+                store.iter_records(
+                    cubesat.log_sink, start, end, min_level, max_level, count
+                )
+            )
+
+        # a first pass sizes the stream so packets carry their total, records logged
+        # meanwhile come after the counted ones and are left out of the second pass
+        count: int = 0
+        length: int = 0
+        for data in encoded(limit):
+            count += 1
+            length += len(data)
+            if count % 32 == 0:
+                self._report_progress()
+
+        self.logger.info("Sending log query results", num_records=count)
+        self.packet_sender.send_stream(encoded(count), length)
+
+    def set_config(self, cubesat: Satellite, args: bytes) -> None:
+        """
+        Change a config value in flight.
+
+        args: JSON list of key, value and optionally whether the change is permanent,
+        e.g. ["sleep_duration", 60, true]
+        """
+        request = json.loads(args)
+        key, value = request[0], request[1]
+        permanent = len(request) > 2 and bool(request[2])
+
+        self._config.set(key, value, permanent)
+        self.logger.info(
+            "Config value changed", key=key, value=value, permanent=permanent
+        )
+        self.radio_manager.radio.send(f"{key}={self._config.get(key)}")
+
+    def downlink_telemetry(self, cubesat: Satellite, args: bytes) -> None:
+        """
+        Downlink one tier of a telemetry channel.
+
+        args: tier (u8) followed by the utf-8 channel name, e.g. b"\x01gyro_norm"
+        """
+        tier: int = args[0]
+        name: str = bytes(args[1:]).decode("utf-8")
+        data: bytes = cubesat.telemetry.encode(name, tier)
+
+        self.logger.info("Sending telemetry", channel=name, tier=tier)
+        if self.packet_sender is None:
+            self.radio_manager.radio.send(data)
+        else:
+            self.packet_sender.send_data(data)
+
+    def downlink_file(self, cubesat: Satellite, args: bytes) -> None:
+        """
+        Downlink part of a file without loading it into memory.
+
+        args: offset (u32) and length (u32, 0 for the rest of the file), little endian,
+        followed by the utf-8 path, e.g. b"\x00\x00\x00\x00\x00\x02\x00\x00/sd/logs/LOG00001.log"
+        """
+        offset, length = struct.unpack("<II", args[:8])
+        path: str = bytes(args[8:]).decode("utf-8")
+        if self.packet_sender is None:
+            self.radio_manager.radio.send(b"no packet sender")
+            return
+
+        self.logger.info("Sending file", filedir=path, offset=offset, length=length)
+        self.packet_sender.send_file(path, offset, length or None)
+
+    def file_checksum(self, cubesat: Satellite, args: bytes) -> None:
+        """
+        Send the CRC-32 of part of a file, to check a downlink or an upload.
+
+        args: same as downlink_file
+        """
+        offset, length = struct.unpack("<II", args[:8])
+        path: str = bytes(args[8:]).decode("utf-8")
+        crc: int = file_crc32(
+            path, offset, length or None, progress=self._report_progress
+        )
+
+        self.logger.info("File checksum", filedir=path, crc=crc)
+        self.radio_manager.radio.send(f"{path} {crc:08x}")
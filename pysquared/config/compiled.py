@@ -0,0 +1,225 @@
+"""
+Compiled binary cache of config.json.
+
+Parsing the whole JSON document at every boot is slow and keeps the large
+string lists in RAM for the whole mission. The config is compiled once into a
+binary file: the scalar values as compact JSON, and each string list as a table
+of fixed offsets followed by the utf-8 strings. Loading only parses the
+scalars, the tables are read one string at a time when indexed.
+
+File layout, little endian:
+
+    header: magic, source size (u32), source mtime (u32), table count (u16), scalars length (u32)
+    scalars: compact JSON of every other value
+    per table: name length (u8), name, string count (u16),
+               count + 1 string offsets (u32, from the start of the strings), strings
+
+The source size and mtime are compared with config.json on every load, the
+cache is rebuilt when they differ. The cache is written to a temporary file
+that is renamed into place once complete, and the table lengths are checked
+against the file size on load, so a reset while compiling never leaves a
+truncated cache that looks valid.
+"""
+
+import json
+import os
+import struct
+
+from micropython import const
+
+try:
+    from typing import Any, Optional, Union
+except ImportError:
+    pass
+
+_MAGIC = b"PSC1"
+_HEADER_FORMAT = "<4sIIHI"
+_HEADER_SIZE = const(18)
+_OFFSET_SIZE = const(4)
+
+# CircuitPython's struct raises ValueError where CPython raises struct.error
+_STRUCT_ERROR = getattr(struct, "error", ValueError)
+
+STRING_TABLES: tuple[str, ...] = ("jokes", "joke_reply")
+
+
+class StringTable:
+    """
+    Read-only sequence of strings read lazily from a compiled config file.
+
+    Supports `len()` and indexing, so `random.choice` works on it like on a list.
+    """
+
+    def __init__(self, path: str, offsets_start: int, count: int) -> None:
+        """
+        :param str path: Path of the compiled config file.
+        :param int offsets_start: File position of the offset table.
+        :param int count: Number of strings in the table.
+        """
+        self._path: str = path
+        self._offsets_start: int = offsets_start
+        self._strings_start: int = offsets_start + (count + 1) * _OFFSET_SIZE
+        self._count: int = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError("string table index out of range")
+
+        with open(self._path, "rb") as f:
+            f.seek(self._offsets_start + index * _OFFSET_SIZE)
+            start, end = struct.unpack("<II", f.read(2 * _OFFSET_SIZE))
+            f.seek(self._strings_start + start)
+            return f.read(end - start).decode("utf-8")
+
+
+def _source_stamp(config_path: str) -> tuple[int, int]:
+    stat = os.stat(config_path)
+    return stat[6] & 0xFFFFFFFF, int(stat[8]) & 0xFFFFFFFF  # size, mtime
+
+
+def compile_config(
+    config_path: str,
+    compiled_path: str,
+    tables: tuple[str, ...] = STRING_TABLES,
+) -> None:
+    """
+    Compile config.json into the binary cache format.
+
+    :param str config_path: Path of the JSON config.
+    :param str compiled_path: Path the compiled file is written to, replaced only once complete.
+    :param tuple tables: Keys of the string lists stored as lazily read tables.
+
+    :raises OSError: If the config cannot be read or the cache cannot be written.
+    """
+    with open(config_path, "r") as f:
+        json_data = json.loads(f.read())
+
+    table_data = []
+    for name in tables:
+        strings = json_data.pop(name, None)
+        if strings is not None:
+            table_data.append((name, strings))
+
+    scalars = json.dumps(json_data, separators=(",", ":")).encode("utf-8")
+    size, mtime = _source_stamp(config_path)
+
+    temp_path = compiled_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(
+            struct.pack(
+                _HEADER_FORMAT, _MAGIC, size, mtime, len(table_data), len(scalars)
+            )
+        )
+        f.write(scalars)
+        for name, strings in table_data:
+            encoded = [s.encode("utf-8") for s in strings]
+            name_bytes = name.encode("utf-8")
+            f.write(struct.pack("<B", len(name_bytes)))
+            f.write(name_bytes)
+            f.write(struct.pack("<H", len(encoded)))
+
+            position = 0
+            for data in encoded:
+                f.write(struct.pack("<I", position))
+                position += len(data)
+            f.write(struct.pack("<I", position))
+            for data in encoded:
+                f.write(data)
+
+    # FAT cannot rename over an existing file
+    try:
+        os.remove(compiled_path)
+    except OSError:
+        pass
+    os.rename(temp_path, compiled_path)
+
+
+def read_compiled(
+    compiled_path: str, config_path: Optional[str] = None
+) -> Optional[dict[str, Any]]:
+    """
+    Load a compiled config, with its string tables as StringTables.
+
+    :param str compiled_path: Path of the compiled file.
+    :param str config_path: When given, the cache is only used if it was compiled from this file as it is now.
+
+    :raises OSError: If a file cannot be read.
+
+    :return: The config values, or None when the cache is invalid, truncated or stale.
+    """
+    file_length = os.stat(compiled_path)[6]
+    with open(compiled_path, "rb") as f:
+        header = f.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE:
+            return None
+        magic, size, mtime, table_count, scalars_length = struct.unpack(
+            _HEADER_FORMAT, header
+        )
+        if magic != _MAGIC:
+            return None
+        if config_path is not None and (size, mtime) != _source_stamp(config_path):
+            return None
+
+        position = _HEADER_SIZE + scalars_length
+        if position > file_length:
+            return None
+        json_data: dict[str, Any] = json.loads(f.read(scalars_length))
+
+        for _ in range(table_count):
+            name_length = f.read(1)[0]
+            name = f.read(name_length).decode("utf-8")
+            count = struct.unpack("<H", f.read(2))[0]
+            offsets_start = position + 1 + name_length + 2
+
+            f.seek(offsets_start + count * _OFFSET_SIZE)
+            strings_length = struct.unpack("<I", f.read(_OFFSET_SIZE))[0]
+            json_data[name] = StringTable(compiled_path, offsets_start, count)
+
+            position = offsets_start + (count + 1) * _OFFSET_SIZE + strings_length
+            if position > file_length:
+                return None
+            f.seek(position)
+
+    if position != file_length:
+        return None
+    return json_data
+
+
+def load_config(
+    config_path: str, compiled_path: Optional[str] = None
+) -> dict[str, Union[Any, StringTable]]:
+    """
+    Load the config values, through the compiled cache when a path for it is given.
+
+    The cache is compiled on first use and whenever config.json changes. If the
+    cache cannot be read or written, for example on a read-only filesystem, the
+    JSON is parsed as before.
+
+    :param str config_path: Path of the JSON config.
+    :param str compiled_path: Path of the compiled cache, None to always parse the JSON.
+
+    :return dict: The config values.
+    """
+    if compiled_path is not None:
+        try:
+            json_data = read_compiled(compiled_path, config_path)
+            if json_data is not None:
+                return json_data
+        except (OSError, ValueError, IndexError, _STRUCT_ERROR):
+            pass  # missing or damaged, rebuilt below
+
+        try:
+            compile_config(config_path, compiled_path)
+            json_data = read_compiled(compiled_path)
+            if json_data is not None:
+                return json_data
+        except OSError:
+            pass  # read-only filesystem, parse the JSON instead
+
+    with open(config_path, "r") as f:
+        return json.loads(f.read())
@@ -4,19 +4,41 @@ distribute these values across the files & variables
 that use them. Instantiation happens in main.
 
 Also it allow values to be set temporarily or permanently using the
+`set` method. Permanent values are stored as overrides in the NVM key-value
+store and applied over config.json at every boot. Code that copies a value
+can `subscribe` to it to be told about changes.
 Attempting to follow the FPrime model.
 """
 
-import json
+from .compiled import StringTable, load_config
+from .radio import RadioConfig, check_radio_range
 
-from .radio import RadioConfig
+try:
+    from typing import Any, Callable, Optional, Union
+
+    from ..nvm.kvstore import KVStore
+except ImportError:
+    pass
+
+# key of the permanent overrides in the NVM key-value store
+OVERRIDES_KEY = "config"
 
 
 class Config:
-    def __init__(self, config_path: str) -> None:
+    def __init__(
+        self,
+        config_path: str,
+        compiled_path: Optional[str] = None,
+        overrides: Optional[KVStore] = None,
+    ) -> None:
+        """
+        :param str config_path: Path of config.json.
+        :param str compiled_path: Path of the compiled binary cache, see `pysquared.config.compiled`.
+            When given, the jokes and joke replies are read from it lazily instead of kept in RAM.
+        :param KVStore overrides: Store holding permanent overrides, such as `Satellite.kv_store`.
+        """
         # parses json & assigns data to variables
-        with open(config_path, "r") as f:
-            json_data = json.loads(f.read())
+        json_data = load_config(config_path, compiled_path)
 
         self.radio: RadioConfig = RadioConfig(json_data["radio"])
         self.cubesat_name: str = json_data["cubesat_name"]
@@ -26,7 +48,7 @@ class Config:
         self.detumble_enable_z: bool = json_data["detumble_enable_z"]
         self.detumble_enable_x: bool = json_data["detumble_enable_x"]
         self.detumble_enable_y: bool = json_data["detumble_enable_y"]
-        self.jokes: list[str] = json_data["jokes"]
+        self.jokes: Union[list[str], StringTable] = json_data["jokes"]
         self.debug: bool = json_data["debug"]
         self.legacy: bool = json_data["legacy"]
         self.heating: bool = json_data["heating"]
@@ -44,4 +66,114 @@ class Config:
         self.turbo_clock: bool = json_data["turbo_clock"]
         self.super_secret_code: str = json_data["super_secret_code"]
         self.repeat_code: str = json_data["repeat_code"]
-        self.joke_reply: list[str] = json_data["joke_reply"]
+        self.joke_reply: Union[list[str], StringTable] = json_data["joke_reply"]
+
+        self._overrides: Optional[KVStore] = overrides
+        self._subscribers: dict[str, list[Callable[[str, Any], None]]] = {}
+
+        if overrides is not None:
+            for key, value in overrides.get(OVERRIDES_KEY, {}).items():
+                try:
+                    self._assign(key, value)
+                except (KeyError, TypeError, ValueError):
+                    pass  # stale override for a key that no longer exists or is out of range
+
+    """
+    Runtime access
+    """
+
+    def _resolve(self, key: str) -> tuple[Any, str]:
+        # dotted keys reach into the nested radio configs, e.g. "radio.lora.transmit_power"
+        parts = key.split(".")
+        target = self
+        for part in parts[:-1]:
+            target = getattr(target, part, None)
+            if target is None:
+                raise KeyError(key)
+        if parts[-1].startswith("_") or not hasattr(target, parts[-1]):
+            raise KeyError(key)
+        return target, parts[-1]
+
+    def _assign(self, key: str, value: Any) -> Any:
+        # validates the value like the constructor does, then applies it
+        target, name = self._resolve(key)
+        current = getattr(target, name)
+        if isinstance(current, bool) != isinstance(value, bool):
+            raise TypeError(f"{key} must be a {type(current).__name__}")
+        if isinstance(current, float) and isinstance(value, int):
+            value = float(value)
+        elif not isinstance(value, type(current)):
+            raise TypeError(f"{key} must be a {type(current).__name__}")
+        check_radio_range(key, value)
+        setattr(target, name, value)
+        return value
+
+    def get(self, key: str) -> Any:
+        """
+        Get a config value.
+
+        :param str key: Name of the value, dotted for nested values such as "radio.lora.transmit_power".
+
+        :raises KeyError: If there is no such value.
+        """
+        target, name = self._resolve(key)
+        return getattr(target, name)
+
+    def set(self, key: str, value: Any, permanent: bool = False) -> None:
+        """
+        Set a config value and notify its subscribers.
+
+        The value is validated, applied and its subscribers notified before it is
+        stored, so a failure to store it never leaves copies of the old value behind.
+
+        :param str key: Name of the value, dotted for nested values such as "radio.lora.transmit_power".
+        :param value: New value, of the same type as the current one.
+        :param bool permanent: Also store the value as an override applied at every boot.
+
+        :raises KeyError: If there is no such value.
+        :raises TypeError: If the value has the wrong type.
+        :raises ValueError: If the value is out of range, or it is permanent and there is no
+            override store. Also if the override store is full, the value then applies until
+            the next boot only.
+        """
+        if permanent and self._overrides is None:
+            raise ValueError("No override store to make the value permanent")
+
+        value = self._assign(key, value)
+        for callback in self._subscribers.get(key, []):
+            callback(key, value)
+
+        if permanent:
+            overrides = dict(self._overrides.get(OVERRIDES_KEY, {}))
+            overrides[key] = value
+            self._overrides.set(OVERRIDES_KEY, overrides)
+            self._overrides.commit()
+
+    def clear_override(self, key: str) -> None:
+        """
+        Remove a permanent override, config.json applies again from the next boot.
+        """
+        if self._overrides is None:
+            return
+
+        overrides = dict(self._overrides.get(OVERRIDES_KEY, {}))
+        if overrides.pop(key, None) is not None:
+            self._overrides.set(OVERRIDES_KEY, overrides)
+            self._overrides.commit()
+
+    def subscribe(self, key: str, callback: Callable[[str, Any], None]) -> None:
+        """
+        Call `callback(key, value)` whenever the value is set.
+
+        :raises KeyError: If there is no such value.
+        """
+        self._resolve(key)
+        self._subscribers.setdefault(key, []).append(callback)
+
+    def unsubscribe(self, key: str, callback: Callable[[str, Any], None]) -> None:
+        """
+        Stop calling a callback added with `subscribe`, so its owner can be freed.
+        """
+        callbacks = self._subscribers.get(key)
+        if callbacks is not None and callback in callbacks:
+            callbacks.remove(callback)
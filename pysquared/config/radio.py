@@ -1,5 +1,53 @@
+# Keys of every radio value, as used by Config.get and Config.set
+RADIO_KEYS: tuple[str, ...] = (
+    "radio.sender_id",
+    "radio.receiver_id",
+    "radio.transmit_frequency",
+    "radio.start_time",
+    "radio.fsk.broadcast_address",
+    "radio.fsk.node_address",
+    "radio.fsk.modulation_type",
+    "radio.lora.ack_delay",
+    "radio.lora.coding_rate",
+    "radio.lora.cyclic_redundancy_check",
+    "radio.lora.max_output",
+    "radio.lora.spreading_factor",
+    "radio.lora.transmit_power",
+)
+
+# Limits (inclusive) of the radio values the RFM9x accepts, keyed like Config.get
+RADIO_RANGES: dict[str, tuple[float, float]] = {
+    "radio.sender_id": (0, 255),
+    "radio.receiver_id": (0, 255),
+    "radio.transmit_frequency": (137.0, 1020.0),
+    "radio.fsk.broadcast_address": (0, 255),
+    "radio.fsk.node_address": (0, 255),
+    "radio.fsk.modulation_type": (0, 1),
+    "radio.lora.ack_delay": (0.0, 10.0),
+    "radio.lora.coding_rate": (5, 8),
+    "radio.lora.spreading_factor": (6, 12),
+    "radio.lora.transmit_power": (5, 23),
+}
+
+
+def check_radio_range(key: str, value) -> None:
+    """
+    Check a radio value against its limits, keys without limits are accepted.
+
+    :param str key: Dotted name of the value, e.g. "radio.lora.transmit_power".
+
+    :raises ValueError: If the value is out of range.
+    """
+    limits = RADIO_RANGES.get(key)
+    if limits is not None and not limits[0] <= value <= limits[1]:
+        raise ValueError(f"{key} must be between {limits[0]} and {limits[1]}")
+
+
 class RadioConfig:
     def __init__(self, radio_dict: dict) -> None:
+        """
+        :raises ValueError: If a value is out of the range the radio accepts.
+        """
         self.sender_id: int = radio_dict["sender_id"]
         self.receiver_id: int = radio_dict["receiver_id"]
         self.transmit_frequency: float = radio_dict["transmit_frequency"]
@@ -7,6 +55,12 @@ class RadioConfig:
         self.fsk: FSKConfig = FSKConfig(radio_dict["fsk"])
         self.lora: LORAConfig = LORAConfig(radio_dict["lora"])
 
+        for key in RADIO_RANGES:
+            target = self
+            for part in key.split(".")[1:]:
+                target = getattr(target, part)
+            check_radio_range(key, target)
+
 
 class FSKConfig:
     def __init__(self, fsk_dict: dict) -> None:
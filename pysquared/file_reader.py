@@ -0,0 +1,101 @@
+"""
+Chunked reads of files that can be larger than the heap.
+
+`read_chunks` reads a file into one reused bytearray with `readinto` and yields
+memoryview slices of it, so going through a file of any size only allocates the
+buffer once. A chunk is only valid until the next one is read, copy it with
+`bytes(chunk)` to keep it. Downlink, checksum and copy all go through it.
+"""
+
+import os
+from binascii import crc32
+
+from micropython import const
+
+try:
+    from typing import Callable, Iterator, Optional
+except ImportError:
+    pass
+
+DEFAULT_CHUNK_SIZE = const(512)
+
+
+def read_chunks(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    offset: int = 0,
+    length: Optional[int] = None,
+    buffer: Optional[bytearray] = None,
+) -> Iterator[memoryview]:
+    """
+    Read part of a file in chunks.
+
+    :param str path: The file to read.
+    :param int chunk_size: Size of the buffer allocated when none is given.
+    :param int offset: Position in the file of the first byte read.
+    :param int length: Number of bytes to read, up to the end of the file when None.
+    :param bytearray buffer: Buffer to read into, reused across chunks.
+
+    :raises OSError: If the file cannot be opened.
+
+    :return: A generator of memoryview chunks of at most the buffer size.
+    """
+    if buffer is None:
+        buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    remaining: Optional[int] = length
+
+    with open(path, "rb") as f:
+        if offset:
+            f.seek(offset)
+        while remaining is None or remaining > 0:
+            size = len(buffer) if remaining is None else min(len(buffer), remaining)
+            count = f.readinto(view[:size])
+            if not count:
+                break
+            if remaining is not None:
+                remaining -= count
+            yield view[:count]
+
+
+def file_size(path: str) -> int:
+    """
+    Size of a file in bytes.
+    """
+    return os.stat(path)[6]
+
+
+def file_crc32(
+    path: str,
+    offset: int = 0,
+    length: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[], object]] = None,
+) -> int:
+    """
+    CRC-32 of part of a file, the same value as `binascii.crc32` of its contents.
+
+    :param progress: Called after every chunk, e.g. to feed the watchdog on large files.
+    """
+    crc = 0
+    for chunk in read_chunks(path, chunk_size, offset, length):
+        crc = crc32(chunk, crc)
+        if progress is not None:
+            progress()
+    return crc
+
+
+def copy_file(
+    from_path: str, to_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """
+    Copy a file, replacing the destination.
+
+    :return int: The number of bytes copied.
+    """
+    copied = 0
+    with open(to_path, "wb") as f:
+        for chunk in read_chunks(from_path, chunk_size):
+            f.write(chunk)
+            copied += len(chunk)
+    return copied
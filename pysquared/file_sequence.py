@@ -0,0 +1,107 @@
+"""
+Numbering of the files created on the SD card.
+
+Finding the next free name by calling `stat` on PREFIX00000, PREFIX00001 and
+so on costs a FAT lookup for every file already written. Instead the next
+number of every prefix is kept in a small sequence file in the directory. The
+directory is only listed, once, to rebuild a number when the sequence file is
+missing or does not know the prefix yet.
+"""
+
+import json
+import os
+
+from micropython import const
+
+try:
+    from typing import Optional
+except ImportError:
+    pass
+
+SEQUENCE_FILE = ".sequence"
+MAX_NUMBER = const(0xFFFF)  # numbers wrap around after 65534
+
+
+def _exists(path: str) -> bool:
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+class FileSequence:
+    """
+    Hands out numbered file names in one directory.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        :param str directory: Directory the files are created in, it must exist.
+        """
+        self.directory: str = directory.rstrip("/")
+        self._path: str = self.directory + "/" + SEQUENCE_FILE
+        self._numbers: Optional[dict[str, int]] = None
+        # number of directory listings done to rebuild a sequence
+        self.recoveries: int = 0
+
+    def name(self, prefix: str, number: int, extension: str) -> str:
+        """
+        Path of a numbered file in the directory.
+        """
+        return "{}/{}{:05}.{}".format(self.directory, prefix, number, extension)
+
+    def next_path(self, prefix: str, extension: str) -> str:
+        """
+        Allocate the next file name of a prefix and persist the sequence.
+
+        :param str prefix: File name before the number.
+        :param str extension: File extension, without the dot.
+
+        :return str: The path of a file that does not exist yet.
+        """
+        numbers = self._load()
+        key = prefix + "." + extension
+        number: Optional[int] = numbers.get(key)
+        if number is None:
+            number = self._recover(prefix, extension)
+
+        # a name is only taken already when the sequence was not saved after it was used
+        path = self.name(prefix, number, extension)
+        for _ in range(MAX_NUMBER):
+            if not _exists(path):
+                break
+            number = (number + 1) % MAX_NUMBER
+            path = self.name(prefix, number, extension)
+
+        numbers[key] = (number + 1) % MAX_NUMBER
+        self._save()
+        return path
+
+    def _load(self) -> dict[str, int]:
+        if self._numbers is None:
+            try:
+                with open(self._path, "r") as f:
+                    self._numbers = json.load(f)
+            except (OSError, ValueError):
+                self._numbers = {}  # missing or damaged, rebuilt per prefix
+        return self._numbers
+
+    def _save(self) -> None:
+        try:
+            with open(self._path, "w") as f:
+                json.dump(self._numbers, f)
+        except OSError:
+            pass  # the existence check catches a stale number next time
+
+    def _recover(self, prefix: str, extension: str) -> int:
+        self.recoveries += 1
+        suffix = "." + extension
+        highest = -1
+        for entry in os.listdir(self.directory):
+            if not (entry.startswith(prefix) and entry.endswith(suffix)):
+                continue
+            digits = entry[len(prefix) : len(entry) - len(suffix)]
+            if len(digits) == 5 and digits.isdigit():
+                highest = max(highest, int(digits))
+        return (highest + 1) % MAX_NUMBER
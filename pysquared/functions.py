@@ -5,24 +5,40 @@ our will.
 Authors: Nicole Maggard, Michael Pham, and Rachel Sarmiento
 """
 
+import asyncio
 import gc
 import random
 import time
 
+from .cdh import CommandDataHandler
+from .config.compiled import StringTable
 from .config.config import Config
+from .config.radio import RADIO_KEYS
 from .hardware.rfm9x.manager import RFM9xManager
+from .log.sinks import RadioSink
 from .logger import Logger
 from .packet_manager import PacketManager
 from .packet_sender import PacketSender
 from .pysquared import Satellite
+from .scheduler import Scheduler
 from .sleep_helper import SleepHelper
+from .telemetry import DEFAULT_TIERS
 
 try:
-    from typing import List, OrderedDict, Union
+    from typing import Any, List, Optional, OrderedDict, Union
+
+    from .Big_Data import AllFaces
 except Exception:
     pass
 
 
+# Age in seconds of a cached sensor reading that is still good enough for telemetry
+SENSOR_MAX_AGE: float = 1.0
+
+# Seconds of each receive window of the scheduled listen task
+LISTEN_WINDOW: float = 2.0
+
+
 class functions:
     def __init__(
         self,
@@ -37,27 +53,61 @@ class functions:
         self.config: Config = config
         self.sleep_helper = sleep_helper
         self.radio_manager: RFM9xManager = radio_manager
+        # errors are also downlinked as they happen
+        self.radio_log_sink: RadioSink = RadioSink(radio_manager)
+        self.logger.add_sink(self.radio_log_sink)
 
         self.logger.info("Initializing Functionalities")
         self.packet_manager: PacketManager = PacketManager(
             logger=self.logger, max_packet_size=128
         )
         self.packet_sender: PacketSender = PacketSender(
-            self.logger, radio_manager, self.packet_manager, max_retries=3
+            self.logger,
+            radio_manager,
+            self.packet_manager,
+            max_retries=3,
+            progress=self.report_progress,
+        )
+        # one command handler serves every listen, it subscribes to the config
+        # values it copies and would pile up subscribers if built per call
+        self.cdh: CommandDataHandler = CommandDataHandler(
+            config, self.logger, radio_manager, self.packet_sender
         )
 
         self.cubesat_name: str = config.cubesat_name
         self.facestring: list = [None, None, None, None, None]
-        self.jokes: list[str] = config.jokes
+        self.jokes: Union[list[str], StringTable] = config.jokes
         self.last_battery_temp: float = config.last_battery_temp
         self.sleep_duration: int = config.sleep_duration
+        config.subscribe("sleep_duration", self._on_sleep_duration_change)
         self.callsign: str = config.callsign
+        for key in ("cubesat_name", "last_battery_temp", "callsign"):
+            config.subscribe(key, self._on_config_change)
+        # radio values set in flight apply straight away by recreating the radio
+        for key in RADIO_KEYS:
+            config.subscribe(key, self._on_radio_config_change)
         self.state_of_health_part1: bool = False
+        # adds the boot profile table as a BP field to the state of health
+        self.include_boot_profile: bool = False
+        # set by build_scheduler, long operations check in for the task running them
+        self.scheduler: Optional[Scheduler] = None
+        # face sensors are kept between calls and only re-initialized when their channel changes
+        self.all_faces: Optional[AllFaces] = None
 
     """
     Satellite Management Functions
     """
 
+    def _on_sleep_duration_change(self, key: str, value: int) -> None:
+        self.sleep_duration = value
+        self.logger.info("Sleep duration changed", sleep_duration=value)
+
+    def _on_config_change(self, key: str, value: Any) -> None:
+        setattr(self, key, value)
+
+    def _on_radio_config_change(self, key: str, value: Any) -> None:
+        self.radio_manager.reconfigure()
+
     def listen_loiter(self) -> None:
         self.logger.debug("Listening for 10 seconds")
         self.cubesat.watchdog_pet()
@@ -70,6 +120,61 @@ class functions:
         self.sleep_helper.safe_sleep(self.sleep_duration)
         self.cubesat.watchdog_pet()
 
+    def report_progress(self) -> None:
+        """
+        Called from long operations: checks in the running scheduled task and feeds the watchdog.
+        """
+        if self.scheduler is not None:
+            self.scheduler.check_in()
+        self.cubesat.watchdog_pet()
+
+    def build_scheduler(self) -> Scheduler:
+        """
+        The flight loop as periodic tasks.
+
+        Listening happens in short receive windows so sampling and beacons run in
+        between. The watchdog is fed by its own task, see `run_scheduled`, and only
+        while every task here keeps running.
+        """
+        scheduler: Scheduler = Scheduler(self.logger, self.cubesat.watchdog)
+        scheduler.add(
+            "nvm_commit", self.cubesat.nvm_cache.commit, 1.0, priority=5, watch=False
+        )
+        # summaries of error storms that stopped come out soon after their window closes
+        scheduler.add("flush_repeats", self.logger.flush_repeats, 10.0, priority=1)
+        scheduler.add("check_reboot", self.cubesat.check_reboot, 60.0, priority=4)
+        scheduler.add(
+            "listen", lambda: self.listen(LISTEN_WINDOW), LISTEN_WINDOW * 2, priority=3
+        )
+        scheduler.add("beacon", self.beacon, 60.0, priority=2)
+        scheduler.add(
+            "state_of_health", self.state_of_health, 120.0, priority=2, delay=30.0
+        )
+        scheduler.add(
+            "sample_telemetry",
+            lambda: self.cubesat.sample_telemetry(SENSOR_MAX_AGE),
+            # one sample per period of the finest tier
+            float(DEFAULT_TIERS[0][0]),
+            priority=1,
+        )
+        scheduler.add("face_data", self.all_face_data, 30.0, priority=1, delay=5.0)
+        self.scheduler = scheduler
+        return scheduler
+
+    def run_scheduled(self) -> None:
+        """
+        Run the flight loop on the scheduler, instead of calling listen_loiter and friends in turn.
+        """
+        asyncio.run(self._flight_loop(self.build_scheduler()))
+
+    async def _flight_loop(self, scheduler: Scheduler) -> None:
+        # the watchdog task feeds the watchdog next to the scheduled tasks
+        watchdog_task = asyncio.create_task(self.cubesat.watchdog.run())
+        try:
+            await scheduler.run()
+        finally:
+            watchdog_task.cancel()
+
     """
     Radio Functions
     """
@@ -140,6 +245,7 @@ class functions:
         self.state_list: list = []
         # list of state information
         try:
+            flags = self.cubesat.flags.read()
             self.state_list: list[str] = [
                 f"PM:{self.cubesat.power_mode}",
                 f"VB:{self.cubesat.battery_voltage}",
@@ -149,13 +255,16 @@ class functions:
                 f"BN:{self.cubesat.boot_count.get()}",
                 f"MT:{self.cubesat.micro.cpu.temperature}",
                 f"RT:{self.radio_manager.get_temperature()}",
-                f"AT:{self.cubesat.internal_temperature}",
+                f"AT:{self.cubesat.read_sensor('internal_temperature', SENSOR_MAX_AGE)}",
                 f"BT:{self.last_battery_temp}",
                 f"EC:{self.logger.get_error_count()}",
-                f"AB:{int(self.cubesat.f_burned.get())}",
-                f"BO:{int(self.cubesat.f_brownout.get())}",
+                f"AB:{int(flags.get('burned'))}",
+                f"BO:{int(flags.get('brownout'))}",
+                f"FL:{flags.to_bytes().hex()}",
                 f"FK:{self.radio_manager.get_modulation()}",
             ]
+            if self.include_boot_profile:
+                self.state_list.append(f"BP:{self.cubesat.boot_profiler.table()}")
         except Exception as e:
             self.logger.error("Couldn't aquire data for the state of health: ", e)
 
@@ -168,6 +277,8 @@ class functions:
             )
             self.state_of_health_part1: bool = True
         else:
+            # report every device, not only the ones used so far
+            self.cubesat.init_lazy_devices()
             message = (
                 f"{self.callsign} YSOH 2/2"
                 + self.format_state_of_health(self.cubesat.hardware)
@@ -185,17 +296,11 @@ class functions:
             f"{self.callsign} Y-: {self.facestring[0]} Y+: {self.facestring[1]} X-: {self.facestring[2]} X+: {self.facestring[3]}  Z-: {self.facestring[4]} {self.callsign}"
         )
 
-    def listen(self) -> bool:
-        # need to instanciate cdh to feed it the config var
-        # assigned from the Config object
-        from pysquared.cdh import CommandDataHandler
-
-        cdh = CommandDataHandler(self.config, self.logger, self.radio_manager)
-
+    def listen(self, receive_timeout: float = 10) -> bool:
         # This just passes the message through. Maybe add more functionality later.
         try:
             self.logger.debug("Listening")
-            self.radio_manager.radio.receive_timeout = 10
+            self.radio_manager.radio.receive_timeout = receive_timeout
             received: bytearray = self.radio_manager.radio.receive_with_ack(
                 keep_listening=True
             )
@@ -206,12 +311,10 @@ class functions:
         try:
             if received is not None:
                 self.logger.debug("Received Packet", packet=received)
-                cdh.message_handler(self.cubesat, received)
+                self.cdh.message_handler(self.cubesat, received)
                 return True
         except Exception as e:
             self.logger.error("An Error has occured while handling a command: ", e)
-        finally:
-            del cdh
 
         return False
 
@@ -231,6 +334,31 @@ class functions:
     change to remove fet values, move to pysquared
     """
 
+    def get_all_faces(self) -> AllFaces:
+        """
+        Face sensors built from the cached TCA device maps.
+
+        Faces with a failed sensor have their channel re-scanned, and faces whose
+        channel device map changed after a scheduled re-scan are re-initialized.
+        """
+        import pysquared.Big_Data as Big_Data
+
+        if self.all_faces is None:
+            self.all_faces = Big_Data.AllFaces(
+                self.cubesat.tca,
+                self.logger,
+                [self.cubesat.tca_devices(channel) for channel in range(5)],
+            )
+            self.report_progress()
+            return self.all_faces
+
+        self.all_faces.refresh(
+            self.cubesat.tca_devices,
+            self.cubesat.invalidate_tca_channel,
+            self.report_progress,
+        )
+        return self.all_faces
+
     def all_face_data(self) -> list:
         # self.cubesat.all_faces_on()
         gc.collect()
@@ -240,24 +368,13 @@ class functions:
         )
 
         try:
-            import pysquared.Big_Data as Big_Data
-
-            self.logger.debug(
-                "Free Memory Stat after importing Big_data library",
-                bytes_free=gc.mem_free(),
-            )
-
-            gc.collect()
-            a: Big_Data.AllFaces = Big_Data.AllFaces(self.cubesat.tca, self.logger)
+            a: AllFaces = self.get_all_faces()
             self.logger.debug(
                 "Free Memory Stat after initializing All Faces object",
                 bytes_free=gc.mem_free(),
             )
 
             self.facestring: list[list[float]] = a.face_test_all()
-
-            del a
-            del Big_Data
             gc.collect()
 
         except Exception as e:
@@ -278,9 +395,9 @@ class functions:
                 tuple[float, float, float],
                 tuple[float, float, float],
             ] = []
-            data.append(self.cubesat.accel)
-            data.append(self.cubesat.gyro)
-            data.append(self.cubesat.mag)
+            data.append(self.cubesat.read_sensor("accel", SENSOR_MAX_AGE))
+            data.append(self.cubesat.read_sensor("gyro", SENSOR_MAX_AGE))
+            data.append(self.cubesat.read_sensor("mag", SENSOR_MAX_AGE))
         except Exception as e:
             self.logger.error("Error retrieving IMU data", e)
 
@@ -302,9 +419,7 @@ class functions:
         self.cubesat.rgb = (255, 255, 255)
 
         try:
-            import pysquared.Big_Data as Big_Data
-
-            a: Big_Data.AllFaces = Big_Data.AllFaces(self.cubesat.tca, self.logger)
+            a: AllFaces = self.get_all_faces()
         except Exception as e:
             self.logger.error("Error Importing Big Data", e)
 
@@ -330,7 +445,10 @@ class functions:
                 import pysquared.detumble as detumble
 
                 for _ in range(3):
-                    data = [self.cubesat.IMU.Gyroscope, self.cubesat.IMU.Magnetometer]
+                    data = [
+                        self.cubesat.read_sensor("gyro", SENSOR_MAX_AGE),
+                        self.cubesat.read_sensor("mag", SENSOR_MAX_AGE),
+                    ]
                     data[0] = list(data[0])
                     for x in range(3):
                         if data[0][x] < 0.01:
@@ -0,0 +1,211 @@
+"""
+Batched acquisition from the LSM6DSOX hardware FIFO.
+
+Polling `gyro` and `acceleration` one sample at a time is limited by Python
+jitter. The IMU can instead batch samples into its FIFO at a fixed data rate,
+which is drained in bulk into `array` buffers. Samples are evenly spaced at the
+batch data rate, so their timestamps are derived from the start time.
+
+Samples are stored as raw signed 16-bit values in x, y, z order, scale them
+with the sensitivity of the configured range.
+"""
+
+import struct
+import time
+from array import array
+
+from micropython import const
+
+try:
+    from typing import Optional
+except ImportError:
+    pass
+
+_FIFO_CTRL3 = const(0x09)  # BDR_GY[7:4], BDR_XL[3:0]
+_FIFO_CTRL4 = const(0x0A)  # FIFO_MODE[2:0]
+_CTRL1_XL = const(0x10)  # ODR_XL[7:4]
+_CTRL2_G = const(0x11)  # ODR_G[7:4]
+_FIFO_STATUS1 = const(0x3A)  # DIFF_FIFO[7:0]
+_FIFO_DATA_OUT_TAG = const(0x78)
+
+_MODE_BYPASS = const(0)
+_MODE_CONTINUOUS = const(6)
+_STATUS2_OVERRUN = const(0x40)
+
+_TAG_GYRO = const(0x01)
+_TAG_ACCEL = const(0x02)
+_WORD_SIZE = const(7)  # tag followed by three little endian int16
+
+# batch data rate code by rate in Hz, the output data rate codes are the same
+RATES: dict[float, int] = {
+    12.5: 1,
+    26: 2,
+    52: 3,
+    104: 4,
+    208: 5,
+    417: 6,
+    833: 7,
+    1667: 8,
+    3333: 9,
+    6667: 10,
+}
+
+
+class IMUFifo:
+    """
+    Drains accelerometer and gyroscope samples from the LSM6DSOX FIFO.
+    """
+
+    def __init__(self, i2c_device, capacity: int = 512, chunk_words: int = 32) -> None:
+        """
+        :param i2c_device: I2C device of the IMU, such as `LSM6DSOX.i2c_device`.
+        :param int capacity: Number of samples kept per sensor, later samples are dropped.
+        :param int chunk_words: Number of FIFO words read per I2C transaction.
+        """
+        self._device = i2c_device
+        self.capacity: int = capacity
+        self.accel: array = array("h", bytes(6 * capacity))
+        self.gyro: array = array("h", bytes(6 * capacity))
+        self.accel_count: int = 0
+        self.gyro_count: int = 0
+        self.dropped: int = 0
+        self.overruns: int = 0
+        self.rate: float = 0
+        self.start_ns: int = 0
+
+        self._chunk: bytearray = bytearray(chunk_words * _WORD_SIZE)
+        self._register: bytearray = bytearray(2)
+
+    """
+    Register access
+    """
+
+    def _read(self, register: int, size: int = 1) -> bytearray:
+        self._register[0] = register
+        with self._device as device:
+            device.write_then_readinto(
+                self._register, self._register, out_end=1, in_end=size
+            )
+        return self._register
+
+    def _write(self, register: int, value: int) -> None:
+        self._register[0] = register
+        self._register[1] = value
+        with self._device as device:
+            device.write(self._register)
+
+    def _set_odr(self, register: int, code: int) -> None:
+        value = self._read(register)[0]
+        self._write(register, (value & 0x0F) | (code << 4))
+
+    """
+    Acquisition
+    """
+
+    def start(self, rate: float) -> None:
+        """
+        Clear the buffers and start batching both sensors at the given rate.
+
+        :param float rate: Sample rate in Hz, one of the keys of RATES.
+
+        :raises ValueError: If the IMU does not support the rate.
+        """
+        code: Optional[int] = RATES.get(rate)
+        if code is None:
+            raise ValueError(f"Unsupported FIFO rate {rate} Hz")
+
+        # bypass mode empties the FIFO
+        self._write(_FIFO_CTRL4, _MODE_BYPASS)
+        self._set_odr(_CTRL1_XL, code)
+        self._set_odr(_CTRL2_G, code)
+        self._write(_FIFO_CTRL3, (code << 4) | code)
+
+        self.clear()
+        self.rate = rate
+        self.start_ns = time.monotonic_ns()
+        self._write(_FIFO_CTRL4, _MODE_CONTINUOUS)
+
+    def stop(self) -> None:
+        """
+        Stop batching, the samples already drained are kept.
+        """
+        self._write(_FIFO_CTRL4, _MODE_BYPASS)
+        self._write(_FIFO_CTRL3, 0)
+
+    def clear(self) -> None:
+        self.accel_count = 0
+        self.gyro_count = 0
+        self.dropped = 0
+        self.overruns = 0
+
+    def level(self) -> int:
+        """
+        Number of unread words in the FIFO, counting an overrun if one occurred.
+        """
+        status = self._read(_FIFO_STATUS1, 2)
+        if status[1] & _STATUS2_OVERRUN:
+            self.overruns += 1
+        return status[0] | (status[1] & 0x03) << 8
+
+    def drain(self) -> int:
+        """
+        Read every word currently in the FIFO into the sample buffers.
+
+        :return int: Number of words read.
+        """
+        words = self.level()
+        remaining = words
+        chunk_words = len(self._chunk) // _WORD_SIZE
+        self._register[0] = _FIFO_DATA_OUT_TAG
+
+        while remaining > 0:
+            count = min(remaining, chunk_words)
+            with self._device as device:
+                # the address rolls back to the tag register after each word
+                device.write_then_readinto(
+                    self._register, self._chunk, out_end=1, in_end=count * _WORD_SIZE
+                )
+            self._store(count)
+            remaining -= count
+
+        return words
+
+    def _store(self, count: int) -> None:
+        for word in range(count):
+            offset = word * _WORD_SIZE
+            tag = self._chunk[offset] >> 3
+            if tag == _TAG_ACCEL:
+                buffer, index = self.accel, self.accel_count
+            elif tag == _TAG_GYRO:
+                buffer, index = self.gyro, self.gyro_count
+            else:
+                continue  # timestamp, temperature and other words are not batched
+
+            if index >= self.capacity:
+                self.dropped += 1
+                continue
+
+            x, y, z = struct.unpack_from("<hhh", self._chunk, offset + 1)
+            buffer[3 * index] = x
+            buffer[3 * index + 1] = y
+            buffer[3 * index + 2] = z
+            if tag == _TAG_ACCEL:
+                self.accel_count += 1
+            else:
+                self.gyro_count += 1
+
+    """
+    Samples
+    """
+
+    def timestamp_ns(self, index: int) -> int:
+        """
+        Monotonic time in ns of a sample, from the start time and the sample rate.
+        """
+        return self.start_ns + int((index + 1) * 1000000000 / self.rate)
+
+    def accel_sample(self, index: int) -> tuple[int, int, int]:
+        return tuple(self.accel[3 * index : 3 * index + 3])
+
+    def gyro_sample(self, index: int) -> tuple[int, int, int]:
+        return tuple(self.gyro[3 * index : 3 * index + 3])
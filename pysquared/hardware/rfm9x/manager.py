@@ -57,6 +57,21 @@ class RFM9xManager:
 
         return self._radio
 
+    @property
+    def is_licensed(self) -> bool:
+        """Whether the radio may transmit, beacons are refused otherwise."""
+        return self._is_licensed
+
+    def reconfigure(self) -> None:
+        """Recreate the radio so it picks up changed radio config values, keeping its modulation.
+
+        :raises HardwareInitializationError: If the radio fails to initialize, it is retried on next use.
+        """
+        modulation = self.get_modulation()
+        self._radio = None
+        self._radio = self._radio_factory.create(self._log, modulation)
+        self._log.info("Radio reconfigured", modulation=modulation)
+
     def beacon_radio_message(self, msg: Any) -> None:
         """Beacon a radio message and log the result."""
         try:
@@ -0,0 +1,3 @@
+"""
+The log package is a collection of sinks and encoders used by the Logger
+"""
@@ -0,0 +1,322 @@
+"""
+Compact binary encoding for log records.
+
+JSON log lines repeat every key name and message string. The binary format
+interns those strings into a numeric table the first time they are seen and
+then refers to them by id. Timestamps are written as deltas from the previous
+record and values are written as small typed fields.
+
+Stream layout, every integer is an unsigned LEB128 varint unless noted:
+
+    define: 0x80, id, length, utf-8 bytes
+    record: level (0-5), zigzag time delta, string ref (message),
+            field count, then per field: string ref (key), typed value
+
+A string ref is `id << 1` for an interned string, or `length << 1 | 1`
+followed by the utf-8 bytes once the table is full.
+
+The encoder is stateful: give each output stream its own instance, and call
+`reset()` whenever a new stream (for example a new file) is started.
+"""
+
+import struct
+
+from micropython import const
+
+from ..logger import LogLevel, LogSink
+
+try:
+    from typing import Any, Optional
+
+    from ..logger import LogRecord
+except ImportError:
+    pass
+
+_TAG_DEFINE = const(0x80)
+
+_T_NONE = const(0)
+_T_FALSE = const(1)
+_T_TRUE = const(2)
+_T_INT = const(3)
+_T_FLOAT = const(4)
+_T_STR = const(5)
+_T_BYTES = const(6)
+_T_LIST = const(7)
+
+LEVEL_NAMES: tuple[str, ...] = (
+    "NOTSET",
+    "DEBUG",
+    "INFO",
+    "WARNING",
+    "ERROR",
+    "CRITICAL",
+)
+
+
+def _write_varint(buf: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _write_zigzag(buf: bytearray, value: int) -> None:
+    _write_varint(buf, (value << 1) if value >= 0 else ((-value << 1) - 1))
+
+
+class BinaryLogEncoder:
+    """
+    Encodes LogRecords into the compact binary format.
+    """
+
+    def __init__(self, max_strings: int = 128) -> None:
+        """
+        :param int max_strings: Size limit of the string table, strings seen after
+            the table is full are written inline.
+        """
+        self._max_strings: int = max_strings
+        self._strings: dict[str, int] = {}
+        self._last_time: int = 0
+
+    def reset(self) -> None:
+        """
+        Forget the string table and time base, the next record starts a new stream.
+        """
+        self._strings = {}
+        self._last_time = 0
+
+    def encode(self, record: LogRecord) -> bytes:
+        """
+        Encode a record, prefixed by definitions for any strings new to the stream.
+        """
+        buf = bytearray()
+        body = bytearray()
+
+        body.append(record.level_value)
+        _write_zigzag(body, record.time - self._last_time)
+        self._last_time = record.time
+
+        self._write_string_ref(buf, body, record.message)
+        _write_varint(body, len(record.kwargs))
+        for key, value in record.kwargs.items():
+            self._write_string_ref(buf, body, key)
+            self._write_value(body, value)
+
+        buf.extend(body)
+        return bytes(buf)
+
+    def _write_string_ref(self, defines: bytearray, body: bytearray, text: str) -> None:
+        string_id: Optional[int] = self._strings.get(text)
+        if string_id is None and len(self._strings) < self._max_strings:
+            string_id = len(self._strings)
+            self._strings[text] = string_id
+            data = text.encode("utf-8")
+            defines.append(_TAG_DEFINE)
+            _write_varint(defines, string_id)
+            _write_varint(defines, len(data))
+            defines.extend(data)
+
+        if string_id is not None:
+            _write_varint(body, string_id << 1)
+        else:
+            data = text.encode("utf-8")
+            _write_varint(body, (len(data) << 1) | 1)
+            body.extend(data)
+
+    def _write_value(self, buf: bytearray, value: Any) -> None:
+        if value is None:
+            buf.append(_T_NONE)
+        elif value is True:
+            buf.append(_T_TRUE)
+        elif value is False:
+            buf.append(_T_FALSE)
+        elif isinstance(value, int):
+            buf.append(_T_INT)
+            _write_zigzag(buf, value)
+        elif isinstance(value, float):
+            buf.append(_T_FLOAT)
+            buf.extend(struct.pack("<f", value))
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            buf.append(_T_BYTES)
+            _write_varint(buf, len(value))
+            buf.extend(value)
+        elif isinstance(value, (list, tuple)):
+            buf.append(_T_LIST)
+            _write_varint(buf, len(value))
+            for item in value:
+                self._write_value(buf, item)
+        else:
+            data = str(value).encode("utf-8")
+            buf.append(_T_STR)
+            _write_varint(buf, len(data))
+            buf.extend(data)
+
+
+class BinaryLogDecoder:
+    """
+    Decodes the binary log format back into dictionaries, intended for use on the ground.
+
+    The decoder keeps its string table and time base between calls, so a stream
+    can be decoded in consecutive pieces. `feed` accepts pieces that split a
+    record and keeps the incomplete tail until the next call.
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[int, str] = {}
+        self._last_time: int = 0
+        self._data: bytes = b""
+        self._pos: int = 0
+        self._tail: bytes = b""
+
+    def reset(self) -> None:
+        """
+        Forget the string table and time base, to be used at the start of a new stream.
+        """
+        self._strings = {}
+        self._last_time = 0
+        self._tail = b""
+
+    def decode(self, data: bytes) -> list[dict]:
+        """
+        Decode every record in data.
+
+        :raises ValueError: If the data is truncated or malformed.
+
+        :return list[dict]: Records with `time`, `level` and `msg` keys followed by their fields.
+        """
+        records = self.feed(data)
+        if self._tail:
+            self._tail = b""
+            raise ValueError("Malformed binary log data: truncated record")
+        return records
+
+    def feed(self, data: bytes) -> list[dict]:
+        """
+        Decode the complete records in data, keeping a trailing partial record for the next call.
+
+        :raises ValueError: If the data is malformed.
+
+        :return list[dict]: Records with `time`, `level` and `msg` keys followed by their fields.
+        """
+        self._data = self._tail + bytes(data)
+        self._pos = 0
+        self._tail = b""
+        records: list[dict] = []
+
+        while self._pos < len(self._data):
+            start = self._pos
+            try:
+                record = self._read_entry()
+            except IndexError:
+                # an incomplete entry, nothing from it has been applied yet
+                self._tail = self._data[start:]
+                break
+            except KeyError as e:
+                raise ValueError(f"Malformed binary log data: {e}") from e
+
+            if record is not None:
+                records.append(record)
+
+        self._data = b""
+        return records
+
+    def _read_entry(self) -> Optional[dict]:
+        tag = self._read_byte()
+        if tag == _TAG_DEFINE:
+            string_id = self._read_varint()
+            self._strings[string_id] = self._read_text()
+            return None
+
+        if tag >= len(LEVEL_NAMES):
+            raise ValueError(f"Unknown tag {tag} at offset {self._pos - 1}")
+
+        timestamp = self._last_time + self._read_zigzag()
+        record: dict = {
+            "time": timestamp,
+            "level": LEVEL_NAMES[tag],
+            "msg": self._read_string_ref(),
+        }
+        for _ in range(self._read_varint()):
+            key = self._read_string_ref()
+            record[key] = self._read_value()
+
+        self._last_time = timestamp
+        return record
+
+    def _read_byte(self) -> int:
+        value = self._data[self._pos]
+        self._pos += 1
+        return value
+
+    def _read_varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            byte = self._read_byte()
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def _read_zigzag(self) -> int:
+        value = self._read_varint()
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+    def _read_raw(self, length: int) -> bytes:
+        if self._pos + length > len(self._data):
+            raise IndexError("read past end of data")
+        data = self._data[self._pos : self._pos + length]
+        self._pos += length
+        return data
+
+    def _read_text(self) -> str:
+        return self._read_raw(self._read_varint()).decode("utf-8")
+
+    def _read_string_ref(self) -> str:
+        ref = self._read_varint()
+        if ref & 1:
+            return self._read_raw(ref >> 1).decode("utf-8")
+        return self._strings[ref >> 1]
+
+    def _read_value(self) -> Any:
+        value_type = self._read_byte()
+        if value_type == _T_NONE:
+            return None
+        if value_type == _T_FALSE:
+            return False
+        if value_type == _T_TRUE:
+            return True
+        if value_type == _T_INT:
+            return self._read_zigzag()
+        if value_type == _T_FLOAT:
+            return struct.unpack("<f", self._read_raw(4))[0]
+        if value_type == _T_STR:
+            return self._read_text()
+        if value_type == _T_BYTES:
+            return self._read_raw(self._read_varint())
+        if value_type == _T_LIST:
+            return [self._read_value() for _ in range(self._read_varint())]
+        raise ValueError(f"Unknown value type {value_type} at offset {self._pos - 1}")
+
+
+class BinaryLogSink(LogSink):
+    """
+    Logger sink that writes binary encoded records to a stream.
+    """
+
+    def __init__(
+        self,
+        stream,
+        level: int = LogLevel.NOTSET,
+        encoder: Optional[BinaryLogEncoder] = None,
+    ) -> None:
+        """
+        :param stream: Any object with a `write(bytes)` method, such as a file opened in "ab" mode.
+        :param int level: Minimum level of records written by this sink.
+        :param BinaryLogEncoder encoder: Encoder to use, a new one is created by default.
+        """
+        super().__init__(level, encoder if encoder is not None else BinaryLogEncoder())
+        self._stream = stream
+
+    def write(self, data: bytes, record: LogRecord) -> None:
+        self._stream.write(data)
@@ -0,0 +1,270 @@
+"""
+Buffered log sink that persists records to the SD card.
+
+Appending every line straight to a FAT file on the SD card is slow, so records
+are collected in a fixed RAM buffer and written out in whole blocks. ERROR and
+CRITICAL records flush the buffer immediately so they survive a reset.
+
+Records are stored in numbered segment files that are rotated once they reach
+a size cap. A small index file keeps track of the oldest and current segment so
+the oldest segments can be removed once `max_files` is reached, along with the
+time range, levels and record count of every segment so queries can skip
+segments without reading them. Every boot starts a new segment so each file is
+a self contained stream for the decoder.
+"""
+
+import os
+import struct
+
+from micropython import const
+
+from ..logger import LogLevel, LogSink
+from .binary import BinaryLogEncoder
+
+try:
+    from typing import Optional
+
+    from ..logger import LogRecord
+except ImportError:
+    pass
+
+_INDEX_FORMAT = "<II"  # oldest segment number, current segment number
+_ENTRY_FORMAT = "<IIBxH"  # first time, last time, level bitmask, record count
+_UNKNOWN_LEVELS = const(
+    0xFF
+)  # entry of a segment whose index was not saved before a reset
+
+
+def _as_bytes(data) -> bytes:
+    # text encoders produce one line per record
+    if isinstance(data, str):
+        return (data + "\n").encode("utf-8")
+    return data
+
+
+class BufferedFileSink(LogSink):
+    """
+    Logger sink that buffers encoded records in RAM and writes them to rotating files.
+    """
+
+    def __init__(
+        self,
+        directory: str = "/sd/logs",
+        level: int = LogLevel.NOTSET,
+        encoder=None,
+        buffer_size: int = 2048,
+        block_size: int = 512,
+        max_file_size: int = 65536,
+        max_files: int = 16,
+        prefix: str = "LOG",
+    ) -> None:
+        """
+        :param str directory: Directory the segment files and the index are written to.
+        :param int level: Minimum level of records written by this sink.
+        :param encoder: Object with an `encode(record)` method returning bytes or str, and
+            optionally a `reset()` method called when a new segment starts.
+            Defaults to a BinaryLogEncoder.
+        :param int buffer_size: Size in bytes of the RAM buffer.
+        :param int block_size: Data is written in multiples of this size unless flushed.
+        :param int max_file_size: Size in bytes at which a new segment is started.
+        :param int max_files: Number of segments kept before the oldest is removed.
+        :param str prefix: File name prefix of the segment files.
+        """
+        super().__init__(level, encoder if encoder is not None else BinaryLogEncoder())
+        self.directory: str = directory
+        self._block_size: int = block_size
+        self._max_file_size: int = max_file_size
+        self._max_files: int = max_files
+        self._prefix: str = prefix
+
+        self._buffer: bytearray = bytearray(buffer_size)
+        self._view: memoryview = memoryview(self._buffer)
+        self._fill: int = 0
+        self._file_size: int = 0
+        self.dropped_bytes: int = 0
+
+        try:
+            os.mkdir(directory)
+        except OSError:
+            pass  # already exists
+
+        self._oldest, self._current = self._read_index()
+        self._start_segment(self._current + 1 if self._has_index else 0)
+
+    """
+    Index and segment handling
+    """
+
+    @property
+    def _index_path(self) -> str:
+        return self.directory + "/index"
+
+    def segment_path(self, number: int) -> str:
+        """
+        Path of the segment file with the given number.
+        """
+        return "{}/{}{:05}.log".format(self.directory, self._prefix, number)
+
+    def segments(self) -> range:
+        """
+        Numbers of the segments currently on disk, oldest first.
+        """
+        return range(self._oldest, self._current + 1)
+
+    def segment_info(self, number: int) -> Optional[list[int]]:
+        """
+        Index entry of a segment as [first time, last time, level bitmask, record count].
+
+        :return: The entry, or None when the contents of the segment are unknown.
+        """
+        return self._entries.get(number)
+
+    def _read_index(self) -> tuple[int, int]:
+        self._entries: dict[int, Optional[list[int]]] = {}
+        header_size = struct.calcsize(_INDEX_FORMAT)
+        entry_size = struct.calcsize(_ENTRY_FORMAT)
+
+        try:
+            with open(self._index_path, "rb") as f:
+                data = f.read()
+            self._has_index = len(data) >= header_size
+        except OSError:
+            self._has_index = False
+
+        if not self._has_index:
+            return 0, 0
+
+        oldest, current = struct.unpack_from(_INDEX_FORMAT, data)
+        for i, number in enumerate(range(oldest, current + 1)):
+            offset = header_size + i * entry_size
+            entry = None
+            if offset + entry_size <= len(data):
+                entry = list(struct.unpack_from(_ENTRY_FORMAT, data, offset))
+            if entry is not None and entry[2] != _UNKNOWN_LEVELS:
+                self._entries[number] = entry
+            else:
+                self._entries[number] = None
+
+        # the last segment may have been written after its entry was saved
+        self._entries[current] = None
+        return oldest, current
+
+    def _write_index(self) -> None:
+        data = bytearray(struct.pack(_INDEX_FORMAT, self._oldest, self._current))
+        for number in self.segments():
+            entry = self._entries.get(number)
+            if entry is None:
+                data.extend(struct.pack(_ENTRY_FORMAT, 0, 0, _UNKNOWN_LEVELS, 0))
+            else:
+                data.extend(struct.pack(_ENTRY_FORMAT, *entry))
+
+        with open(self._index_path, "wb") as f:
+            f.write(data)
+        self._has_index = True
+
+    def _start_segment(self, number: int) -> None:
+        if not self._has_index:
+            self._oldest = number
+        self._current = number
+        self._file_size = 0
+        self._entries[number] = [0, 0, 0, 0]
+
+        while self._current - self._oldest + 1 > self._max_files:
+            try:
+                os.remove(self.segment_path(self._oldest))
+            except OSError:
+                pass  # already gone
+            self._entries.pop(self._oldest, None)
+            self._oldest += 1
+
+        reset = getattr(self.encoder, "reset", None)
+        if reset is not None:
+            reset()
+
+        try:
+            self._write_index()
+        except OSError:
+            pass  # retried on the next flush
+
+    """
+    Buffering
+    """
+
+    def write(self, data, record: LogRecord) -> None:
+        data = _as_bytes(data)
+
+        # rotate on record boundaries, re-encoding so the new segment carries its own string table
+        pending = self._file_size + self._fill
+        if pending > 0 and pending + len(data) > self._max_file_size:
+            self.flush()
+            self._start_segment(self._current + 1)
+            data = _as_bytes(self.encoder.encode(record))
+
+        self._append(data)
+        self._update_entry(record)
+
+        if record.level_value >= LogLevel.ERROR:
+            if self._fill:
+                self._write(self._fill)
+        elif self._fill >= self._block_size:
+            self._write(self._fill - self._fill % self._block_size)
+
+    def _append(self, data: bytes) -> None:
+        size = len(data)
+        if self._fill + size > len(self._buffer):
+            self.flush()
+
+        if size > len(self._buffer):
+            self._write_to_file(data)
+            return
+
+        self._view[self._fill : self._fill + size] = data
+        self._fill += size
+
+    def _update_entry(self, record: LogRecord) -> None:
+        entry = self._entries[self._current]
+        if entry[3] == 0:
+            entry[0] = record.time
+        entry[1] = record.time
+        entry[2] |= 1 << record.level_value
+        entry[3] = min(entry[3] + 1, 0xFFFF)
+
+    def flush(self) -> None:
+        """
+        Write everything in the buffer to the current segment and save the index.
+        """
+        if self._fill:
+            self._write(self._fill)
+        try:
+            self._write_index()
+        except OSError:
+            pass  # the card may be missing, the index is rebuilt as unknown on boot
+
+    def _write(self, size: int) -> None:
+        self._write_to_file(self._view[:size])
+
+        # keep the remainder that did not make up a whole block
+        remainder = self._fill - size
+        self._buffer[:remainder] = self._buffer[size : self._fill]
+        self._fill = remainder
+
+    def _write_to_file(self, data: memoryview) -> None:
+        try:
+            with open(self.segment_path(self._current), "ab") as f:
+                f.write(data)
+            self._file_size += len(data)
+        except OSError:
+            # the card may be missing or full, drop the data rather than block logging
+            self.dropped_bytes += len(data)
+
+    def read_segment(self, number: int) -> Optional[bytes]:
+        """
+        Read the contents of a segment, flushing the buffer first when it is the current one.
+        """
+        if number == self._current:
+            self.flush()
+        try:
+            with open(self.segment_path(number), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
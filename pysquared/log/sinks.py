@@ -0,0 +1,93 @@
+"""
+Additional log sinks for the Logger.
+
+The console sink is the Logger default and lives in `pysquared.logger`, the
+binary stream sink lives in `pysquared.log.binary` and the SD card sink in
+`pysquared.log.file_sink`.
+"""
+
+from ..logger import LogLevel, LogSink
+
+try:
+    from typing import Any
+
+    from ..logger import LogRecord
+except ImportError:
+    pass
+
+
+class RingSink(LogSink):
+    """
+    Keeps the most recent encoded records in memory.
+    """
+
+    def __init__(
+        self, capacity: int = 32, level: int = LogLevel.NOTSET, encoder=None
+    ) -> None:
+        """
+        :param int capacity: Number of records kept before the oldest is overwritten.
+        :param int level: Minimum level of records kept by this sink.
+        :param encoder: Encoder to use, defaults to the shared JSON encoder.
+        """
+        super().__init__(level, encoder)
+        self._entries: list = [None] * capacity
+        self._next: int = 0
+        self._count: int = 0
+
+    def write(self, data: Any, record: LogRecord) -> None:
+        self._entries[self._next] = data
+        self._next = (self._next + 1) % len(self._entries)
+        self._count = min(self._count + 1, len(self._entries))
+
+    def entries(self) -> list:
+        """
+        The kept records, oldest first.
+        """
+        start = (self._next - self._count) % len(self._entries)
+        return [
+            self._entries[(start + i) % len(self._entries)] for i in range(self._count)
+        ]
+
+    def clear(self) -> None:
+        self._entries = [None] * len(self._entries)
+        self._next = 0
+        self._count = 0
+
+
+class RadioSink(LogSink):
+    """
+    Downlinks important records over the radio, ERROR and above by default.
+
+    Nothing is sent while the radio is not licensed to transmit, the refused
+    beacon would otherwise log a second error for every record.
+    """
+
+    def __init__(
+        self,
+        radio_manager,
+        level: int = LogLevel.ERROR,
+        encoder=None,
+        max_length: int = 240,
+    ) -> None:
+        """
+        :param RFM9xManager radio_manager: Radio manager used to beacon the records, which
+            expects text, so use a text encoder.
+        :param int level: Minimum level of records sent by this sink.
+        :param encoder: Encoder to use, defaults to the shared JSON encoder.
+        :param int max_length: Records are truncated to fit in a single packet.
+        """
+        super().__init__(level, encoder)
+        self._radio_manager = radio_manager
+        self._max_length: int = max_length
+        self._sending: bool = False
+
+    def write(self, data: Any, record: LogRecord) -> None:
+        # the radio manager logs its own failures, which would land back here
+        if self._sending or not self._radio_manager.is_licensed:
+            return
+
+        self._sending = True
+        try:
+            self._radio_manager.beacon_radio_message(data[: self._max_length])
+        finally:
+            self._sending = False
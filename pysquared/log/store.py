@@ -0,0 +1,166 @@
+"""
+Queries over the log segments written by a BufferedFileSink.
+
+Segments whose index entry rules them out by time range or levels are skipped
+without being opened, the others are decoded in small chunks so only matching
+records are kept in memory. `iter_records` streams the matches instead of
+collecting them, and `encode_records` re-encodes them record by record for
+downlink, to be decoded on the ground with BinaryLogDecoder.
+"""
+
+from micropython import const
+
+from ..file_reader import read_chunks
+from ..logger import LogLevel, LogRecord
+from .binary import LEVEL_NAMES, BinaryLogDecoder, BinaryLogEncoder
+
+try:
+    from typing import Iterable, Iterator, Optional
+
+    from .file_sink import BufferedFileSink
+except ImportError:
+    pass
+
+MAX_TIME = const(0xFFFFFFFF)
+
+
+def query(
+    sink: BufferedFileSink,
+    start: int = 0,
+    end: int = MAX_TIME,
+    min_level: int = LogLevel.NOTSET,
+    max_level: int = LogLevel.CRITICAL,
+    limit: Optional[int] = None,
+    chunk_size: int = 256,
+) -> list[LogRecord]:
+    """
+    Find stored records by time range and level.
+
+    :param BufferedFileSink sink: The sink whose segments are searched, it must use a BinaryLogEncoder.
+    :param int start: Earliest record time, in seconds since the epoch.
+    :param int end: Latest record time, in seconds since the epoch.
+    :param int min_level: Lowest level to include.
+    :param int max_level: Highest level to include.
+    :param int limit: Only return the newest `limit` matches.
+    :param int chunk_size: Number of bytes read from a segment at a time.
+
+    :raises ValueError: If the sink does not write the binary format.
+
+    :return list[LogRecord]: The matching records, oldest first.
+    """
+    level_mask = _prepare(sink, min_level, max_level)
+
+    segments = sink.segments()
+    results: list[LogRecord] = []
+    for number in range(segments[-1], segments[0] - 1, -1):
+        if limit is not None and len(results) >= limit:
+            break
+        if _ruled_out(sink, number, start, end, level_mask):
+            continue
+
+        matches: list[LogRecord] = []
+        remaining = None if limit is None else limit - len(results)
+        for record in _segment_records(
+            sink, number, start, end, level_mask, chunk_size
+        ):
+            matches.append(record)
+            # only the newest matches of a segment are kept
+            if remaining is not None and len(matches) > remaining:
+                matches.pop(0)
+        results = matches + results
+
+    return results
+
+
+def iter_records(
+    sink: BufferedFileSink,
+    start: int = 0,
+    end: int = MAX_TIME,
+    min_level: int = LogLevel.NOTSET,
+    max_level: int = LogLevel.CRITICAL,
+    limit: Optional[int] = None,
+    chunk_size: int = 256,
+) -> Iterator[LogRecord]:
+    """
+    Stream stored records by time range and level, without keeping the matches in memory.
+
+    Takes the same arguments as `query`, but `limit` keeps the oldest matches.
+
+    :raises ValueError: If the sink does not write the binary format.
+
+    :return: A generator of the matching records, oldest first.
+    """
+    level_mask = _prepare(sink, min_level, max_level)
+
+    count = 0
+    for number in sink.segments():
+        if _ruled_out(sink, number, start, end, level_mask):
+            continue
+        for record in _segment_records(
+            sink, number, start, end, level_mask, chunk_size
+        ):
+            if limit is not None and count >= limit:
+                return
+            count += 1
+            yield record
+
+
+def _prepare(sink: BufferedFileSink, min_level: int, max_level: int) -> int:
+    if not isinstance(sink.encoder, BinaryLogEncoder):
+        raise ValueError("Log queries need segments written with a BinaryLogEncoder")
+
+    # make sure the current segment and its index entry are on the card
+    sink.flush()
+
+    level_mask = 0
+    for level in range(min_level, max_level + 1):
+        level_mask |= 1 << level
+    return level_mask
+
+
+def _ruled_out(
+    sink: BufferedFileSink, number: int, start: int, end: int, level_mask: int
+) -> bool:
+    entry = sink.segment_info(number)
+    return entry is not None and (
+        entry[3] == 0 or entry[1] < start or entry[0] > end or not entry[2] & level_mask
+    )
+
+
+def _segment_records(
+    sink: BufferedFileSink,
+    number: int,
+    start: int,
+    end: int,
+    level_mask: int,
+    chunk_size: int,
+) -> Iterator[LogRecord]:
+    decoder = BinaryLogDecoder()
+
+    try:
+        for chunk in read_chunks(sink.segment_path(number), chunk_size):
+            for decoded in decoder.feed(chunk):
+                level_value = LEVEL_NAMES.index(decoded.pop("level"))
+                timestamp = decoded.pop("time")
+                if start <= timestamp <= end and (1 << level_value) & level_mask:
+                    message = decoded.pop("msg")
+                    yield LogRecord(
+                        timestamp,
+                        LEVEL_NAMES[level_value],
+                        level_value,
+                        message,
+                        decoded,
+                    )
+    except OSError:
+        pass  # segment removed or unreadable, nothing to report from it
+    except ValueError:
+        pass  # corrupted segment, the chunks decoded before the damage are kept
+
+
+def encode_records(records: Iterable[LogRecord]) -> Iterator[bytes]:
+    """
+    Encode records as a self contained binary log stream, one piece per record.
+    """
+    encoder = BinaryLogEncoder()
+    for record in records:
+        yield encoder.encode(record)
@@ -1,6 +1,7 @@
 """
 Logger class for handling logging messages with different severity levels.
-Logs can be output to standard output or saved to a file (functionality to be implemented).
+Logs are handed to sinks, each with its own level threshold and encoder. By
+default the only sink is standard output, other sinks live in `pysquared.log`.
 """
 
 import json
@@ -10,6 +11,11 @@ from collections import OrderedDict
 
 from .nvm.counter import Counter
 
+try:
+    from typing import Any, Callable, Optional
+except ImportError:
+    pass
+
 
 def _color(msg, color="gray", fmt="normal"):
     _h = "\033["
@@ -49,44 +55,80 @@ class LogLevel:
     CRITICAL = 5
 
 
-class Logger:
+class Deferred:
+    """
+    Wraps a log value that is expensive to build.
+
+    The function is only called when the message passes the level filter, e.g.
+    `logger.debug("Sent", header=Deferred(hex_list, header))`.
+    """
+
+    def __init__(self, func: Callable[..., Any], *args: Any) -> None:
+        self._func = func
+        self._args = args
+
+    def resolve(self) -> Any:
+        return self._func(*self._args)
+
+
+def _exception_location(err: Exception) -> str:
+    """
+    The file and line of the innermost frame of an exception, without formatting a traceback.
+    """
+    tb = getattr(err, "__traceback__", None)
+    if tb is None:
+        return ""
+    while getattr(tb, "tb_next", None) is not None:
+        tb = tb.tb_next
+
+    code = getattr(getattr(tb, "tb_frame", None), "f_code", None)
+    return f"{getattr(code, 'co_filename', '?')}:{getattr(tb, 'tb_lineno', 0)}"
+
+
+def _exception_signature(err: Exception) -> str:
+    """
+    A one line summary of an exception: its type, message and innermost location.
+    """
+    signature = f"{type(err).__name__}: {err}"
+    location = _exception_location(err)
+    if location:
+        signature += f" ({location})"
+    return signature
+
+
+class LogRecord:
+    """
+    A single log entry as handed to sinks once it has passed the level filter.
+    """
+
     def __init__(
-        self,
-        error_counter: Counter,
-        log_level: int = LogLevel.NOTSET,
-        colorized: bool = False,
+        self, time: int, level: str, level_value: int, message: str, kwargs: dict
     ) -> None:
-        self._error_counter: Counter = error_counter
-        self._log_level: int = log_level
-        self.colorized: bool = colorized
+        self.time: int = time  # seconds since the epoch
+        self.level: str = level
+        self.level_value: int = level_value
+        self.message: str = message
+        self.kwargs: dict = kwargs
 
-    def _can_print_this_level(self, level_value: int) -> bool:
-        return level_value >= self._log_level
 
-    def _log(self, level: str, level_value: int, message: str, **kwargs) -> None:
-        """
-        Log a message with a given severity level and any addional key/values.
-        """
-        now = time.localtime()
-        asctime = f"{now.tm_year}-{now.tm_mon:02d}-{now.tm_mday:02d} {now.tm_hour:02d}:{now.tm_min:02d}:{now.tm_sec:02d}"
+class JsonLogEncoder:
+    """
+    Encodes a LogRecord as a single line JSON object.
+    """
 
-        # case where someone used debug, info, or warning yet also provides an 'err' kwarg with an Exception
-        if (
-            "err" in kwargs
-            and level not in ("ERROR", "CRITICAL")
-            and isinstance(kwargs["err"], Exception)
-        ):
-            kwargs["err"] = traceback.format_exception(kwargs["err"])
+    def encode(self, record: LogRecord) -> str:
+        now = time.localtime(record.time)
+        asctime = f"{now.tm_year}-{now.tm_mon:02d}-{now.tm_mday:02d} {now.tm_hour:02d}:{now.tm_min:02d}:{now.tm_sec:02d}"
 
         json_order: OrderedDict[str, str] = OrderedDict(
-            [("time", asctime), ("level", level), ("msg", message)]
+            [("time", asctime), ("level", record.level), ("msg", record.message)]
         )
-        json_order.update(kwargs)
+        json_order.update(record.kwargs)
 
         try:
-            json_output = json.dumps(json_order)
+            return json.dumps(json_order)
         except TypeError as e:
-            json_output = json.dumps(
+            return json.dumps(
                 OrderedDict(
                     [
                         ("time", asctime),
@@ -96,12 +138,199 @@ class Logger:
                 ),
             )
 
-        if self._can_print_this_level(level_value):
-            if self.colorized:
-                json_output = json_output.replace(
-                    f'"level": "{level}"', f'"level": "{LogColors[level]}"'
-                )
-            print(json_output)
+
+# Shared by every sink that does not bring its own encoder, so JSON is built once per record
+JSON_ENCODER: JsonLogEncoder = JsonLogEncoder()
+
+
+class LogSink:
+    """
+    Base class for log destinations.
+
+    Each sink has its own level threshold and encoder. The Logger encodes a
+    record once per distinct encoder instance and hands the result to every
+    sink using that encoder, so sinks should share encoders where they can.
+    Stateful encoders, such as the binary encoder, must not be shared between
+    sinks writing to different streams.
+    """
+
+    def __init__(self, level: int = LogLevel.NOTSET, encoder=None) -> None:
+        """
+        :param int level: Minimum level of records written by this sink.
+        :param encoder: Object with an `encode(record)` method, defaults to the shared JSON encoder.
+        """
+        self.level: int = level
+        self.encoder = encoder if encoder is not None else JSON_ENCODER
+
+    def write(self, data, record: LogRecord) -> None:
+        """
+        Write an encoded record.
+
+        :param data: The output of `self.encoder.encode(record)`.
+        :param LogRecord record: The record, for sinks that need its level or time.
+
+        Subclasses override this, the base sink discards the record.
+        """
+
+    def emit(self, record: LogRecord) -> None:
+        """
+        Encode and write a single record, for use outside of a Logger.
+        """
+        if record.level_value >= self.level:
+            self.write(self.encoder.encode(record), record)
+
+
+class ConsoleSink(LogSink):
+    """
+    Prints records to standard output.
+    """
+
+    def __init__(
+        self, level: int = LogLevel.NOTSET, encoder=None, colorized: bool = False
+    ) -> None:
+        super().__init__(level, encoder)
+        self.colorized: bool = colorized
+
+    def write(self, data, record: LogRecord) -> None:
+        if self.colorized:
+            data = data.replace(
+                f'"level": "{record.level}"', f'"level": "{LogColors[record.level]}"'
+            )
+        print(data)
+
+
+class Logger:
+    def __init__(
+        self,
+        error_counter: Counter,
+        log_level: int = LogLevel.NOTSET,
+        colorized: bool = False,
+        sinks: Optional[list[LogSink]] = None,
+        suppression_window: float = 60.0,
+        max_tracked_errors: int = 16,
+        full_tracebacks: bool = False,
+        max_recent_errors: int = 4,
+    ) -> None:
+        """
+        :param Counter error_counter: Counter incremented for every error and critical message
+            that is written, suppressed repeats are not counted.
+        :param int log_level: Global minimum level, applied before any sink level.
+        :param bool colorized: Colorize the level in the console sinks, can be changed later.
+        :param list[LogSink] sinks: Destinations for log records, defaults to the console only.
+        :param float suppression_window: Seconds during which repeats of the same error are
+            suppressed, 0 disables suppression.
+        :param int max_tracked_errors: Number of distinct errors tracked for suppression.
+        :param bool full_tracebacks: Log full tracebacks instead of compact exception signatures.
+        :param int max_recent_errors: Number of recent errors kept for `get_recent_tracebacks`.
+        """
+        self._error_counter: Counter = error_counter
+        self._log_level: int = log_level
+        self._sinks: list[LogSink] = (
+            sinks if sinks is not None else [ConsoleSink(colorized=colorized)]
+        )
+        self.colorized = colorized
+        self._update_min_level()
+
+        self._suppression_window: float = suppression_window
+        self._max_tracked_errors: int = max_tracked_errors
+        # (message, exception type, location) -> [window start, repeats, level, level value]
+        self._repeats: dict[tuple, list] = {}
+
+        self.full_tracebacks: bool = full_tracebacks
+        self._max_recent_errors: int = max_recent_errors
+        # (time, message, exception) of the latest errors, formatted only when fetched
+        self._recent_errors: list[tuple] = []
+
+    @property
+    def colorized(self) -> bool:
+        return self._colorized
+
+    @colorized.setter
+    def colorized(self, value: bool) -> None:
+        """
+        Colorize the level in every attached console sink.
+        """
+        self._colorized: bool = value
+        for sink in self._sinks:
+            if isinstance(sink, ConsoleSink):
+                sink.colorized = value
+
+    def add_sink(self, sink: LogSink) -> None:
+        """
+        Attach a sink that receives every LogRecord at or above its level.
+        """
+        self._sinks.append(sink)
+        self._update_min_level()
+
+    def remove_sink(self, sink: LogSink) -> None:
+        """
+        Detach a previously added sink.
+        """
+        self._sinks.remove(sink)
+        self._update_min_level()
+
+    def _update_min_level(self) -> None:
+        # the lowest level any sink accepts, anything below is dropped before formatting
+        sink_level: int = LogLevel.CRITICAL + 1
+        for sink in self._sinks:
+            sink_level = min(sink_level, sink.level)
+        self._min_level: int = max(self._log_level, sink_level)
+
+    def _can_print_this_level(self, level_value: int) -> bool:
+        return level_value >= self._min_level
+
+    def is_enabled_for(self, level_value: int) -> bool:
+        """
+        Check whether a message of the given level would be logged by at least one sink.
+
+        Useful to skip building expensive log arguments in hot loops.
+        """
+        return self._can_print_this_level(level_value)
+
+    def _log(self, level: str, level_value: int, message: str, **kwargs) -> None:
+        """
+        Log a message with a given severity level and any addional key/values.
+
+        The level is checked before any formatting happens so that filtered out
+        messages cost next to nothing. Values wrapped in `Deferred` are only
+        evaluated once the message is known to be written.
+        """
+        if not self._can_print_this_level(level_value):
+            return
+
+        for key, value in kwargs.items():
+            if isinstance(value, Deferred):
+                kwargs[key] = value.resolve()
+
+        # format the exception attached to any level, error and critical included
+        if "err" in kwargs and isinstance(kwargs["err"], Exception):
+            if self.full_tracebacks:
+                kwargs["err"] = traceback.format_exception(kwargs["err"])
+            else:
+                kwargs["err"] = _exception_signature(kwargs["err"])
+
+        record = LogRecord(int(time.time()), level, level_value, message, kwargs)
+
+        # (encoder, data) pairs so each encoder runs once per record
+        encoded: list = []
+        for sink in self._sinks:
+            if level_value < sink.level:
+                continue
+
+            try:
+                data = None
+                for encoder, cached in encoded:
+                    if encoder is sink.encoder:
+                        data = cached
+                        break
+                if data is None:
+                    data = sink.encoder.encode(record)
+                    encoded.append((sink.encoder, data))
+
+                sink.write(data, record)
+            except Exception:
+                # a failing sink must never take the caller down with it
+                pass
 
     def debug(self, message: str, **kwargs) -> None:
         """
@@ -125,17 +354,101 @@ class Logger:
         """
         Log a message with severity level ERROR.
         """
-        kwargs["err"] = traceback.format_exception(err)
-        self._error_counter.increment()
-        self._log("ERROR", 4, message, **kwargs)
+        self._log_error("ERROR", 4, message, err, kwargs)
 
     def critical(self, message: str, err: Exception, **kwargs) -> None:
         """
         Log a message with severity level CRITICAL.
         """
-        kwargs["err"] = traceback.format_exception(err)
+        self._log_error("CRITICAL", 5, message, err, kwargs)
+
+    def _log_error(
+        self, level: str, level_value: int, message: str, err: Exception, kwargs: dict
+    ) -> None:
+        """
+        Log an error unless it is a repeat within the suppression window.
+
+        The first occurrence is written in full. Repeats within the window only
+        bump a counter, and the first occurrence after the window carries a
+        `repeated` field with the number of suppressed repeats.
+        """
+        if self._suppression_window > 0:
+            key = (message, type(err).__name__, _exception_location(err))
+            now = time.monotonic()
+            entry: Optional[list] = self._repeats.get(key)
+
+            if entry is not None and now - entry[0] < self._suppression_window:
+                entry[1] += 1
+                return
+
+            if entry is not None and entry[1]:
+                kwargs["repeated"] = entry[1]
+
+            if entry is None and len(self._repeats) >= self._max_tracked_errors:
+                self._forget_oldest_error()
+            self._repeats[key] = [now, 0, level, level_value]
+
+        self._recent_errors.append((int(time.time()), message, err))
+        if len(self._recent_errors) > self._max_recent_errors:
+            self._recent_errors.pop(0)
+
+        kwargs["err"] = err
+        self._error_counter.increment()
+        self._log(level, level_value, message, **kwargs)
+
+    def get_recent_tracebacks(self) -> list[str]:
+        """
+        Full tracebacks of the most recent errors and critical messages, oldest first.
+
+        Tracebacks are only formatted here, so keeping them is cheap while logging.
+        """
+        return [
+            f"{timestamp} {message}\n" + "".join(traceback.format_exception(err))
+            for timestamp, message, err in self._recent_errors
+        ]
+
+    def _forget_oldest_error(self) -> None:
+        oldest_key = None
+        for key, entry in self._repeats.items():
+            if oldest_key is None or entry[0] < self._repeats[oldest_key][0]:
+                oldest_key = key
+        entry = self._repeats.pop(oldest_key)
+        if entry[1]:
+            self._log_repeats(oldest_key, entry)
+
+    def _log_repeats(self, key: tuple, entry: list) -> None:
+        message, err_type, location = key
         self._error_counter.increment()
-        self._log("CRITICAL", 5, message, **kwargs)
+        self._log(
+            entry[2],
+            entry[3],
+            message,
+            repeated=entry[1],
+            err_type=err_type,
+            location=location,
+        )
+
+    def flush_repeats(self) -> None:
+        """
+        Write a summary for every error whose suppression window has passed with repeats.
+
+        The flight loop runs it as a periodic task and it is called again before a
+        planned reset, so storms that have stopped are reported without waiting
+        for the next occurrence.
+        """
+        now = time.monotonic()
+        for key in list(self._repeats.keys()):
+            entry = self._repeats[key]
+            if now - entry[0] >= self._suppression_window:
+                del self._repeats[key]
+                if entry[1]:
+                    self._log_repeats(key, entry)
 
     def get_error_count(self) -> int:
         return self._error_counter.get()
+
+    def set_error_counter(self, error_counter: Counter) -> None:
+        """
+        Count errors with another counter from now on, e.g. the wide NVM counter once it is set up.
+        """
+        self._error_counter = error_counter
@@ -0,0 +1,130 @@
+"""
+Write-back cache for non-volatile memory.
+
+Every assignment to `microcontroller.nvm` is a separate erase and write cycle
+of the flash. The cache keeps a RAM copy of a window of the datastore, so
+Counters and Flags built on top of it only change RAM, and `commit()` writes
+every changed byte back with a single slice assignment.
+
+Bytes in the window must only be changed through the cache: a commit writes
+the cached copy of the whole changed span, so a change made directly on the
+datastore is overwritten the next time a byte near it changes.
+"""
+
+try:
+    from typing import Union
+
+    from circuitpython_typing import ReadableBuffer
+
+    from stubs.circuitpython.byte_array import ByteArray
+except ImportError:
+    pass
+
+
+class NVMCache:
+    """
+    Caches a window of a datastore and writes changes back on commit.
+
+    Indexes are the same as in the underlying datastore, so the cache can be
+    passed to Counter and Flag in place of `microcontroller.nvm`. It can also be
+    used as a context manager that commits on exit:
+
+        with cache:
+            boot_count.increment()
+            f_softboot.toggle(False)
+    """
+
+    def __init__(self, datastore: ByteArray, start: int = 0, size: int = 32) -> None:
+        """
+        :param ByteArray datastore: The non-volatile memory to cache.
+        :param int start: Index of the first cached byte.
+        :param int size: Number of cached bytes.
+        """
+        self._datastore: ByteArray = datastore
+        self._start: int = start
+        self._cache: bytearray = bytearray(datastore[start : start + size])
+        self._dirty_start: int = size
+        self._dirty_end: int = 0
+        self.commits: int = 0
+
+    def __len__(self) -> int:
+        return self._start + len(self._cache)
+
+    def _offset(self, index: int) -> int:
+        offset = index - self._start
+        if offset < 0 or offset >= len(self._cache):
+            raise IndexError(f"NVM index {index} is outside the cached window")
+        return offset
+
+    def _span(self, index: slice) -> tuple[int, int]:
+        # cache offsets of a slice, open ends and negative indexes as on the datastore
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            raise ValueError("NVM slices must be contiguous")
+        if stop <= start:
+            return 0, 0
+        return self._offset(start), self._offset(stop - 1) + 1
+
+    def __getitem__(self, index: Union[slice, int]) -> Union[bytearray, int]:
+        if isinstance(index, slice):
+            start, end = self._span(index)
+            return bytearray(self._cache[start:end])
+        return self._cache[self._offset(index)]
+
+    def __setitem__(
+        self, index: Union[slice, int], value: Union[ReadableBuffer, int]
+    ) -> None:
+        if isinstance(index, slice):
+            start, end = self._span(index)
+            if len(value) != end - start:
+                raise ValueError("NVM slice assignment cannot change the size")
+            if self._cache[start:end] == value:
+                return
+            self._cache[start:end] = value
+        else:
+            start = self._offset(index)
+            end = start + 1
+            if self._cache[start] == value:
+                return
+            self._cache[start] = value
+
+        self._dirty_start = min(self._dirty_start, start)
+        self._dirty_end = max(self._dirty_end, end)
+
+    @property
+    def dirty(self) -> bool:
+        """
+        True when there are changes that have not been written to the datastore.
+        """
+        return self._dirty_end > self._dirty_start
+
+    def commit(self) -> bool:
+        """
+        Write the changed bytes to the datastore in a single assignment.
+
+        :return bool: True if anything was written.
+        """
+        if not self.dirty:
+            return False
+
+        self._datastore[
+            self._start + self._dirty_start : self._start + self._dirty_end
+        ] = self._cache[self._dirty_start : self._dirty_end]
+        self._dirty_start = len(self._cache)
+        self._dirty_end = 0
+        self.commits += 1
+        return True
+
+    def discard(self) -> None:
+        """
+        Drop uncommitted changes and reload the window from the datastore.
+        """
+        self._cache[:] = self._datastore[self._start : self._start + len(self._cache)]
+        self._dirty_start = len(self._cache)
+        self._dirty_end = 0
+
+    def __enter__(self) -> "NVMCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.commit()
@@ -1,8 +1,16 @@
+import struct
+
+from micropython import const
+
 try:
     from stubs.circuitpython.byte_array import ByteArray
 except ImportError:
     pass
 
+_SLOT_FORMAT = "<BI"  # sequence number, value
+_SLOT_SIZE = const(5)
+_ERASED = const(0xFFFFFFFF)
+
 
 class Counter:
     def __init__(
@@ -25,3 +33,85 @@ class Counter:
         """
         value: int = (self.get() + 1) & 0xFF  # 8-bit counter with rollover
         self._datastore[self._index] = value
+
+
+class WideCounter(Counter):
+    """
+    32-bit counter that rotates its writes across a region of slots
+
+    Every slot holds a sequence number and a value. Each increment writes the
+    next slot with the sequence number increased by one, so the current slot is
+    the last one before the sequence breaks and no byte is rewritten on every
+    increment.
+    """
+
+    def __init__(self, index: int, datastore: ByteArray, slots: int = 8) -> None:
+        """
+        :param int index: Index of the first byte of the region.
+        :param ByteArray datastore: The non-volatile memory holding the region.
+        :param int slots: Number of slots, the region is `WideCounter.size(slots)` bytes long.
+
+        :raises ValueError: If the number of slots does not fit the 8-bit sequence number.
+        """
+        if not 1 < slots < 256:
+            raise ValueError("A wide counter needs between 2 and 255 slots")
+
+        super().__init__(index, datastore)
+        self._slots: int = slots
+        self._slot, self._sequence = self._find_current()
+
+    @staticmethod
+    def size(slots: int = 8) -> int:
+        """
+        size returns the number of bytes used by a counter with the given number of slots
+        """
+        return slots * _SLOT_SIZE
+
+    def _find_current(self) -> tuple[int, int]:
+        data = self._datastore[self._index : self._index + self.size(self._slots)]
+        current = self._slots - 1
+        for slot in range(1, self._slots):
+            if data[slot * _SLOT_SIZE] != (data[(slot - 1) * _SLOT_SIZE] + 1) & 0xFF:
+                current = slot - 1
+                break
+        return current, data[current * _SLOT_SIZE]
+
+    def get(self) -> int:
+        """
+        get returns the value of the counter
+        """
+        start = self._index + self._slot * _SLOT_SIZE
+        value = struct.unpack("<I", self._datastore[start + 1 : start + _SLOT_SIZE])[0]
+        return 0 if value == _ERASED else value
+
+    def increment(self) -> None:
+        """
+        increment increases the counter by one, writing a single slot
+        """
+        self._write((self.get() + 1) & 0xFFFFFFFF)  # 32-bit counter with rollover
+
+    def migrate(self, legacy: Counter) -> bool:
+        """
+        migrate carries the value of an 8-bit counter over, as long as this counter was never incremented
+
+        The value is only copied while this counter reads zero, so it happens
+        once, on the first boot with the wide counter.
+
+        :return bool: True if a value was copied.
+        """
+        value = legacy.get()
+        if self.get() != 0 or value == 0:
+            return False
+        self._write(value)
+        return True
+
+    def _write(self, value: int) -> None:
+        slot = (self._slot + 1) % self._slots
+        sequence = (self._sequence + 1) & 0xFF
+
+        start = self._index + slot * _SLOT_SIZE
+        self._datastore[start : start + _SLOT_SIZE] = struct.pack(
+            _SLOT_FORMAT, sequence, value
+        )
+        self._slot = slot
+        self._sequence = sequence
@@ -28,3 +28,63 @@ class Flag:
         else:
             # If false, perform AND on specific byte and inverted bitmask to set bit to 0
             self._datastore[self._index] &= ~self._bit_mask
+
+
+class FlagSet:
+    """
+    Snapshot of several flags taken with a single read of non-volatile memory
+    """
+
+    def __init__(self, flags: list[tuple[str, Flag]]) -> None:
+        """
+        :param list flags: Names and flags, in the order of their bits in the telemetry field.
+            Every flag must use the same datastore.
+
+        :raises ValueError: If there are no flags or more than 16 of them.
+        """
+        if not 0 < len(flags) <= 16:
+            raise ValueError("A flag set holds between 1 and 16 flags")
+
+        self._names: list[str] = [name for name, _ in flags]
+        self._datastore = flags[0][1]._datastore
+        self._start: int = min(flag._index for _, flag in flags)
+        self._end: int = max(flag._index for _, flag in flags) + 1
+        # offset of the byte within the snapshot and mask of the bit, per flag
+        self._positions: list[tuple[int, int]] = [
+            (flag._index - self._start, flag._bit_mask) for _, flag in flags
+        ]
+        self._data: bytearray = bytearray(self._end - self._start)
+
+    def read(self) -> "FlagSet":
+        """Take a new snapshot of the flag bytes"""
+        self._data = self._datastore[self._start : self._end]
+        return self
+
+    def get(self, name: str) -> bool:
+        """Get flag value from the last snapshot"""
+        offset, mask = self._positions[self._names.index(name)]
+        return bool(self._data[offset] & mask)
+
+    def as_dict(self) -> dict[str, bool]:
+        return {
+            name: bool(self._data[offset] & mask)
+            for name, (offset, mask) in zip(self._names, self._positions)
+        }
+
+    def encode(self) -> int:
+        """Pack the last snapshot into an integer, one bit per flag in declaration order"""
+        value = 0
+        for bit, (offset, mask) in enumerate(self._positions):
+            if self._data[offset] & mask:
+                value |= 1 << bit
+        return value
+
+    def to_bytes(self) -> bytes:
+        """Telemetry field of one byte for up to 8 flags, otherwise two bytes little endian"""
+        size = 1 if len(self._names) <= 8 else 2
+        return self.encode().to_bytes(size, "little")
+
+    def from_bytes(self, data: bytes) -> dict[str, bool]:
+        """Decode a telemetry field produced by `to_bytes`"""
+        value = int.from_bytes(data, "little")
+        return {name: bool(value & (1 << bit)) for bit, name in enumerate(self._names)}
@@ -0,0 +1,188 @@
+"""
+Small key-value store in non-volatile memory that survives interrupted writes.
+
+The region is split into two banks. Each bank holds a header with a magic
+number, a generation counter, the payload length and a CRC32, followed by the
+values encoded as JSON. A commit always writes the bank that is not current
+with a higher generation in a single slice, so a brown-out during the write
+leaves the previous bank intact. On load, both banks are read in one slice and
+the valid bank with the highest generation wins.
+"""
+
+import json
+import struct
+from binascii import crc32
+
+from micropython import const
+
+try:
+    from typing import Any, Optional
+
+    from stubs.circuitpython.byte_array import ByteArray
+except ImportError:
+    pass
+
+_MAGIC = b"KV"
+_HEADER_FORMAT = "<2sIHI"  # magic, generation, payload length, crc32 of generation, length and payload
+_HEADER_SIZE = const(12)
+
+
+class KVStore:
+    """
+    Double buffered, CRC protected key-value store.
+    """
+
+    def __init__(self, datastore: ByteArray, start: int, size: int) -> None:
+        """
+        :param ByteArray datastore: The non-volatile memory holding the store.
+        :param int start: Index of the first byte of the region.
+        :param int size: Size in bytes of the region, each bank gets half.
+
+        :raises ValueError: If the banks are too small to hold a header.
+        """
+        self._bank_size: int = size // 2
+        if self._bank_size <= _HEADER_SIZE:
+            raise ValueError("KV store region is too small")
+
+        self._datastore: ByteArray = datastore
+        self._start: int = start
+        self._values: dict[str, Any] = {}
+        self._bank: int = 1
+        self._generation: int = 0
+        self._dirty: bool = False
+        self.load()
+
+    @property
+    def capacity(self) -> int:
+        """
+        Number of bytes available for the encoded values.
+        """
+        return self._bank_size - _HEADER_SIZE
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def load(self) -> bool:
+        """
+        Load the newest valid bank, discarding uncommitted changes.
+
+        :return bool: True if a valid bank was found, otherwise the store starts empty.
+        """
+        data = self._datastore[self._start : self._start + 2 * self._bank_size]
+
+        best: Optional[tuple[int, int, dict]] = None
+        for bank in (0, 1):
+            parsed = self._parse_bank(data, bank * self._bank_size)
+            if parsed is not None and (best is None or parsed[0] > best[0]):
+                best = (parsed[0], bank, parsed[1])
+
+        self._dirty = False
+        if best is None:
+            self._generation, self._bank, self._values = 0, 1, {}
+            return False
+
+        self._generation, self._bank, self._values = best
+        return True
+
+    def _parse_bank(self, data, offset: int) -> Optional[tuple[int, dict]]:
+        magic, generation, length, crc = struct.unpack_from(
+            _HEADER_FORMAT, data, offset
+        )
+        if magic != _MAGIC or length > self.capacity:
+            return None
+
+        body = (
+            data[offset + 2 : offset + 8]
+            + data[offset + _HEADER_SIZE : offset + _HEADER_SIZE + length]
+        )
+        if crc32(body) != crc:
+            return None
+
+        try:
+            values = json.loads(
+                bytes(data[offset + _HEADER_SIZE : offset + _HEADER_SIZE + length])
+            )
+        except ValueError:
+            return None
+        if not isinstance(values, dict):
+            return None
+        return generation, values
+
+    """
+    Values
+    """
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Set a value in RAM, call `commit()` to persist it.
+        """
+        if key in self._values and self._values[key] == value:
+            return
+        self._values[key] = value
+        self._dirty = True
+
+    def delete(self, key: str) -> None:
+        if key in self._values:
+            del self._values[key]
+            self._dirty = True
+
+    def clear(self) -> None:
+        if self._values:
+            self._values = {}
+            self._dirty = True
+
+    def keys(self) -> list[str]:
+        return list(self._values.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def commit(self) -> bool:
+        """
+        Write the values to the other bank in a single slice.
+
+        :raises ValueError: If the encoded values do not fit in a bank.
+
+        :return bool: True if anything was written.
+        """
+        if not self._dirty:
+            return False
+
+        payload = json.dumps(self._values, separators=(",", ":")).encode("utf-8")
+        if len(payload) > self.capacity:
+            raise ValueError(
+                f"KV store values need {len(payload)} bytes, only {self.capacity} available"
+            )
+
+        generation = self._generation + 1
+        bank = 1 - self._bank
+        buffer = bytearray(_HEADER_SIZE + len(payload))
+        struct.pack_into("<IH", buffer, 2, generation, len(payload))
+        buffer[_HEADER_SIZE:] = payload
+        struct.pack_into(
+            _HEADER_FORMAT,
+            buffer,
+            0,
+            _MAGIC,
+            generation,
+            len(payload),
+            crc32(bytes(buffer[2:8]) + payload),
+        )
+
+        offset = self._start + bank * self._bank_size
+        self._datastore[offset : offset + len(buffer)] = buffer
+        self._generation = generation
+        self._bank = bank
+        self._dirty = False
+        return True
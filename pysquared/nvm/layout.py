@@ -0,0 +1,214 @@
+"""
+Declarative layout of typed fields in non-volatile memory.
+
+A Layout is built from named Fields. Offsets are assigned in declaration order
+unless given explicitly, overlapping fields are rejected, and each field
+precomputes its slice, struct format and bit masks so accessors do no lookups
+beyond the field itself. The whole layout can be read or written with a single
+slice operation.
+"""
+
+import struct
+
+from micropython import const
+
+from .flag import Flag
+
+try:
+    from typing import Any, Optional, Union
+
+    from stubs.circuitpython.byte_array import ByteArray
+except ImportError:
+    pass
+
+U8 = const(0)
+U16 = const(1)
+U32 = const(2)
+FLOAT = const(3)
+BITFLAGS = const(4)
+BYTES = const(5)
+
+_FORMATS = {
+    U8: "<B",
+    U16: "<H",
+    U32: "<I",
+    FLOAT: "<f",
+}
+
+
+class Field:
+    """
+    A named value in the layout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: int,
+        offset: Optional[int] = None,
+        size: Optional[int] = None,
+        bits: Optional[dict[str, int]] = None,
+    ) -> None:
+        """
+        :param str name: Name of the field, unique within a layout.
+        :param int kind: One of U8, U16, U32, FLOAT, BITFLAGS or BYTES.
+        :param int offset: Fixed offset of the field, assigned after the previous field when omitted.
+        :param int size: Size in bytes of a BYTES field.
+        :param dict bits: Names and bit indexes of the flags of a BITFLAGS field.
+
+        :raises ValueError: If the kind, size or bits are invalid.
+        """
+        self.name: str = name
+        self.kind: int = kind
+        self.offset: Optional[int] = offset
+        self.masks: dict[str, int] = {}
+        self.bits: dict[str, int] = bits or {}
+
+        if kind in _FORMATS:
+            self.format: Optional[str] = _FORMATS[kind]
+            self.size: int = struct.calcsize(self.format)
+        elif kind == BITFLAGS:
+            highest = max(self.bits.values()) if self.bits else 0
+            if highest >= 32:
+                raise ValueError(f"Bitflags field {name} has more than 32 bits")
+            self.size = 1 if highest < 8 else 2 if highest < 16 else 4
+            self.format = ("<B", "<H", None, "<I")[self.size - 1]
+            for flag, bit in self.bits.items():
+                self.masks[flag] = 1 << bit
+        elif kind == BYTES:
+            if not size or size < 1:
+                raise ValueError(f"Bytes field {name} needs a size")
+            self.format = None
+            self.size = size
+        else:
+            raise ValueError(f"Unknown kind {kind} for field {name}")
+
+        if kind != BYTES and size is not None and size != self.size:
+            raise ValueError(f"Field {name} has a fixed size of {self.size} bytes")
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.size
+
+    def unpack(self, data, position: int = 0) -> Any:
+        """
+        Decode the field from data, starting at position.
+        """
+        if self.format is None:
+            return bytes(data[position : position + self.size])
+        return struct.unpack_from(self.format, data, position)[0]
+
+    def pack_into(self, buffer: bytearray, position: int, value: Any) -> None:
+        """
+        Encode value into buffer at position.
+
+        :raises ValueError: If a bytes value does not have the size of the field.
+        """
+        if self.format is None:
+            if len(value) != self.size:
+                raise ValueError(f"Field {self.name} needs {self.size} bytes")
+            buffer[position : position + self.size] = value
+        else:
+            struct.pack_into(self.format, buffer, position, value)
+
+
+class Layout:
+    """
+    An ordered set of non overlapping fields in a datastore.
+    """
+
+    def __init__(self, *fields: Field) -> None:
+        """
+        :param Field fields: The fields, offsets are assigned in this order.
+
+        :raises ValueError: If two fields share a name or overlap.
+        """
+        self._fields: dict[str, Field] = {}
+        next_offset = 0
+        for field in fields:
+            if field.name in self._fields:
+                raise ValueError(f"Duplicate NVM field {field.name}")
+            if field.offset is None:
+                field.offset = next_offset
+            for other in self._fields.values():
+                if field.offset < other.end and other.offset < field.end:
+                    raise ValueError(
+                        f"NVM field {field.name} overlaps {other.name} at offset {field.offset}"
+                    )
+            self._fields[field.name] = field
+            next_offset = field.end
+
+        self.start: int = min(f.offset for f in fields) if fields else 0
+        self.end: int = max(f.end for f in fields) if fields else 0
+
+    def __getitem__(self, name: str) -> Field:
+        return self._fields[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._fields
+
+    def fields(self) -> list[Field]:
+        return list(self._fields.values())
+
+    def offset(self, name: str) -> int:
+        return self._fields[name].offset
+
+    """
+    Single field access
+    """
+
+    def get(self, datastore: ByteArray, name: str) -> Any:
+        """
+        Read one field with a single slice.
+        """
+        field = self._fields[name]
+        return field.unpack(datastore[field.offset : field.end])
+
+    def set(self, datastore: ByteArray, name: str, value: Any) -> None:
+        """
+        Write one field with a single slice.
+        """
+        field = self._fields[name]
+        buffer = bytearray(field.size)
+        field.pack_into(buffer, 0, value)
+        datastore[field.offset : field.end] = buffer
+
+    def flag(self, datastore: ByteArray, name: str, flag: str) -> Flag:
+        """
+        Create a Flag for one bit of a BITFLAGS field.
+        """
+        field = self._fields[name]
+        bit = field.bits[flag]
+        return Flag(
+            index=field.offset + bit // 8, bit_index=bit % 8, datastore=datastore
+        )
+
+    """
+    Whole layout access
+    """
+
+    def read_all(self, datastore: ByteArray) -> dict[str, Any]:
+        """
+        Read every field with a single slice.
+
+        :return dict: Field values by name, BITFLAGS fields as integers.
+        """
+        data = datastore[self.start : self.end]
+        return {
+            name: field.unpack(data, field.offset - self.start)
+            for name, field in self._fields.items()
+        }
+
+    def write_all(
+        self, datastore: ByteArray, values: dict[str, Union[int, float, bytes]]
+    ) -> None:
+        """
+        Write fields with a single slice, fields missing from values keep their contents.
+
+        :raises KeyError: If values names a field that is not in the layout.
+        """
+        buffer = bytearray(datastore[self.start : self.end])
+        for name, value in values.items():
+            field = self._fields[name]
+            field.pack_into(buffer, field.offset - self.start, value)
+        datastore[self.start : self.end] = buffer
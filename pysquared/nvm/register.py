@@ -1,6 +1,36 @@
-from micropython import const
+from .counter import WideCounter
+from .layout import BITFLAGS, BYTES, U8, Field, Layout
+
+# Wear levelled 32-bit counters use this many slots
+COUNTER_SLOTS = 8
+
+# NVM layout
+LAYOUT = Layout(
+    # 8-bit counters of older releases, only read to migrate them to the wide ones
+    Field("BOOTCNT", U8, offset=0),
+    Field("ERRORCNT", U8, offset=7),
+    Field(
+        "FLAG",
+        BITFLAGS,
+        offset=16,
+        # every bit in use is declared here, the byte is written back whole
+        # through the Satellite NVM cache
+        bits={"softboot": 0, "brownout": 3, "shtdwn": 5, "burned": 6, "fsk": 7},
+    ),
+    Field("BOOTCNT_WIDE", BYTES, offset=32, size=WideCounter.size(COUNTER_SLOTS)),
+    Field("ERRORCNT_WIDE", BYTES, size=WideCounter.size(COUNTER_SLOTS)),
+    Field("KVSTORE", BYTES, offset=128, size=512),
+)
 
 # NVM register numbers
-BOOTCNT = const(0)
-ERRORCNT = const(7)
-FLAG = const(16)
+BOOTCNT = LAYOUT.offset("BOOTCNT")
+ERRORCNT = LAYOUT.offset("ERRORCNT")
+FLAG = LAYOUT.offset("FLAG")
+BOOTCNT_WIDE = LAYOUT.offset("BOOTCNT_WIDE")
+ERRORCNT_WIDE = LAYOUT.offset("ERRORCNT_WIDE")
+KVSTORE = LAYOUT.offset("KVSTORE")
+KVSTORE_SIZE = LAYOUT["KVSTORE"].size
+
+# Number of bytes from the start of NVM kept in the Satellite write-back cache,
+# the KV store after it does its own double buffered writes
+CACHE_SIZE = LAYOUT["ERRORCNT_WIDE"].end
@@ -1,6 +1,6 @@
 # Written with Claude 3.5
 # Nov 10, 2024
-from .logger import Logger
+from .logger import Deferred, Logger
 
 try:
     from typing import Union
@@ -8,6 +8,10 @@ except Exception:
     pass
 
 
+def _hex_list(data: bytes) -> list[str]:
+    return [hex(b) for b in data]
+
+
 class PacketManager:
     def __init__(self, logger: Logger, max_packet_size: int = 128) -> None:
         """Initialize the packet manager with maximum packet size (default 128 bytes for typical LoRa)"""
@@ -62,7 +66,7 @@ class PacketManager:
                 data: bytes = str(data).encode("utf-8")
 
         # Calculate number of packets needed
-        total_packets: int = (len(data) + self.payload_size - 1) // self.payload_size
+        total_packets: int = self.packet_count(len(data))
         self.logger.info(
             "Packing data into packets",
             num_packets=total_packets,
@@ -71,29 +75,39 @@ class PacketManager:
 
         packets: list[bytes] = []
         for sequence_number in range(total_packets):
-            # Create header
-            header: bytes = sequence_number.to_bytes(2, "big") + total_packets.to_bytes(
-                2, "big"
-            )
-            self.logger.info("Created header", header=[hex(b) for b in header])
-
             # Get payload slice for this packet
             start: int = sequence_number * self.payload_size
             end: int = start + self.payload_size
-            payload: bytes = data[start:end]
-
-            # Combine header and payload
-            packet: bytes = header + payload
-            self.logger.info(
-                "Combining the header and payload to form a Packet",
-                packet=sequence_number,
-                packet_length=len(packet),
-                header=[hex(b) for b in header],
+            packets.append(
+                self.make_packet(sequence_number, total_packets, data[start:end])
             )
-            packets.append(packet)
 
         return packets
 
+    def packet_count(self, data_length: int) -> int:
+        """Number of packets needed to send data_length bytes"""
+        return (data_length + self.payload_size - 1) // self.payload_size
+
+    def make_packet(
+        self, sequence_number: int, total_packets: int, payload: bytes
+    ) -> bytes:
+        """Builds one packet from a payload of at most payload_size bytes"""
+        # Create header
+        header: bytes = sequence_number.to_bytes(2, "big") + total_packets.to_bytes(
+            2, "big"
+        )
+        self.logger.debug("Created header", header=Deferred(_hex_list, header))
+
+        # Combine header and payload
+        packet: bytes = header + bytes(payload)
+        self.logger.debug(
+            "Combining the header and payload to form a Packet",
+            packet=sequence_number,
+            packet_length=len(packet),
+            header=Deferred(_hex_list, header),
+        )
+        return packet
+
     def unpack_data(self, packets: list) -> Union[bytes, None]:
         """
         Takes a list of packets and reassembles the original data
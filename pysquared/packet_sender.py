@@ -1,9 +1,13 @@
-from .hardware.rfm9x.manager import RFM9xManager
+from __future__ import annotations
+
+from .file_reader import file_size, read_chunks
 from .logger import Logger
 from .packet_manager import PacketManager
 
 try:
-    from typing import Union
+    from typing import Callable, Iterable, Optional, Union
+
+    from .hardware.rfm9x.manager import RFM9xManager
 except Exception:
     pass
 
@@ -17,9 +21,12 @@ class PacketSender:
         ack_timeout: float = 2.0,
         max_retries: int = 3,
         send_delay: float = 0.2,
+        progress: Optional[Callable[[], object]] = None,
     ) -> None:
         """
         Initialize the packet sender with optimized timing
+
+        progress is called after every packet, e.g. to feed the watchdog during long transfers
         """
         self.logger: Logger = logger
         self.radio_manager: RFM9xManager = radio_manager
@@ -27,6 +34,11 @@ class PacketSender:
         self.ack_timeout: float = ack_timeout
         self.max_retries: int = max_retries
         self.send_delay: float = send_delay
+        self.progress: Optional[Callable[[], object]] = progress
+
+    def _report_progress(self) -> None:
+        if self.progress is not None:
+            self.progress()
 
     def wait_for_ack(self, expected_seq: int) -> bool:
         """
@@ -59,6 +71,7 @@ class PacketSender:
 
         for attempt in range(self.max_retries):
             self.radio_manager.radio.send(packet)
+            self._report_progress()
 
             if self.wait_for_ack(seq_num):
                 # Success - minimal delay before next packet
@@ -98,6 +111,90 @@ class PacketSender:
         )
         return True
 
+    def send_file(
+        self,
+        path: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        progress_interval: int = 10,
+    ) -> bool:
+        """Send part of a file, reading one packet payload at a time"""
+        if length is None:
+            length = max(file_size(path) - offset, 0)
+        self.logger.info("Sending file...", filedir=path, offset=offset, length=length)
+
+        chunks = read_chunks(path, self.packet_manager.payload_size, offset, length)
+        return self.send_stream(chunks, length, progress_interval)
+
+    def send_stream(
+        self, chunks: Iterable[bytes], length: int, progress_interval: int = 10
+    ) -> bool:
+        """Send length bytes taken from chunks of any size, building one packet at a time"""
+        total_packets: int = self.packet_manager.packet_count(length)
+        self.logger.info("Sending packets...", num_packets=total_packets)
+
+        payload: bytearray = bytearray(self.packet_manager.payload_size)
+        view: memoryview = memoryview(payload)
+        fill: int = 0
+        remaining: int = length
+        sequence_number: int = 0
+
+        for chunk in chunks:
+            position: int = 0
+            while position < len(chunk) and remaining > 0:
+                size: int = min(len(payload) - fill, len(chunk) - position, remaining)
+                view[fill : fill + size] = chunk[position : position + size]
+                fill += size
+                position += size
+                remaining -= size
+
+                if fill == len(payload) or remaining == 0:
+                    if not self._send_stream_packet(
+                        sequence_number, total_packets, view[:fill], progress_interval
+                    ):
+                        return False
+                    sequence_number += 1
+                    fill = 0
+            if remaining == 0:
+                break
+
+        # the chunks ran out before length, send what there is
+        if fill and not self._send_stream_packet(
+            sequence_number, total_packets, view[:fill], progress_interval
+        ):
+            return False
+
+        self.logger.info(
+            "Successfully sent all the packets!", num_packets=total_packets
+        )
+        return True
+
+    def _send_stream_packet(
+        self,
+        sequence_number: int,
+        total_packets: int,
+        payload: memoryview,
+        progress_interval: int,
+    ) -> bool:
+        if sequence_number % progress_interval == 0:
+            self.logger.info(
+                "Making progress sending packets",
+                current_packet=sequence_number,
+                num_packets=total_packets,
+            )
+
+        packet: bytes = self.packet_manager.make_packet(
+            sequence_number, total_packets, payload
+        )
+        if not self.send_packet_with_retry(packet, sequence_number):
+            self.logger.warning(
+                "Failed to send packet",
+                current_packet=sequence_number,
+                num_packets=total_packets,
+            )
+            return False
+        return True
+
     def handle_retransmit_request(
         self, packets: list[bytes], request_packet: list[str]
     ) -> bool:
@@ -167,6 +264,7 @@ class PacketSender:
                     "Sending packet", current_packet=i, num_packets=total_packets
                 )
             self.radio_manager.radio.send(packets[i])
+            self._report_progress()
             time.sleep(send_delay)
 
         self.logger.info("Waiting for retransmit requests...")
@@ -201,6 +299,7 @@ class PacketSender:
                 time.sleep(0.5)  # Longer delay between retransmitted packets
                 self.logger.info("Retransmitting packet", packet=seq)
                 self.radio_manager.radio.send(packets[seq])
+                self._report_progress()
                 time.sleep(0.2)  # Longer delay between retransmitted packets
 
             # Reset timeout and add extra delay after retransmission
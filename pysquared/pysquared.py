@@ -11,7 +11,7 @@ Library Repo:
 import sys
 import time
 from collections import OrderedDict
-from os import chdir, mkdir, stat
+from os import chdir, mkdir
 
 import board
 import busio
@@ -27,43 +27,108 @@ import lib.neopixel as neopixel  # RGB LED
 import lib.rv3028.rv3028 as rv3028  # Real Time Clock
 from lib.adafruit_lsm6ds.lsm6dsox import LSM6DSOX  # IMU
 
+from .boot_profiler import BOOT_KEY, BootProfiler
 from .config.config import Config  # Configs
+from .file_reader import read_chunks
+from .file_sequence import FileSequence
+from .hardware.imu_fifo import IMUFifo
+from .log.file_sink import BufferedFileSink
+from .log.sinks import RingSink
 from .nvm import register
-from .nvm.counter import Counter
-from .nvm.flag import Flag
+from .nvm.cache import NVMCache
+from .nvm.counter import Counter, WideCounter
+from .nvm.flag import Flag, FlagSet
+from .nvm.kvstore import KVStore
+from .sensor_cache import SensorCache
+from .tca_scan import TCAScanCache
+from .telemetry import Telemetry
+from .warm_start import WarmStart
+from .watchdog import Watchdog
 
 try:
-    from typing import Any, Callable, Optional, OrderedDict, TextIO, Union
+    from typing import Any, Callable, Optional, OrderedDict, Union
 
     import circuitpython_typing
 except Exception:
     pass
 
-from .logger import Logger
+from .logger import Logger, LogLevel
 
 SEND_BUFF: bytearray = bytearray(252)
 
+# Face connected to each TCA channel
+TCA_CHANNEL_TO_FACE: dict[int, str] = {
+    0: "Face0",
+    1: "Face1",
+    2: "Face2",
+    3: "Face3",
+    4: "Face4",
+}
+
+# Telemetry history channels, see sample_telemetry. The power values get channels
+# once there is a power monitor to read them from.
+TELEMETRY_CHANNELS: tuple[str, ...] = (
+    "internal_temperature",
+    "gyro_norm",
+    "accel_norm",
+    "mag_norm",
+)
+
+# Hardware keys of the devices that are only initialized when first used
+LAZY_HARDWARE: tuple[str, ...] = (
+    "IMU",
+    "Mag",
+    "NEOPIX",
+    "TCA",
+    "Face0",
+    "Face1",
+    "Face2",
+    "Face3",
+    "Face4",
+    "RTC",
+)
+
 
 class Satellite:
     """
     NVM (Non-Volatile Memory) Register Definitions
     """
 
-    # General NVM counters
-    boot_count: Counter = Counter(index=register.BOOTCNT, datastore=microcontroller.nvm)
+    # Changes are kept in RAM and written back in one go by nvm_cache.commit(),
+    # which runs at safe points such as watchdog_pet and before any reset.
+    nvm_cache: NVMCache = NVMCache(microcontroller.nvm, size=register.CACHE_SIZE)
 
-    # Define NVM flags
-    f_softboot: Flag = Flag(
-        index=register.FLAG, bit_index=0, datastore=microcontroller.nvm
+    # General NVM counters
+    boot_count: WideCounter = WideCounter(
+        index=register.BOOTCNT_WIDE, datastore=nvm_cache, slots=register.COUNTER_SLOTS
     )
-    f_brownout: Flag = Flag(
-        index=register.FLAG, bit_index=3, datastore=microcontroller.nvm
+    # The Logger counts errors here once the Satellite is created
+    error_count: WideCounter = WideCounter(
+        index=register.ERRORCNT_WIDE, datastore=nvm_cache, slots=register.COUNTER_SLOTS
     )
-    f_shtdwn: Flag = Flag(
-        index=register.FLAG, bit_index=5, datastore=microcontroller.nvm
+
+    # Define NVM flags
+    f_softboot: Flag = register.LAYOUT.flag(nvm_cache, "FLAG", "softboot")
+    f_brownout: Flag = register.LAYOUT.flag(nvm_cache, "FLAG", "brownout")
+    f_shtdwn: Flag = register.LAYOUT.flag(nvm_cache, "FLAG", "shtdwn")
+    f_burned: Flag = register.LAYOUT.flag(nvm_cache, "FLAG", "burned")
+    # Pass to RFM9xManager, a flag on the FLAG byte built on raw NVM would be
+    # overwritten by the cache
+    use_fsk: Flag = register.LAYOUT.flag(nvm_cache, "FLAG", "fsk")
+
+    # Snapshot of every flag for telemetry, call flags.read() before decoding
+    flags: FlagSet = FlagSet(
+        [
+            ("softboot", f_softboot),
+            ("brownout", f_brownout),
+            ("shtdwn", f_shtdwn),
+            ("burned", f_burned),
+        ]
     )
-    f_burned: Flag = Flag(
-        index=register.FLAG, bit_index=6, datastore=microcontroller.nvm
+
+    # Structured state that must survive resets and interrupted writes
+    kv_store: KVStore = KVStore(
+        microcontroller.nvm, register.KVSTORE, register.KVSTORE_SIZE
     )
 
     def safe_init(func: Callable[..., Any]):
@@ -73,11 +138,16 @@ class Satellite:
                 "Initializing hardware component", hardware_key=hardware_key
             )
 
+            start: int = self.boot_profiler.start()
             try:
                 device: Any = func(self, *args, **kwargs)
+                self.boot_profiler.record(
+                    hardware_key, start, self.hardware.get(hardware_key, True)
+                )
                 return device
 
             except Exception as e:
+                self.boot_profiler.record(hardware_key, start, False)
                 self.logger.error(
                     "There was an error initializing this hardware component",
                     e,
@@ -121,12 +191,13 @@ class Satellite:
         return hardware_instance
 
     @safe_init
-    def init_rtc(self, hardware_key: str) -> None:
-        self.rtc: rv3028.RV3028 = rv3028.RV3028(self.i2c1)
+    def init_rtc(self, hardware_key: str) -> rv3028.RV3028:
+        rtc: rv3028.RV3028 = rv3028.RV3028(self.i2c1)
 
         # Still need to test these configs
-        self.rtc.configure_backup_switchover(mode="level", interrupt=True)
+        rtc.configure_backup_switchover(mode="level", interrupt=True)
         self.hardware[hardware_key] = True
+        return rtc
 
     @safe_init
     def init_sd_card(self, hardware_key: str) -> None:
@@ -138,32 +209,124 @@ class Satellite:
         sys.path.append("/sd")
         self.hardware[hardware_key] = True
 
+        # Persist logs on the freshly mounted card
+        self.log_sink = BufferedFileSink("/sd/logs")
+        self.logger.add_sink(self.log_sink)
+
     @safe_init
-    def init_neopixel(self, hardware_key: str) -> None:
+    def init_neopixel(self, hardware_key: str) -> neopixel.NeoPixel:
         self.neopwr: digitalio.DigitalInOut = digitalio.DigitalInOut(board.NEO_PWR)
         self.neopwr.switch_to_output(value=True)
-        self.neopixel: neopixel.NeoPixel = neopixel.NeoPixel(
+        pixel: neopixel.NeoPixel = neopixel.NeoPixel(
             board.NEOPIX, 1, brightness=0.2, pixel_order=neopixel.GRB
         )
-        self.neopixel[0] = (0, 0, 255)
+        pixel[0] = (0, 0, 255)
         self.hardware[hardware_key] = True
+        return pixel
 
     @safe_init
-    def init_tca_multiplexer(self, hardware_key: str) -> None:
+    def init_tca_multiplexer(
+        self, hardware_key: str
+    ) -> Optional[adafruit_tca9548a.TCA9548A]:
         try:
-            self.tca: adafruit_tca9548a.TCA9548A = adafruit_tca9548a.TCA9548A(
+            tca: adafruit_tca9548a.TCA9548A = adafruit_tca9548a.TCA9548A(
                 self.i2c1, address=int(0x77)
             )
             self.hardware[hardware_key] = True
+            return tca
         except OSError:
             self.logger.error(
                 "TCA try_lock failed. TCA may be malfunctioning.",
                 hardware_key=hardware_key,
             )
             self.hardware[hardware_key] = False
-            return
+            return None
+
+    """
+    Lazily initialized devices
+    """
+
+    def _lazy_device(
+        self,
+        hardware_key: str,
+        init: Callable[[], Any],
+        after_init: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        # a failed init is remembered as None, release_device allows another attempt
+        if hardware_key not in self._devices:
+            self._devices[hardware_key] = init()
+            if after_init is not None:
+                after_init()
+        return self._devices[hardware_key]
+
+    def release_device(self, hardware_key: str) -> None:
+        """
+        Forget a lazily initialized device so it is initialized again on next use.
+        """
+        self._devices.pop(hardware_key, None)
+
+    def init_lazy_devices(self) -> None:
+        """
+        Initialize every device that has not been used yet, e.g. before a full health report.
+        """
+        self.imu
+        self.mangetometer
+        self.rtc
+        self.neopixel
+        self.tca
+
+    @property
+    def imu(self) -> Optional[LSM6DSOX]:
+        return self._lazy_device(
+            "IMU",
+            lambda: self.init_general_hardware(
+                LSM6DSOX, i2c_bus=self.i2c1, address=0x6B, hardware_key="IMU"
+            ),
+        )
+
+    @property
+    def imu_fifo(self) -> Optional[IMUFifo]:
+        """
+        Batched high rate acquisition from the IMU FIFO, see `IMUFifo.start` and `IMUFifo.drain`.
+        """
+        if "IMUFIFO" not in self._devices:
+            imu = self.imu
+            self._devices["IMUFIFO"] = (
+                IMUFifo(imu.i2c_device) if imu is not None else None
+            )
+        return self._devices["IMUFIFO"]
+
+    @property
+    def mangetometer(self) -> Optional[adafruit_lis2mdl.LIS2MDL]:
+        return self._lazy_device(
+            "Mag",
+            lambda: self.init_general_hardware(
+                adafruit_lis2mdl.LIS2MDL, self.i2c1, hardware_key="Mag"
+            ),
+        )
+
+    @property
+    def rtc(self) -> Optional[rv3028.RV3028]:
+        return self._lazy_device("RTC", lambda: self.init_rtc(hardware_key="RTC"))
+
+    @property
+    def neopixel(self) -> Optional[neopixel.NeoPixel]:
+        return self._lazy_device(
+            "NEOPIX", lambda: self.init_neopixel(hardware_key="NEOPIX")
+        )
+
+    @property
+    def tca(self) -> Optional[adafruit_tca9548a.TCA9548A]:
+        # the faces behind the multiplexer are scanned once it exists
+        return self._lazy_device(
+            "TCA",
+            lambda: self.init_tca_multiplexer(hardware_key="TCA"),
+            self.scan_tca_channels,
+        )
 
     def __init__(self, config: Config, logger: Logger, version: str) -> None:
+        self.boot_profiler: BootProfiler = BootProfiler()
+        boot_start: int = self.boot_profiler.start()
         self.config: Config = config
         self.cubesat_name: str = config.cubesat_name
         """
@@ -174,6 +337,7 @@ class Satellite:
         self.orpheus: bool = config.orpheus  # maybe change var name
         self.is_licensed: bool = config.is_licensed
         self.logger = logger
+        self._migrate_counters()
 
         """
         Define the normal power modes
@@ -188,14 +352,31 @@ class Satellite:
         self.current_draw: float = config.current_draw
         self.reboot_time: int = config.reboot_time
         self.turbo_clock: bool = config.turbo_clock
+        for key in (
+            "cubesat_name",
+            "legacy",
+            "heating",
+            "orpheus",
+            "is_licensed",
+            "normal_temp",
+            "normal_battery_temp",
+            "normal_micro_temp",
+            "normal_charge_current",
+            "normal_battery_voltage",
+            "critical_battery_voltage",
+            "current_draw",
+            "reboot_time",
+            "turbo_clock",
+        ):
+            config.subscribe(key, self._on_config_change)
 
         """
         Setting up data buffers
         """
         # TODO(cosmiccodon/blakejameson):
-        # Data_cache, filenumbers, image_packets, and send_buff are variables that are not used in the codebase. They were put here for Orpheus last minute.
+        # Filenumbers, image_packets, and send_buff are variables that are not used in the codebase. They were put here for Orpheus last minute.
         # We are unsure if these will be used in the future, so we are keeping them here for now.
-        self.data_cache: dict = {}
+        self.telemetry: Telemetry = Telemetry(list(TELEMETRY_CHANNELS))
         self.filenumbers: dict = {}
         self.image_packets: int = 0
         self.uart_baudrate: int = 9600
@@ -203,6 +384,21 @@ class Satellite:
         self.buffer_size: int = 1
         self.send_buff: memoryview = memoryview(SEND_BUFF)
         self.micro: microcontroller = microcontroller
+        self.log_sink: Optional[BufferedFileSink] = None
+        # Latest warnings and errors kept in RAM, also without an SD card
+        self.recent_logs: RingSink = RingSink(capacity=16, level=LogLevel.WARNING)
+        self.logger.add_sink(self.recent_logs)
+        self._devices: dict[str, Any] = {}
+
+        # Latest sensor readings, see read_sensor
+        self.sensor_cache: SensorCache = SensorCache()
+        self._sensor_readers: dict[str, Callable[[], Any]] = {
+            "gyro": self._read_gyro,
+            "accel": self._read_accel,
+            "internal_temperature": self._read_internal_temperature,
+            "mag": self._read_mag,
+            "time": self._read_time,
+        }
 
         # Confused here, as self.battery_voltage was initialized to 3.3 in line 113(blakejameson)
         # NOTE(blakejameson): After asking Michael about the None variables below last night at software meeting, he mentioned they used
@@ -245,6 +441,21 @@ class Satellite:
             ]
         )
 
+        # Valid addresses found behind each TCA channel, None until scanned
+        self.tca_cache: TCAScanCache = TCAScanCache(len(TCA_CHANNEL_TO_FACE))
+        self.tca_scan: list = self.tca_cache.addresses
+        # only the first scan, when the TCA is brought up, goes into the boot profile
+        self._tca_scanned: bool = False
+        # next file numbers of every SD directory used by new_file
+        self.file_sequences: dict[str, FileSequence] = {}
+
+        # Hardware state saved before a planned reset, used by the first scan only
+        self.warm_start: Optional[WarmStart] = WarmStart.take(
+            self.kv_store, self.hardware
+        )
+        if self.warm_start is not None:
+            self.logger.info("Warm start", hardware_mask=self.warm_start.mask)
+
         if self.f_softboot.get():
             self.f_softboot.toggle(False)
 
@@ -257,6 +468,8 @@ class Satellite:
         )
         self.watchdog_pin.direction = digitalio.Direction.OUTPUT
         self.watchdog_pin.value = False
+        # only fed while every task registered with it checks in
+        self.watchdog: Watchdog = Watchdog(self.watchdog_pin, self.logger)
 
         """
         Set the CPU Clock Speed
@@ -331,21 +544,10 @@ class Satellite:
         #                                         #
         ######## Temporary Fix for RF_ENAB ########
 
-        self.imu: LSM6DSOX = self.init_general_hardware(
-            LSM6DSOX, i2c_bus=self.i2c1, address=0x6B, hardware_key="IMU"
-        )
-        self.mangetometer: adafruit_lis2mdl.LIS2MDL = self.init_general_hardware(
-            adafruit_lis2mdl.LIS2MDL, self.i2c1, hardware_key="Mag"
-        )
-        self.init_rtc(hardware_key="RTC")
-        self.init_sd_card(hardware_key="SD Card")
-        self.init_neopixel(hardware_key="NEOPIX")
-        self.init_tca_multiplexer(hardware_key="TCA")
-
-        """
-        Face Initializations
-        """
-        self.scan_tca_channels()
+        # The SD card is needed for logging from the start. The IMU, magnetometer,
+        # RTC, NeoPixel and TCA multiplexer with the faces behind it are
+        # initialized on first use by their properties.
+        self.init_sd_card(hardware_key="SDcard")
 
         """
         Prints init State of PySquared Hardware
@@ -353,7 +555,11 @@ class Satellite:
         self.logger.debug("PySquared Hardware Initialization Complete!")
 
         for key, value in self.hardware.items():
-            if value:
+            if key in LAZY_HARDWARE:
+                self.logger.debug(
+                    "Hardware device initialized on first use", device=key
+                )
+            elif value:
                 self.logger.info(
                     "Successfully initialized hardware device",
                     device=key,
@@ -369,38 +575,87 @@ class Satellite:
         # Set current version
         self.version: str = version
 
+        self.boot_profiler.record(BOOT_KEY, boot_start)
+        self.logger.info("Boot profile", table=self.boot_profiler.table())
+
     """
     Init Helper Functions
     """
 
-    def scan_tca_channels(self) -> None:
-        if not self.hardware["TCA"]:
+    def scan_tca_channels(self, force: bool = False) -> None:
+        """
+        Scan the TCA channels whose cached device map is missing or due for a health check.
+
+        :param bool force: Scan every channel regardless of the cache.
+        """
+        if not self.hardware["TCA"] or self._devices.get("TCA") is None:
             self.logger.warning("TCA not initialized")
             return
 
-        channel_to_face: dict[int, str] = {
-            0: "Face0",
-            1: "Face1",
-            2: "Face2",
-            3: "Face3",
-            4: "Face4",
-        }
+        warm_start: Optional[WarmStart] = self.warm_start
+        self.warm_start = None
+        profile: bool = not self._tca_scanned
+        self._tca_scanned = True
 
-        for channel in range(len(channel_to_face)):
-            try:
-                self._scan_single_channel(channel, channel_to_face)
-            except OSError as os_error:
-                self.logger.error(
-                    "TCA try_lock failed. TCA may be malfunctioning.", os_error
-                )
-                self.hardware["TCA"] = False
+        for channel in range(len(TCA_CHANNEL_TO_FACE)):
+            face: str = TCA_CHANNEL_TO_FACE[channel]
+            known: Optional[list[int]] = (
+                warm_start.addresses(channel) if warm_start is not None else None
+            )
+            if known and warm_start.is_good(face):
+                # found before the planned reset, no need to scan it again
+                self.tca_cache.store(channel, known)
+                self.hardware[face] = True
+                continue
+
+            if not force and self.tca_cache.is_fresh(channel):
+                continue
+
+            if not self._scan_channel(channel, profile):
                 return
-            except Exception as e:
-                self.logger.error(
-                    "There was an Exception during the scan_tca_channels function call",
-                    e,
-                    face=channel_to_face[channel],
-                )
+
+    def tca_devices(self, channel: int) -> list[int]:
+        """
+        Addresses of the devices on a TCA channel, scanning it only if the cached map is missing or due.
+        """
+        return self.tca_cache.devices(channel, self._rescan_channel)
+
+    def invalidate_tca_channel(self, channel: int) -> None:
+        """
+        Drop the cached device map of a channel after a read on it failed, it is scanned again on next use.
+        """
+        self.tca_cache.invalidate(channel)
+
+    def _rescan_channel(self, channel: int) -> None:
+        if self.tca is not None:
+            self._scan_channel(channel)
+
+    def _scan_channel(self, channel: int, profile: bool = False) -> bool:
+        # returns False when the multiplexer itself failed and scanning should stop,
+        # profile records the scan in the boot profile
+        face: str = TCA_CHANNEL_TO_FACE[channel]
+        start: int = self.boot_profiler.start()
+        try:
+            self._scan_single_channel(channel, TCA_CHANNEL_TO_FACE)
+            if profile:
+                self.boot_profiler.record(face, start, self.hardware[face])
+        except OSError as os_error:
+            if profile:
+                self.boot_profiler.record(face, start, False)
+            self.logger.error(
+                "TCA try_lock failed. TCA may be malfunctioning.", os_error
+            )
+            self.hardware["TCA"] = False
+            return False
+        except Exception as e:
+            if profile:
+                self.boot_profiler.record(face, start, False)
+            self.logger.error(
+                "There was an Exception during the scan_tca_channels function call",
+                e,
+                face=face,
+            )
+        return True
 
     def _scan_single_channel(
         self, channel: int, channel_to_face: dict[int, str]
@@ -413,6 +668,7 @@ class Satellite:
             valid_addresses: list[int] = [
                 addr for addr in addresses if addr not in [0x00, 0x19, 0x1E, 0x6B, 0x77]
             ]
+            self.tca_cache.store(channel, valid_addresses)
 
             if not valid_addresses and 0x77 in addresses:
                 self.logger.error(
@@ -445,7 +701,7 @@ class Satellite:
 
     @rgb.setter
     def rgb(self, value: tuple[int, int, int]) -> None:
-        if not self.hardware["NEOPIX"]:
+        if self.neopixel is None:
             self.logger.warning("The NEOPIXEL device is not initialized")
             return
 
@@ -480,15 +736,25 @@ class Satellite:
         except Exception as e:
             self.logger.error("There was a vbus reset error", e)
 
-    @property
-    def gyro(self) -> Union[tuple[float, float, float], None]:
+    def read_sensor(self, name: str, max_age: float = 0.0) -> Any:
+        """
+        Read a sensor through the sensor cache.
+
+        :param str name: One of "gyro", "accel", "internal_temperature", "mag" or "time".
+        :param float max_age: Age in seconds of a cached reading that is still acceptable,
+            0 to always read the bus.
+
+        :return: The reading, or None if the sensor could not be read.
+        """
+        return self.sensor_cache.read(name, self._sensor_readers[name], max_age)
+
+    def _read_gyro(self) -> Union[tuple[float, float, float], None]:
         try:
             return self.imu.gyro
         except Exception as e:
             self.logger.error("There was an error retrieving the gyro values", e)
 
-    @property
-    def accel(self) -> Union[tuple[float, float, float], None]:
+    def _read_accel(self) -> Union[tuple[float, float, float], None]:
         try:
             return self.imu.acceleration
         except Exception as e:
@@ -496,8 +762,7 @@ class Satellite:
                 "There was an error retrieving the accelerometer values", e
             )
 
-    @property
-    def internal_temperature(self) -> Union[float, None]:
+    def _read_internal_temperature(self) -> Union[float, None]:
         try:
             return self.imu.temperature
         except Exception as e:
@@ -505,8 +770,7 @@ class Satellite:
                 "There was an error retrieving the internal temperature value", e
             )
 
-    @property
-    def mag(self) -> Union[tuple[float, float, float], None]:
+    def _read_mag(self) -> Union[tuple[float, float, float], None]:
         try:
             return self.mangetometer.magnetic
         except Exception as e:
@@ -514,25 +778,48 @@ class Satellite:
                 "There was an error retrieving the magnetometer sensor values", e
             )
 
-    @property
-    def time(self) -> Union[tuple[int, int, int], None]:
+    def _read_time(self) -> Union[tuple[int, int, int], None]:
         try:
             return self.rtc.get_time()
         except Exception as e:
             self.logger.error("There was an error retrieving the RTC time", e)
 
+    # The properties always read the bus and refresh the cache,
+    # use read_sensor with a max_age to accept a recent reading instead
+
+    @property
+    def gyro(self) -> Union[tuple[float, float, float], None]:
+        return self.read_sensor("gyro")
+
+    @property
+    def accel(self) -> Union[tuple[float, float, float], None]:
+        return self.read_sensor("accel")
+
+    @property
+    def internal_temperature(self) -> Union[float, None]:
+        return self.read_sensor("internal_temperature")
+
+    @property
+    def mag(self) -> Union[tuple[float, float, float], None]:
+        return self.read_sensor("mag")
+
+    @property
+    def time(self) -> Union[tuple[int, int, int], None]:
+        return self.read_sensor("time")
+
     @time.setter
     def time(self, hms: tuple[int, int, int]) -> None:
         """
         hms: A 3-tuple of ints containing data for the hours, minutes, and seconds respectively.
         """
         hours, minutes, seconds = hms
-        if not self.hardware["RTC"]:
+        if self.rtc is None:
             self.logger.warning("The RTC is not initialized")
             return
 
         try:
             self.rtc.set_time(hours, minutes, seconds)
+            self.sensor_cache.invalidate("time")
         except Exception as e:
             self.logger.error(
                 "There was an error setting the RTC time",
@@ -556,7 +843,7 @@ class Satellite:
         ymdw: A 4-tuple of ints containing data for the year, month, date, and weekday respectively.
         """
         year, month, date, weekday = ymdw
-        if not self.hardware["RTC"]:
+        if self.rtc is None:
             self.logger.warning("RTC not initialized")
             return
 
@@ -573,21 +860,85 @@ class Satellite:
                 weekday=ymdw[3],
             )
 
+    def sample_telemetry(self, max_age: float = 1.0) -> None:
+        """
+        Add the current sensor readings to the telemetry history.
+
+        Meant to be called once per period of the first telemetry tier.
+
+        :param float max_age: Age in seconds of a cached sensor reading that is still acceptable.
+        """
+        self.telemetry.record(
+            "internal_temperature", self.read_sensor("internal_temperature", max_age)
+        )
+        for name in ("gyro", "accel", "mag"):
+            reading = self.read_sensor(name, max_age)
+            if reading is not None:
+                norm: float = (
+                    reading[0] * reading[0]
+                    + reading[1] * reading[1]
+                    + reading[2] * reading[2]
+                ) ** 0.5
+                self.telemetry.record(name + "_norm", norm)
+
+    def _migrate_counters(self) -> None:
+        # carry the 8-bit counters of older releases over once, then count errors
+        # in the wide counter only
+        self.boot_count.migrate(Counter(register.BOOTCNT, self.nvm_cache))
+        self.error_count.migrate(Counter(register.ERRORCNT, self.nvm_cache))
+        self.logger.set_error_counter(self.error_count)
+
+    def _on_config_change(self, key: str, value: Any) -> None:
+        setattr(self, key, value)
+
     """
     Maintenence Functions
     """
 
-    def watchdog_pet(self) -> None:
-        self.watchdog_pin.value = True
-        time.sleep(0.01)
-        self.watchdog_pin.value = False
+    def watchdog_pet(self) -> bool:
+        """
+        Feed the watchdog without blocking, unless a task registered with it is stalled.
+
+        :return bool: True if the watchdog was fed.
+        """
+        self.nvm_cache.commit()
+        return self.watchdog.pet()
 
     def check_reboot(self) -> None:
         self.UPTIME: int = self.get_system_uptime
         self.logger.debug("Current up time stat:", uptime=self.UPTIME)
         if self.UPTIME > self.reboot_time:
+            self.prepare_reset()
             self.micro.reset()
 
+    def flush_logs(self) -> None:
+        """
+        Write any buffered log records to the SD card and pending NVM changes, call before a planned reset.
+        """
+        self.logger.flush_repeats()
+        if self.log_sink is not None:
+            self.log_sink.flush()
+        self.nvm_cache.commit()
+        self.kv_store.commit()
+
+    def prepare_reset(self) -> None:
+        """
+        Save the warm start snapshot and flush logs and NVM, call right before a planned reset.
+
+        Never raises, so the reset that follows always happens.
+        """
+        WarmStart.save(self.kv_store, self.hardware, self.tca_scan)
+        try:
+            if not WarmStart.commit(self.kv_store):
+                self.logger.warning("Warm start snapshot does not fit, dropped it")
+        except ValueError as e:
+            self.logger.error("Could not save the key-value store before reset", e)
+
+        try:
+            self.flush_logs()
+        except Exception as e:
+            self.logger.error("Could not flush the logs before reset", e)
+
     def powermode(self, mode: str) -> None:
         """
         Configure the hardware for minimum or normal power consumption
@@ -630,10 +981,8 @@ class Satellite:
                 raise FileNotFoundError("file directory is empty")
             self.logger.debug("Printing File", file_dir=filedir)
             if binary:
-                with open(filedir, "rb") as file:
-                    self.logger.debug(
-                        "Printing in binary mode", content=str(file.read())
-                    )
+                for chunk in read_chunks(filedir):
+                    self.logger.debug("Printing in binary mode", content=bytes(chunk))
             else:
                 with open(filedir, "r") as file:
                     for line in file:
@@ -644,21 +993,32 @@ class Satellite:
             )
 
     def read_file(
-        self, filedir: str = None, binary: bool = False
-    ) -> Union[bytes, TextIO, None]:
+        self,
+        filedir: str = None,
+        binary: bool = False,
+        offset: int = 0,
+        length: Optional[int] = None,
+    ) -> Union[bytes, str, None]:
+        """
+        Read part of a file, use read_chunks directly for files that do not fit in memory.
+
+        :param str filedir: The file to read.
+        :param bool binary: Return bytes instead of decoded text.
+        :param int offset: Position in bytes of the first byte read.
+        :param int length: Number of bytes to read, up to the end of the file when None.
+        """
         try:
             if filedir is None:
                 raise FileNotFoundError("file directory is empty")
-            self.logger.debug("Reading a file", file_dir=filedir)
+            data: bytearray = bytearray()
+            for chunk in read_chunks(filedir, offset=offset, length=length):
+                data.extend(chunk)
+            self.logger.debug(
+                "Read a file", file_dir=filedir, offset=offset, num_bytes=len(data)
+            )
             if binary:
-                with open(filedir, "rb") as file:
-                    self.logger.debug(str(file.read()))
-                    return file.read()
-            else:
-                with open(filedir, "r") as file:
-                    for line in file:
-                        self.logger.debug(str(line.strip()))
-                    return file
+                return bytes(data)
+            return data.decode("utf-8")
         except Exception as e:
             self.logger.error("Can't read file", e, filedir=filedir, binary_mode=binary)
 
@@ -666,7 +1026,7 @@ class Satellite:
         """
         substring something like '/data/DATA_'
         directory is created on the SD!
-        int padded with zeros will be appended to the last found file
+        int padded with zeros will be appended, taken from the directory's sequence file
         """
         if not self.hardware["SDcard"]:
             self.logger.warning("SD Card not initialized")
@@ -674,7 +1034,6 @@ class Satellite:
         # SDCard is initialized
         try:
             ff: str = ""
-            n: int = 0
             _folder: str = substring[: substring.rfind("/") + 1]
             _file: str = substring[substring.rfind("/") + 1 :]
             self.logger.debug(
@@ -698,21 +1057,11 @@ class Satellite:
                         filedir="/sd" + _folder,
                     )
                     return None
-            for i in range(0xFFFF):
-                ff: str = "/sd{}{}{:05}.txt".format(_folder, _file, (n + i) % 0xFFFF)
-                try:
-                    if n is not None:
-                        stat(ff)
-                except Exception as e:
-                    self.logger.error(
-                        "There was an error running the stat function on this file",
-                        e,
-                        filedir=ff,
-                        file_num=n,
-                    )
-                    n: int = (n + i) % 0xFFFF
-                    # print('file number is',n)
-                    break
+            sequence: FileSequence = self.file_sequences.get(_folder)
+            if sequence is None:
+                sequence = FileSequence("/sd" + _folder)
+                self.file_sequences[_folder] = sequence
+            ff: str = sequence.next_path(_file, "txt")
             self.logger.debug("creating a file...", file_dir=str(ff))
             if binary:
                 b: str = "ab"
@@ -0,0 +1,227 @@
+"""
+Cooperative scheduler for the periodic work of the flight loop.
+
+Tasks are declared with a period, a priority and a deadline instead of being
+called one after another with blocking sleeps in between. When several tasks
+are due, the one with the highest priority runs first, and a task that starts
+later than its deadline after its scheduled time is counted as missed. Between
+tasks the scheduler yields to the other asyncio tasks, and when nothing is due
+it sleeps until the next task is, so the idle time is spent sleeping.
+
+A task can be a plain function or a coroutine function. Tasks registered with
+the watchdog check in every time they complete, so a task that stops running
+stops the watchdog from being fed. A run that legitimately takes longer than
+its timeout, such as a long downlink started by a command, calls `check_in` as
+it makes progress.
+"""
+
+import asyncio
+import time
+
+from .logger import Logger
+
+try:
+    from typing import Any, Callable, Optional
+
+    from .watchdog import Watchdog
+except ImportError:
+    pass
+
+
+class PeriodicTask:
+    """
+    A function run every period seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable[[], Any],
+        period: float,
+        priority: int,
+        deadline: float,
+        next_run: float,
+    ) -> None:
+        """
+        :param str name: Name of the task, used in logs and for watchdog check ins.
+        :param function: Function or coroutine function run by the task.
+        :param float period: Seconds between the scheduled starts of two runs.
+        :param int priority: Tasks with a higher priority run first when several are due.
+        :param float deadline: Seconds a run may start after its scheduled time.
+        :param float next_run: Time of the first run.
+        """
+        self.name: str = name
+        self.function: Callable[[], Any] = function
+        self.period: float = period
+        self.priority: int = priority
+        self.deadline: float = deadline
+        self.next_run: float = next_run
+        self.runs: int = 0
+        self.missed: int = 0
+        self.errors: int = 0
+        self.last_duration: float = 0.0
+        # checks in with the watchdog after every run
+        self.watched: bool = False
+
+
+class Scheduler:
+    """
+    Runs periodic tasks cooperatively on asyncio.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        watchdog: Optional[Watchdog] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param Logger logger: Logger for task errors and missed deadlines.
+        :param Watchdog watchdog: Watchdog the watched tasks check in with.
+        :param clock: Function returning the current time in seconds.
+        """
+        self._logger: Logger = logger
+        self._watchdog: Optional[Watchdog] = watchdog
+        self._clock: Callable[[], float] = clock
+        self._running: bool = False
+        self.tasks: list[PeriodicTask] = []
+        # task being run, None between runs
+        self.current: Optional[PeriodicTask] = None
+
+    def add(
+        self,
+        name: str,
+        function: Callable[[], Any],
+        period: float,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        delay: float = 0.0,
+        watch: bool = True,
+    ) -> PeriodicTask:
+        """
+        Declare a periodic task.
+
+        :param str name: Unique name of the task.
+        :param function: Function or coroutine function to run.
+        :param float period: Seconds between runs.
+        :param int priority: Higher priorities run first when several tasks are due.
+        :param float deadline: Seconds a run may be late, defaults to the period.
+        :param float delay: Seconds before the first run.
+        :param bool watch: Register the task with the watchdog, it must then complete
+            at least every period plus deadline seconds for the watchdog to be fed.
+
+        :raises ValueError: If a task with the same name exists or the period is not positive.
+
+        :return PeriodicTask: The new task.
+        """
+        if period <= 0:
+            raise ValueError(f"Period of task {name} must be positive")
+        if self.get(name) is not None:
+            raise ValueError(f"Task {name} already exists")
+
+        if deadline is None:
+            deadline = period
+        task = PeriodicTask(
+            name, function, period, priority, deadline, self._clock() + delay
+        )
+        self.tasks.append(task)
+        # keep the tasks in the order they run in when due together
+        self.tasks.sort(key=lambda t: -t.priority)
+
+        if watch and self._watchdog is not None:
+            self._watchdog.register(name, delay + period + deadline)
+            task.watched = True
+        return task
+
+    def get(self, name: str) -> Optional[PeriodicTask]:
+        """
+        The task with the given name, None if there is none.
+        """
+        for task in self.tasks:
+            if task.name == name:
+                return task
+        return None
+
+    def next_due(self) -> Optional[float]:
+        """
+        Seconds until the next task is due, 0 if one is due already, None without tasks.
+        """
+        if not self.tasks:
+            return None
+        soonest = self.tasks[0].next_run
+        for task in self.tasks:
+            soonest = min(soonest, task.next_run)
+        return max(soonest - self._clock(), 0.0)
+
+    async def run_pending(self) -> int:
+        """
+        Run every due task once, in priority order.
+
+        :return int: The number of tasks run.
+        """
+        count = 0
+        for task in self.tasks:
+            start = self._clock()
+            if task.next_run > start:
+                continue
+
+            if start - task.next_run > task.deadline:
+                task.missed += 1
+                self._logger.warning(
+                    "Task missed its deadline",
+                    task=task.name,
+                    late=start - task.next_run,
+                )
+
+            await self._run_task(task)
+            count += 1
+
+            # runs that fell behind are skipped rather than run back to back
+            task.next_run += task.period
+            if task.next_run <= start:
+                task.next_run = start + task.period
+
+            # let the other asyncio tasks run between two scheduled ones
+            await asyncio.sleep(0)
+        return count
+
+    def check_in(self) -> None:
+        """
+        Report progress of the running task from inside a long run, so it is not seen as stalled.
+        """
+        task = self.current
+        if task is not None and task.watched:
+            self._watchdog.check_in(task.name)
+
+    async def _run_task(self, task: PeriodicTask) -> None:
+        start = self._clock()
+        self.current = task
+        try:
+            result = task.function()
+            if hasattr(result, "send"):  # a coroutine
+                await result
+            task.runs += 1
+            if task.watched:
+                self._watchdog.check_in(task.name)
+        except Exception as e:
+            task.errors += 1
+            self._logger.error("Scheduled task failed", e, task=task.name)
+        finally:
+            self.current = None
+        task.last_duration = self._clock() - start
+
+    async def run(self) -> None:
+        """
+        Run the tasks until `stop` is called, sleeping whenever none is due.
+        """
+        self._running = True
+        while self._running:
+            await self.run_pending()
+            wait = self.next_due()
+            await asyncio.sleep(wait if wait is not None else 1.0)
+
+    def stop(self) -> None:
+        """
+        Make `run` return once the tasks being run have completed.
+        """
+        self._running = False
@@ -0,0 +1,78 @@
+"""
+Timestamped cache of sensor readings.
+
+Several loops sample the same sensors within milliseconds of each other. Each
+reading is kept with the time it was taken, and callers state how old a value
+they are willing to accept, so a fresh enough reading is served without
+another bus transaction.
+"""
+
+import time
+
+try:
+    from typing import Any, Callable, Optional
+except ImportError:
+    pass
+
+
+class SensorCache:
+    """
+    Keeps the latest reading of each sensor with its timestamp.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        :param clock: Function returning the current time in seconds.
+        """
+        self._clock: Callable[[], float] = clock
+        self._readings: dict[str, tuple[float, Any]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def read(self, name: str, reader: Callable[[], Any], max_age: float = 0.0) -> Any:
+        """
+        Return the cached reading if it is fresh enough, otherwise call reader.
+
+        :param str name: Name of the sensor value.
+        :param reader: Function that reads the sensor, returning None on failure.
+        :param float max_age: Age in seconds of a cached reading that is still acceptable,
+            0 to always read the sensor.
+
+        :return: The reading, or None if the sensor could not be read.
+        """
+        now = self._clock()
+        cached: Optional[tuple[float, Any]] = self._readings.get(name)
+        if cached is not None and max_age > 0 and now - cached[0] <= max_age:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        value = reader()
+        # failed reads are not cached, the next call tries the bus again
+        if value is not None:
+            self._readings[name] = (now, value)
+        return value
+
+    def get(self, name: str) -> Optional[tuple[float, Any]]:
+        """
+        The cached timestamp and reading of a sensor without reading it, None if there is none.
+        """
+        return self._readings.get(name)
+
+    def age(self, name: str) -> Optional[float]:
+        """
+        Seconds since the cached reading was taken, None if there is none.
+        """
+        cached = self._readings.get(name)
+        if cached is None:
+            return None
+        return self._clock() - cached[0]
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop the cached reading of one sensor, or of every sensor when no name is given.
+        """
+        if name is None:
+            self._readings = {}
+        else:
+            self._readings.pop(name, None)
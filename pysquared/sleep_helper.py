@@ -42,6 +42,7 @@ class SleepHelper:
         """
 
         self.logger.info("Setting Safe Sleep Mode")
+        self.cubesat.nvm_cache.commit()
 
         iterations: int = 0
 
@@ -0,0 +1,77 @@
+"""
+Cache of the devices found behind each TCA multiplexer channel.
+
+Scanning a channel takes a bus transaction per address, so the addresses found
+are kept with the time of the scan. A channel is only scanned again when its
+map is missing, was dropped after a failed read on the channel, or is older
+than the health check interval.
+"""
+
+from __future__ import annotations
+
+import time
+
+from micropython import const
+
+try:
+    from typing import Any, Callable, Optional
+except ImportError:
+    pass
+
+# Seconds after which a cached TCA channel device map is due for a health check scan
+TCA_RESCAN_INTERVAL = const(3600)
+
+
+class TCAScanCache:
+    """
+    Addresses found on each TCA channel and when they were found.
+    """
+
+    def __init__(
+        self,
+        channels: int = 5,
+        rescan_interval: float = TCA_RESCAN_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param int channels: Number of channels.
+        :param float rescan_interval: Seconds a device map stays fresh.
+        :param clock: Function returning the current time in seconds.
+        """
+        self._rescan_interval: float = rescan_interval
+        self._clock: Callable[[], float] = clock
+        # valid addresses found behind each channel, None until scanned
+        self.addresses: list[Optional[list[int]]] = [None] * channels
+        self.times: list[float] = [0.0] * channels
+
+    def store(self, channel: int, addresses: list[int]) -> None:
+        """
+        Keep the addresses found by a scan of a channel.
+        """
+        self.addresses[channel] = addresses
+        self.times[channel] = self._clock()
+
+    def invalidate(self, channel: int) -> None:
+        """
+        Drop the device map of a channel, after a read on it failed.
+        """
+        self.addresses[channel] = None
+
+    def is_fresh(self, channel: int) -> bool:
+        """
+        True if the channel has a device map younger than the rescan interval.
+        """
+        return (
+            self.addresses[channel] is not None
+            and self._clock() - self.times[channel] < self._rescan_interval
+        )
+
+    def devices(self, channel: int, scan: Callable[[int], Any]) -> list[int]:
+        """
+        Addresses on a channel, calling `scan(channel)` first unless the map is fresh.
+
+        :param scan: Function scanning the channel and storing the result here.
+        """
+        if not self.is_fresh(channel):
+            scan(channel)
+        return self.addresses[channel] or []
@@ -0,0 +1,231 @@
+"""
+Telemetry history in fixed size ring buffers with downsampling tiers.
+
+Every channel keeps its history in `array` backed ring buffers. Samples are
+aggregated per second into the first tier, and every full period of a tier is
+rolled up into the next, coarser tier as its minimum, maximum and mean. With
+the default tiers a channel holds the last 30 seconds, the last hour by minute
+and the last 8 hours by quarter hour in under 2 KB.
+
+A tier can be encoded for downlink as:
+
+    header: name length (u8), name, tier (u8), period in s (u16), entry count (u16)
+    entries, oldest first: period start in s (u32), min, max, mean (f32)
+"""
+
+import struct
+import time
+from array import array
+
+try:
+    from typing import Callable, Optional
+except ImportError:
+    pass
+
+# (period in seconds, number of entries kept) per tier
+DEFAULT_TIERS: tuple[tuple[int, int], ...] = ((1, 30), (60, 60), (900, 32))
+
+_ENTRY_FORMAT = "<Ifff"
+
+
+def _seconds() -> int:
+    return time.monotonic_ns() // 1000000000
+
+
+class RingBuffer:
+    """
+    Fixed capacity buffer of numbers that overwrites the oldest value when full.
+    """
+
+    def __init__(self, capacity: int, typecode: str = "f") -> None:
+        self._data: array = array(typecode, [0] * capacity)
+        self._next: int = 0
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value) -> None:
+        self._data[self._next] = value
+        self._next = (self._next + 1) % len(self._data)
+        if self._count < len(self._data):
+            self._count += 1
+
+    def __getitem__(self, index: int):
+        """
+        Value by age order, 0 is the oldest and -1 the newest.
+        """
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError("ring buffer index out of range")
+        return self._data[(self._next - self._count + index) % len(self._data)]
+
+    def values(self) -> list:
+        return [self[i] for i in range(self._count)]
+
+    def clear(self) -> None:
+        self._next = 0
+        self._count = 0
+
+
+class _Tier:
+    def __init__(self, period: int, capacity: int) -> None:
+        self.period: int = period
+        self.times: RingBuffer = RingBuffer(capacity, "I")
+        self.minimum: RingBuffer = RingBuffer(capacity)
+        self.maximum: RingBuffer = RingBuffer(capacity)
+        self.mean: RingBuffer = RingBuffer(capacity)
+        # aggregate of the period in progress
+        self.start: Optional[int] = None
+        self.low: float = 0.0
+        self.high: float = 0.0
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def add(self, start: int, low: float, high: float, total: float, count: int):
+        """
+        Add an aggregate to the period in progress.
+
+        :return: The completed period as (start, min, max, sum, count) if this one starts a new period.
+        """
+        period_start = start - start % self.period
+        completed = None
+        if self.start is not None and period_start != self.start:
+            completed = self.close()
+
+        if self.start is None:
+            self.start, self.low, self.high = period_start, low, high
+            self.total, self.count = total, count
+        else:
+            self.low = min(self.low, low)
+            self.high = max(self.high, high)
+            self.total += total
+            self.count += count
+        return completed
+
+    def close(self) -> tuple[int, float, float, float, int]:
+        completed = (self.start, self.low, self.high, self.total, self.count)
+        self.times.append(self.start)
+        self.minimum.append(self.low)
+        self.maximum.append(self.high)
+        self.mean.append(self.total / self.count)
+        self.start = None
+        return completed
+
+
+class TelemetryChannel:
+    """
+    History of one telemetry value.
+    """
+
+    def __init__(self, tiers: tuple[tuple[int, int], ...] = DEFAULT_TIERS) -> None:
+        """
+        :param tuple tiers: Period in seconds and number of entries of each tier, finest first.
+        """
+        self._tiers: list[_Tier] = [_Tier(period, size) for period, size in tiers]
+
+    def record(self, value: float, now: int) -> None:
+        """
+        Add a sample taken at `now`, in whole seconds of monotonic time.
+        """
+        aggregate = (now, value, value, value, 1)
+        for tier in self._tiers:
+            aggregate = tier.add(*aggregate)
+            if aggregate is None:
+                return
+
+    def tier(self, index: int) -> list[tuple[int, float, float, float]]:
+        """
+        Completed entries of a tier, oldest first.
+
+        :return list: Tuples of period start, minimum, maximum and mean.
+        """
+        tier = self._tiers[index]
+        return [
+            (tier.times[i], tier.minimum[i], tier.maximum[i], tier.mean[i])
+            for i in range(len(tier.times))
+        ]
+
+    def period(self, index: int) -> int:
+        return self._tiers[index].period
+
+    def __len__(self) -> int:
+        return len(self._tiers)
+
+
+class Telemetry:
+    """
+    Set of named telemetry channels sharing the same tiers.
+    """
+
+    def __init__(
+        self,
+        channels: list[str],
+        tiers: tuple[tuple[int, int], ...] = DEFAULT_TIERS,
+        clock: Callable[[], int] = _seconds,
+    ) -> None:
+        """
+        :param list channels: Names of the channels.
+        :param tuple tiers: Period in seconds and number of entries of each tier, finest first.
+        :param clock: Function returning monotonic time in whole seconds.
+        """
+        self._clock: Callable[[], int] = clock
+        self._channels: dict[str, TelemetryChannel] = {
+            name: TelemetryChannel(tiers) for name in channels
+        }
+
+    def channels(self) -> list[str]:
+        return list(self._channels.keys())
+
+    def channel(self, name: str) -> TelemetryChannel:
+        return self._channels[name]
+
+    def record(self, name: str, value: Optional[float]) -> None:
+        """
+        Add a sample to a channel, None values are skipped.
+
+        :raises KeyError: If there is no such channel.
+        """
+        if value is None:
+            return
+        self._channels[name].record(float(value), self._clock())
+
+    def encode(self, name: str, tier: int) -> bytes:
+        """
+        Encode a tier of a channel for downlink, see the module docstring for the layout.
+
+        :raises KeyError: If there is no such channel.
+        :raises IndexError: If there is no such tier.
+        """
+        channel = self._channels[name]
+        entries = channel.tier(tier)
+        name_bytes = name.encode("utf-8")
+
+        data = bytearray()
+        data.append(len(name_bytes))
+        data.extend(name_bytes)
+        data.extend(struct.pack("<BHH", tier, channel.period(tier), len(entries)))
+        for entry in entries:
+            data.extend(struct.pack(_ENTRY_FORMAT, *entry))
+        return bytes(data)
+
+
+def decode(data: bytes) -> tuple[str, int, int, list[tuple[int, float, float, float]]]:
+    """
+    Decode a downlinked tier, intended for use on the ground.
+
+    :return tuple: Channel name, tier, period in seconds and the entries.
+    """
+    name_length = data[0]
+    name = bytes(data[1 : 1 + name_length]).decode("utf-8")
+    offset = 1 + name_length
+    tier, period, count = struct.unpack_from("<BHH", data, offset)
+    offset += struct.calcsize("<BHH")
+
+    entry_size = struct.calcsize(_ENTRY_FORMAT)
+    entries = [
+        struct.unpack_from(_ENTRY_FORMAT, data, offset + i * entry_size)
+        for i in range(count)
+    ]
+    return name, tier, period, entries
@@ -9,6 +9,9 @@ import microcontroller
 import sdcardio
 import storage
 
+from ..file_reader import copy_file, read_chunks
+from ..file_sequence import FileSequence
+
 # Helpful resource: https://docs.circuitpython.org/en/latest/shared-bindings/storage/
 
 # boot.py:
@@ -34,6 +37,7 @@ class USBFunctions:
     def __init__(self) -> None:
         storage.remount("/", readonly=False)  # Remounts root file system as readable
         self.sd_initialized = False  # Creating SD initialization flag
+        self.file_sequences = {}  # Next file numbers of every folder used by make_file
         if self.init_sd():  # Checking if SD initialization via init_sd() was successful
             self.sd_initialized = True  # Setting flag to True upon success
         print("Initialized USB Functionalities")
@@ -104,7 +108,6 @@ class USBFunctions:
         """
         try:
             ff = ""
-            n = 0
             _folder = file_name[
                 : file_name.rfind("/") + 1
             ]  # Extracts the folder from the file name
@@ -133,19 +136,13 @@ class USBFunctions:
                         + "".join(traceback.format_exception(e))
                     )
                     return None
-            for i in range(
-                0xFFFF
-            ):  # Finding an available, unique file name by appending a unique number
-                ff = "/sd{}{}{:05}.{}".format(
-                    _folder, _file, (n + i) % 0xFFFF, _file_type
-                )
-                try:
-                    if n is not None:
-                        os.stat(ff)  # Checks if the file exists
-                except Exception:
-                    n = (n + i) % 0xFFFF
-                    # print('file number is',n)
-                    break
+            sequence = self.file_sequences.get(_folder)
+            if sequence is None:
+                sequence = FileSequence("/sd" + _folder)
+                self.file_sequences[_folder] = sequence
+            ff = sequence.next_path(
+                _file, _file_type
+            )  # Takes the next unique number from the folder's sequence file
             print("creating file..." + str(ff))
             if binary:
                 b = "ab"  # Sets mode to binary append
@@ -169,16 +166,14 @@ class USBFunctions:
         Returns:
             str: The contents of the file as a string or list.
         """
-        with open(path, "r") as f:  # Opens the file at the specified path in read mode
-            lines = (
-                f.readlines()
-            )  # Reads all lines from the file and stores them in a list
         if type == "list":  # Checks if the return type is specified as 'list'
-            return lines  # Returns the list of lines
+            with open(path, "r") as f:  # Opens the file at the specified path
+                return f.readlines()  # Returns the list of lines
         if type == "string":  # Checks if the return type is specified as 'string'
-            return "".join(
-                map(str, lines)
-            )  # Joins the list of lines into a single string and returns it
+            contents = bytearray()
+            for chunk in read_chunks(path):  # Reads the file in reused chunks
+                contents.extend(chunk)
+            return contents.decode("utf-8")  # Decodes once so no character is split
 
     def writefile(self, path: str, contents: str) -> str:
         """Writes contents to a file and returns the updated file contents.
@@ -271,7 +266,7 @@ class USBFunctions:
             path, _stringify
         )  # Writes the updated contents to the file and returns the updated file contents
 
-    def copyfile(self, to_path: str, from_path: str) -> str:
+    def copyfile(self, to_path: str, from_path: str) -> int:
         """Copies contents from one file to another.
 
         Args:
@@ -279,13 +274,11 @@ class USBFunctions:
             from_path (str): The source file path.
 
         Returns:
-            str: The updated contents of the destination file.
+            int: The number of bytes copied.
         """
-        # TODO: Make file if not exist. look into why from_path file get rewritten. bug?
-        contents = self.readfile(from_path)  # Reads the contents of the source file
-        return self.writefile(
-            to_path, contents
-        )  # Writes the contents to the destination file and returns the updated contents
+        return copy_file(
+            from_path, to_path
+        )  # Streams the source into the destination without loading it whole
 
     def print_directory(self, path: str, tabs: int = 0) -> None:
         """Prints the contents of a directory recursively.
@@ -0,0 +1,116 @@
+"""
+Hardware state carried across planned resets.
+
+Before a planned reset the presence of every hardware device and the addresses
+found behind each TCA channel are saved to the NVM key-value store. The next
+boot takes the snapshot and removes it from the store straight away, so a
+snapshot is only ever used by the boot right after the reset that saved it.
+Devices the snapshot lists as good skip rediscovery, absent or failing ones are
+probed as usual.
+
+The snapshot carries a checksum of the hardware key names, so a snapshot saved
+with a different set of keys, or in a different order, is discarded.
+"""
+
+from binascii import crc32
+
+try:
+    from typing import Optional, OrderedDict
+
+    from .nvm.kvstore import KVStore
+except ImportError:
+    pass
+
+WARM_START_KEY = "warm"
+
+
+def _keys_checksum(hardware: OrderedDict[str, bool]) -> int:
+    return crc32(",".join(hardware.keys()).encode("utf-8"))
+
+
+class WarmStart:
+    """
+    Snapshot of hardware presence and TCA scan results.
+    """
+
+    def __init__(self, hardware_keys: list[str], mask: int, tca_scan: list) -> None:
+        """
+        :param list hardware_keys: Hardware keys in the order of their bits in the mask.
+        :param int mask: Bit per hardware key, set when the device was working.
+        :param list tca_scan: Valid addresses found per TCA channel, None for channels not scanned.
+        """
+        self._hardware_keys: list[str] = hardware_keys
+        self.mask: int = mask
+        self.tca_scan: list = tca_scan
+
+    @staticmethod
+    def save(store: KVStore, hardware: OrderedDict[str, bool], tca_scan: list) -> None:
+        """
+        Put a snapshot in the store, it is written with the next store commit.
+        """
+        mask = 0
+        for bit, working in enumerate(hardware.values()):
+            if working:
+                mask |= 1 << bit
+        store.set(
+            WARM_START_KEY,
+            {"keys": _keys_checksum(hardware), "hw": mask, "tca": list(tca_scan)},
+        )
+
+    @staticmethod
+    def commit(store: KVStore) -> bool:
+        """
+        Commit the store, dropping the snapshot when it does not fit next to the other values.
+
+        The snapshot only speeds up the next boot, a planned reset must not fail because of it.
+
+        :raises ValueError: If the other values do not fit even without the snapshot.
+
+        :return bool: False if the snapshot had to be dropped.
+        """
+        try:
+            store.commit()
+            return True
+        except ValueError:
+            store.delete(WARM_START_KEY)
+            store.commit()
+            return False
+
+    @staticmethod
+    def take(store: KVStore, hardware: OrderedDict[str, bool]) -> Optional["WarmStart"]:
+        """
+        Remove the snapshot from the store and return it.
+
+        :return: The snapshot, or None when there is none or it does not match the hardware keys.
+        """
+        snapshot = store.get(WARM_START_KEY)
+        if snapshot is None:
+            return None
+
+        store.delete(WARM_START_KEY)
+        store.commit()
+
+        try:
+            if snapshot["keys"] != _keys_checksum(hardware):
+                return None
+            mask = int(snapshot["hw"])
+            tca_scan = list(snapshot["tca"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return WarmStart(list(hardware.keys()), mask, tca_scan)
+
+    def is_good(self, hardware_key: str) -> bool:
+        """
+        True if the device was working before the reset.
+        """
+        if hardware_key not in self._hardware_keys:
+            return False
+        return bool(self.mask & (1 << self._hardware_keys.index(hardware_key)))
+
+    def addresses(self, channel: int) -> Optional[list[int]]:
+        """
+        Valid addresses found on a TCA channel before the reset, None if it was not scanned.
+        """
+        if channel >= len(self.tca_scan):
+            return None
+        return self.tca_scan[channel]
@@ -0,0 +1,124 @@
+"""
+Watchdog service that is only fed while the flight software makes progress.
+
+The external watchdog resets the board unless its WDI pin is pulsed regularly.
+Pulsing it wherever there happens to be time keeps the board alive even when
+the work that matters is stuck. Instead, tasks register with a timeout and
+check in as they make progress, and the pin is only pulsed while every
+registered task has checked in within its timeout. With no registered tasks
+every pet is accepted.
+
+Pulsing never blocks: `pet` toggles the pin high and straight back low, and the
+`run` asyncio task yields to the other tasks while the pin is high.
+"""
+
+import asyncio
+import time
+
+from .logger import Logger
+
+try:
+    from typing import Callable
+
+    import digitalio
+except ImportError:
+    pass
+
+
+class Watchdog:
+    """
+    Feeds the hardware watchdog while every registered task checks in.
+    """
+
+    def __init__(
+        self,
+        pin: digitalio.DigitalInOut,
+        logger: Logger,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param pin: Output connected to the watchdog input.
+        :param Logger logger: Logger told when pets are withheld.
+        :param clock: Function returning the current time in seconds.
+        """
+        self._pin: digitalio.DigitalInOut = pin
+        self._logger: Logger = logger
+        self._clock: Callable[[], float] = clock
+        # name -> [timeout, time of the last check in]
+        self._tasks: dict[str, list[float]] = {}
+        self._starved: bool = False
+        self.pets: int = 0
+
+    def register(self, name: str, timeout: float) -> None:
+        """
+        Start expecting check ins from a task, the first one is due timeout seconds from now.
+
+        :param str name: Name of the task.
+        :param float timeout: Longest time in seconds the task may go without checking in.
+        """
+        self._tasks[name] = [timeout, self._clock()]
+
+    def unregister(self, name: str) -> None:
+        """
+        Stop expecting check ins from a task.
+        """
+        self._tasks.pop(name, None)
+
+    def check_in(self, name: str) -> None:
+        """
+        Report that a task made progress.
+
+        :raises KeyError: If the task is not registered.
+        """
+        self._tasks[name][1] = self._clock()
+
+    def stalled(self) -> list[str]:
+        """
+        Names of the registered tasks that are overdue for a check in.
+        """
+        now = self._clock()
+        return [
+            name
+            for name, (timeout, last) in self._tasks.items()
+            if now - last > timeout
+        ]
+
+    def pet(self) -> bool:
+        """
+        Pulse the watchdog input unless a registered task is stalled.
+
+        :return bool: True if the watchdog was fed.
+        """
+        if not self._healthy():
+            return False
+        self._pin.value = True
+        self._pin.value = False
+        self.pets += 1
+        return True
+
+    async def run(self, interval: float = 1.0, pulse_width: float = 0.01) -> None:
+        """
+        Feed the watchdog forever, to be run as an asyncio task.
+
+        :param float interval: Seconds between pulses.
+        :param float pulse_width: Seconds the pin is held high, other tasks run meanwhile.
+        """
+        while True:
+            if self._healthy():
+                self._pin.value = True
+                await asyncio.sleep(pulse_width)
+                self._pin.value = False
+                self.pets += 1
+            await asyncio.sleep(interval)
+
+    def _healthy(self) -> bool:
+        stalled = self.stalled()
+        if stalled:
+            # only report the transition, not every withheld pet
+            if not self._starved:
+                self._logger.warning("Withholding watchdog pet", stalled_tasks=stalled)
+            self._starved = True
+            return False
+
+        self._starved = False
+        return True
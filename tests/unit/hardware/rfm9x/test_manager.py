@@ -155,3 +155,40 @@ def test_beacon_radio_message_unlicensed(
 
     mock_radio.send.assert_not_called()
     assert "Radio is not licensed" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("use_fsk_initial", [False, True])
+def test_reconfigure_recreates_radio_with_its_modulation(
+    mock_logger: Logger, mock_radio_factory: MagicMock, use_fsk_initial: bool
+):
+    use_fsk = Flag(0, 0, ByteArray(size=8))
+    if use_fsk_initial:
+        use_fsk.toggle(True)
+    modulation = RFM9xModulation.FSK if use_fsk_initial else RFM9xModulation.LORA
+    first_radio = MagicMock(spec=RFMSPI)
+    second_radio = MagicMock(spec=RFMSPI)
+    mock_radio_factory.create.side_effect = [first_radio, second_radio]
+    mock_radio_factory.get_instance_modulation.return_value = modulation
+
+    manager = RFM9xManager(mock_logger, use_fsk, mock_radio_factory, is_licensed=True)
+    manager.reconfigure()
+
+    assert manager.radio is second_radio
+    assert mock_radio_factory.create.call_args_list[-1].args == (
+        manager._log,
+        modulation,
+    )
+
+
+@pytest.mark.parametrize("is_licensed", [False, True])
+def test_is_licensed(
+    mock_logger: Logger,
+    mock_use_fsk: Flag,
+    mock_radio_factory: MagicMock,
+    is_licensed: bool,
+):
+    manager = RFM9xManager(
+        mock_logger, mock_use_fsk, mock_radio_factory, is_licensed=is_licensed
+    )
+
+    assert manager.is_licensed is is_licensed
@@ -0,0 +1,141 @@
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from pysquared.hardware.imu_fifo import IMUFifo
+
+
+class FakeIMU:
+    """
+    I2C device with the LSM6DSOX registers used by the FIFO driver.
+    """
+
+    def __init__(self) -> None:
+        self.registers = bytearray(0x80)
+        self.registers[0x10] = 0x0C  # accelerometer full scale bits
+        self.registers[0x11] = 0x02  # gyroscope full scale bits
+        self.fifo: list[bytes] = []
+        self.overrun = False
+        self.transactions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def push(self, tag: int, x: int, y: int, z: int) -> None:
+        self.fifo.append(bytes([tag << 3]) + struct.pack("<hhh", x, y, z))
+
+    def write(self, buf) -> None:
+        self.transactions += 1
+        self.registers[buf[0]] = buf[1]
+
+    def write_then_readinto(self, out_buf, in_buf, out_end=None, in_end=None) -> None:
+        self.transactions += 1
+        register = out_buf[0]
+        in_end = len(in_buf) if in_end is None else in_end
+        if register == 0x78:
+            data = b"".join(self.fifo[: in_end // 7])
+            del self.fifo[: in_end // 7]
+        elif register == 0x3A:
+            level = len(self.fifo)
+            status2 = (level >> 8) | (0x40 if self.overrun else 0)
+            data = bytes([level & 0xFF, status2])
+        else:
+            data = bytes(self.registers[register : register + in_end])
+        in_buf[:in_end] = data[:in_end]
+
+
+def test_start_configures_fifo_and_data_rates():
+    imu = FakeIMU()
+    fifo = IMUFifo(imu)
+
+    fifo.start(833)
+
+    assert imu.registers[0x09] == 0x77
+    assert imu.registers[0x0A] == 6
+    assert imu.registers[0x10] == 0x7C  # full scale bits kept
+    assert imu.registers[0x11] == 0x72
+
+
+def test_unsupported_rate():
+    with pytest.raises(ValueError):
+        IMUFifo(FakeIMU()).start(100)
+
+
+def test_drain_sorts_samples_by_tag():
+    imu = FakeIMU()
+    fifo = IMUFifo(imu)
+    fifo.start(104)
+
+    imu.push(0x02, 1, 2, 3)
+    imu.push(0x01, -4, -5, -6)
+    imu.push(0x03, 9, 9, 9)  # temperature, not batched
+    imu.push(0x02, 7, 8, 9)
+
+    assert fifo.drain() == 4
+    assert fifo.accel_count == 2
+    assert fifo.gyro_count == 1
+    assert fifo.accel_sample(1) == (7, 8, 9)
+    assert fifo.gyro_sample(0) == (-4, -5, -6)
+
+
+def test_drain_reads_in_bulk_chunks():
+    imu = FakeIMU()
+    fifo = IMUFifo(imu, capacity=200, chunk_words=32)
+    fifo.start(6667)
+    for i in range(100):
+        imu.push(0x02, i, 0, 0)
+    imu.transactions = 0
+
+    fifo.drain()
+
+    assert fifo.accel_count == 100
+    assert imu.transactions == 1 + 4  # status read and ceil(100 / 32) data reads
+    assert fifo.accel_sample(99) == (99, 0, 0)
+
+
+def test_full_buffer_drops_samples():
+    imu = FakeIMU()
+    fifo = IMUFifo(imu, capacity=2)
+    fifo.start(52)
+    for i in range(3):
+        imu.push(0x02, i, i, i)
+
+    fifo.drain()
+
+    assert fifo.accel_count == 2
+    assert fifo.dropped == 1
+
+
+def test_overruns_are_counted():
+    imu = FakeIMU()
+    imu.overrun = True
+    fifo = IMUFifo(imu)
+    fifo.start(52)
+
+    fifo.drain()
+
+    assert fifo.overruns == 1
+
+
+def test_timestamps_are_evenly_spaced():
+    fifo = IMUFifo(FakeIMU())
+    with patch("pysquared.hardware.imu_fifo.time.monotonic_ns", return_value=1000):
+        fifo.start(12.5)
+
+    assert fifo.timestamp_ns(0) == 1000 + 80000000
+    assert fifo.timestamp_ns(9) - fifo.timestamp_ns(8) == 80000000
+
+
+def test_stop_returns_to_bypass():
+    imu = FakeIMU()
+    fifo = IMUFifo(imu)
+    fifo.start(52)
+
+    fifo.stop()
+
+    assert imu.registers[0x0A] == 0
+    assert imu.registers[0x09] == 0
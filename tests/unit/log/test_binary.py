@@ -0,0 +1,146 @@
+import io
+import json
+
+import pytest
+
+import pysquared.nvm.counter as counter
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.log.binary import BinaryLogDecoder, BinaryLogEncoder, BinaryLogSink
+from pysquared.logger import Logger, LogRecord
+
+
+def make_record(time=1700000000, level="INFO", level_value=2, message="msg", **kwargs):
+    return LogRecord(time, level, level_value, message, kwargs)
+
+
+def test_round_trip():
+    encoder = BinaryLogEncoder()
+    decoder = BinaryLogDecoder()
+
+    data = encoder.encode(
+        make_record(
+            message="Successfully initialized hardware device",
+            device="I2C0",
+            status=True,
+            failed=False,
+            nothing=None,
+            count=-42,
+            voltage=6.5,
+            raw=b"\x01\x02",
+            err=["Traceback", "OSError: boom"],
+        )
+    )
+    data += encoder.encode(make_record(time=1700000003, level="ERROR", level_value=4))
+
+    records = decoder.decode(data)
+    assert records[0] == {
+        "time": 1700000000,
+        "level": "INFO",
+        "msg": "Successfully initialized hardware device",
+        "device": "I2C0",
+        "status": True,
+        "failed": False,
+        "nothing": None,
+        "count": -42,
+        "voltage": 6.5,
+        "raw": b"\x01\x02",
+        "err": ["Traceback", "OSError: boom"],
+    }
+    assert records[1] == {"time": 1700000003, "level": "ERROR", "msg": "msg"}
+
+
+def test_strings_are_interned_once():
+    encoder = BinaryLogEncoder()
+    first = encoder.encode(make_record(message="I am beaconing", success="True"))
+    second = encoder.encode(make_record(message="I am beaconing", success="True"))
+
+    assert b"I am beaconing" in first
+    assert b"I am beaconing" not in second
+    assert len(second) < len(first)
+
+
+def test_much_smaller_than_json():
+    encoder = BinaryLogEncoder()
+    binary_size = 0
+    json_size = 0
+    for i in range(100):
+        record = make_record(
+            time=1700000000 + i,
+            message="Successfully initialized hardware device",
+            device="I2C0",
+            status=True,
+        )
+        binary_size += len(encoder.encode(record))
+        json_size += len(
+            json.dumps(
+                {
+                    "time": "2023-11-14 22:13:20",
+                    "level": record.level,
+                    "msg": record.message,
+                    **record.kwargs,
+                }
+            )
+        )
+
+    assert binary_size * 8 < json_size
+
+
+def test_full_table_writes_strings_inline():
+    encoder = BinaryLogEncoder(max_strings=1)
+    decoder = BinaryLogDecoder()
+
+    data = encoder.encode(make_record(message="first", key="value"))
+    data += encoder.encode(make_record(message="second"))
+
+    records = decoder.decode(data)
+    assert records[0]["msg"] == "first"
+    assert records[0]["key"] == "value"
+    assert records[1]["msg"] == "second"
+
+
+def test_reset_starts_a_new_stream():
+    encoder = BinaryLogEncoder()
+    encoder.encode(make_record(message="hello"))
+    encoder.reset()
+
+    records = BinaryLogDecoder().decode(encoder.encode(make_record(message="hello")))
+    assert records == [{"time": 1700000000, "level": "INFO", "msg": "hello"}]
+
+
+def test_decode_truncated_data_raises():
+    data = BinaryLogEncoder().encode(make_record(message="hello", key="value"))
+    with pytest.raises(ValueError):
+        BinaryLogDecoder().decode(data[:-2])
+
+
+def test_sink_receives_logger_records():
+    stream = io.BytesIO()
+    logger = Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)),
+        sinks=[BinaryLogSink(stream)],
+    )
+
+    logger.info("Hello", foo="bar")
+    logger.error("Oops", OSError("Manually creating an OS Error"))
+
+    records = BinaryLogDecoder().decode(stream.getvalue())
+    assert records[0]["msg"] == "Hello"
+    assert records[0]["foo"] == "bar"
+    assert records[1]["level"] == "ERROR"
+    assert "OSError: Manually creating an OS Error" in "".join(records[1]["err"])
+
+
+def test_feed_handles_records_split_across_chunks():
+    encoder = BinaryLogEncoder()
+    data = b"".join(
+        encoder.encode(make_record(time=1700000000 + i, message="record", i=i))
+        for i in range(20)
+    )
+
+    decoder = BinaryLogDecoder()
+    records = []
+    for start in range(0, len(data), 7):
+        records.extend(decoder.feed(data[start : start + 7]))
+
+    assert [r["i"] for r in records] == list(range(20))
+    assert [r["time"] for r in records] == [1700000000 + i for i in range(20)]
@@ -0,0 +1,127 @@
+import os
+
+import pytest
+
+from pysquared.log.binary import BinaryLogDecoder
+from pysquared.log.file_sink import BufferedFileSink
+from pysquared.logger import LogRecord
+
+
+def make_record(level="INFO", level_value=2, message="msg", **kwargs):
+    return LogRecord(1700000000, level, level_value, message, kwargs)
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "logs")
+
+
+def decode_segments(sink):
+    records = []
+    for number in sink.segments():
+        data = sink.read_segment(number)
+        if data:
+            records.extend(BinaryLogDecoder().decode(data))
+    return records
+
+
+def test_records_are_buffered_until_a_block_fills(directory):
+    sink = BufferedFileSink(directory, buffer_size=256, block_size=128)
+
+    sink.emit(make_record(message="hello"))
+    assert not os.path.exists(sink.segment_path(0))
+
+    for _ in range(20):
+        sink.emit(make_record(message="hello", device="I2C0"))
+
+    size = os.stat(sink.segment_path(0)).st_size
+    assert size > 0
+    assert size % 128 == 0
+
+
+def test_error_flushes_immediately(directory):
+    sink = BufferedFileSink(directory)
+
+    sink.emit(make_record(message="info"))
+    sink.emit(make_record(level="ERROR", level_value=4, message="boom"))
+
+    with open(sink.segment_path(0), "rb") as f:
+        records = BinaryLogDecoder().decode(f.read())
+    assert [r["msg"] for r in records] == ["info", "boom"]
+
+
+def test_rotation_keeps_records_whole(directory):
+    sink = BufferedFileSink(
+        directory, buffer_size=64, block_size=32, max_file_size=200, max_files=100
+    )
+
+    for i in range(50):
+        sink.emit(make_record(message="record", i=i))
+    sink.flush()
+
+    assert len(sink.segments()) > 1
+    for number in sink.segments():
+        assert os.stat(sink.segment_path(number)).st_size <= 200
+
+    assert [r["i"] for r in decode_segments(sink)] == list(range(50))
+
+
+def test_oldest_segments_are_removed(directory):
+    sink = BufferedFileSink(
+        directory, buffer_size=64, block_size=32, max_file_size=100, max_files=3
+    )
+
+    for i in range(100):
+        sink.emit(make_record(message="record", i=i))
+    sink.flush()
+
+    assert len(sink.segments()) == 3
+    assert not os.path.exists(sink.segment_path(0))
+    assert len(os.listdir(directory)) == 4  # three segments and the index
+
+
+def test_new_boot_starts_a_new_segment(directory):
+    first = BufferedFileSink(directory)
+    first.emit(make_record(level="ERROR", level_value=4, message="before reset"))
+
+    second = BufferedFileSink(directory)
+    second.emit(make_record(level="ERROR", level_value=4, message="after reset"))
+
+    assert list(second.segments()) == [0, 1]
+    assert [r["msg"] for r in decode_segments(second)] == [
+        "before reset",
+        "after reset",
+    ]
+
+
+def test_write_failures_drop_data(directory):
+    sink = BufferedFileSink(directory)
+    os.rename(directory, directory + ".gone")
+
+    sink.emit(make_record(level="ERROR", level_value=4, message="lost"))
+    assert sink.dropped_bytes > 0
+
+
+def test_index_tracks_segment_contents(directory):
+    sink = BufferedFileSink(directory)
+
+    sink.emit(LogRecord(100, "INFO", 2, "first", {}))
+    sink.emit(LogRecord(150, "WARNING", 3, "second", {}))
+
+    assert sink.segment_info(0) == [100, 150, (1 << 2) | (1 << 3), 2]
+
+
+def test_index_survives_reboot(directory):
+    sink = BufferedFileSink(directory, max_file_size=40, max_files=100)
+    for i in range(10):
+        sink.emit(LogRecord(100 + i, "INFO", 2, "record", {"i": i}))
+    sink.flush()
+    assert len(sink.segments()) > 2
+    saved = sink.segment_info(0)
+
+    rebooted = BufferedFileSink(directory, max_file_size=40, max_files=100)
+
+    assert rebooted.segment_info(0) == saved
+    # the last segment of the previous boot may have been written after its entry
+    assert rebooted.segment_info(rebooted.segments()[-2]) is None
+    assert rebooted.segment_info(rebooted.segments()[-1]) == [0, 0, 0, 0]
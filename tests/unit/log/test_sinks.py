@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock
+
+import pysquared.nvm.counter as counter
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.log.sinks import RadioSink, RingSink
+from pysquared.logger import Logger, LogLevel, LogRecord
+
+
+def make_logger(*sinks, log_level=LogLevel.NOTSET):
+    return Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)),
+        log_level=log_level,
+        sinks=list(sinks),
+    )
+
+
+def test_ring_sink_keeps_latest_records():
+    ring = RingSink(capacity=3)
+    logger = make_logger(ring)
+
+    for i in range(5):
+        logger.info("message", i=i)
+
+    entries = ring.entries()
+    assert len(entries) == 3
+    assert '"i": 2' in entries[0]
+    assert '"i": 4' in entries[2]
+
+    ring.clear()
+    assert ring.entries() == []
+
+
+def test_radio_sink_only_sends_errors():
+    radio_manager = MagicMock()
+    logger = make_logger(RadioSink(radio_manager))
+
+    logger.warning("Just a warning")
+    radio_manager.beacon_radio_message.assert_not_called()
+
+    logger.error("Sensor failed", OSError("Manually creating an OS Error"))
+    radio_manager.beacon_radio_message.assert_called_once()
+    sent = radio_manager.beacon_radio_message.call_args.args[0]
+    assert "Sensor failed" in sent
+    assert len(sent) <= 240
+
+
+def test_radio_sink_ignores_records_logged_while_sending():
+    radio_manager = MagicMock()
+    sink = RadioSink(radio_manager)
+    logger = make_logger(sink)
+
+    def beacon(msg):
+        logger.error("There was an error while beaconing", OSError("no radio"))
+
+    radio_manager.beacon_radio_message.side_effect = beacon
+
+    logger.error("Sensor failed", OSError("Manually creating an OS Error"))
+    radio_manager.beacon_radio_message.assert_called_once()
+
+
+def test_sink_emit_respects_level():
+    ring = RingSink(level=LogLevel.WARNING)
+    ring.emit(LogRecord(0, "INFO", LogLevel.INFO, "dropped", {}))
+    ring.emit(LogRecord(0, "WARNING", LogLevel.WARNING, "kept", {}))
+
+    assert len(ring.entries()) == 1
+    assert '"msg": "kept"' in ring.entries()[0]
+
+
+def test_radio_sink_skips_unlicensed_radio():
+    radio_manager = MagicMock(is_licensed=False)
+    logger = make_logger(RadioSink(radio_manager))
+
+    logger.error("Sensor failed", OSError("Manually creating an OS Error"))
+
+    radio_manager.beacon_radio_message.assert_not_called()
+    assert logger.get_error_count() == 1
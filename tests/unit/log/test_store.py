@@ -0,0 +1,113 @@
+import pytest
+
+from pysquared.log.binary import BinaryLogDecoder
+from pysquared.log.file_sink import BufferedFileSink
+from pysquared.log.store import encode_records, iter_records, query
+from pysquared.logger import JsonLogEncoder, LogLevel, LogRecord
+
+
+@pytest.fixture
+def sink(tmp_path):
+    sink = BufferedFileSink(str(tmp_path / "logs"), max_file_size=120, max_files=100)
+    levels = (("INFO", 2), ("WARNING", 3), ("ERROR", 4))
+    for i in range(30):
+        level, level_value = levels[i % 3]
+        sink.emit(LogRecord(1000 + i, level, level_value, "record", {"i": i}))
+    return sink
+
+
+def test_query_returns_everything_in_order(sink):
+    records = query(sink)
+
+    assert [r.kwargs["i"] for r in records] == list(range(30))
+    assert records[0].message == "record"
+    assert records[0].time == 1000
+
+
+def test_query_by_time_range(sink):
+    records = query(sink, start=1010, end=1014)
+
+    assert [r.time for r in records] == [1010, 1011, 1012, 1013, 1014]
+
+
+def test_query_by_level(sink):
+    records = query(sink, min_level=LogLevel.ERROR)
+
+    assert all(r.level == "ERROR" for r in records)
+    assert [r.kwargs["i"] for r in records] == list(range(2, 30, 3))
+
+
+def test_query_limit_keeps_newest(sink):
+    records = query(sink, limit=4)
+
+    assert [r.kwargs["i"] for r in records] == [26, 27, 28, 29]
+
+
+def test_query_skips_segments_ruled_out_by_index(sink, monkeypatch):
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    query(sink, start=1029)
+
+    segment_reads = [p for p in opened if p.endswith(".log")]
+    assert segment_reads == [sink.segment_path(sink.segments()[-1])]
+
+
+def test_query_scans_segments_with_unknown_index(sink):
+    sink.flush()
+    rebooted = BufferedFileSink(sink.directory, max_file_size=120, max_files=100)
+
+    records = query(rebooted, start=1029)
+
+    assert [r.kwargs["i"] for r in records] == [29]
+
+
+def test_query_requires_binary_segments(tmp_path):
+    sink = BufferedFileSink(str(tmp_path / "logs"), encoder=JsonLogEncoder())
+
+    with pytest.raises(ValueError):
+        query(sink)
+
+
+def test_encoded_results_decode_on_the_ground(sink):
+    data = b"".join(encode_records(query(sink, limit=2)))
+
+    decoded = BinaryLogDecoder().decode(data)
+    assert [(r["time"], r["level"], r["i"]) for r in decoded] == [
+        (1028, "WARNING", 28),
+        (1029, "ERROR", 29),
+    ]
+
+
+def test_iter_records_streams_oldest_first(sink):
+    records = iter_records(sink, start=1003)
+
+    assert next(records).kwargs["i"] == 3
+    assert [r.kwargs["i"] for r in records] == list(range(4, 30))
+
+
+def test_iter_records_limit_keeps_oldest(sink):
+    records = list(iter_records(sink, min_level=LogLevel.ERROR, limit=3))
+
+    assert [r.kwargs["i"] for r in records] == [2, 5, 8]
+
+
+def test_corrupted_segment_keeps_records_before_damage(sink):
+    sink.flush()
+    number = sink.segments()[0]
+    with open(sink.segment_path(number), "rb") as f:
+        data = f.read()
+    with open(sink.segment_path(number), "wb") as f:
+        f.write(data + b"\x7f\x00")
+
+    # records are kept up to the chunk holding the damage
+    records = query(sink, chunk_size=1)
+
+    assert [r.kwargs["i"] for r in records] == list(range(30))
+    assert len(list(iter_records(sink, chunk_size=1))) == 30
+    assert len(list(iter_records(sink))) < 30
@@ -0,0 +1,132 @@
+import pytest
+
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.nvm.cache import NVMCache
+from pysquared.nvm.counter import Counter
+from pysquared.nvm.flag import Flag
+
+
+class CountingByteArray(ByteArray):
+    def __init__(self, size: int = 1024) -> None:
+        super().__init__(size)
+        self.writes = []
+
+    def __setitem__(self, index, value) -> None:
+        self.writes.append(index)
+        super().__setitem__(index, value)
+
+
+def test_changes_stay_in_ram_until_commit():
+    datastore = CountingByteArray(size=32)
+    cache = NVMCache(datastore, size=17)
+    boot_count = Counter(0, cache)
+    softboot = Flag(16, 0, cache)
+
+    boot_count.increment()
+    softboot.toggle(True)
+
+    assert boot_count.get() == 1
+    assert softboot.get()
+    assert datastore.writes == []
+    assert cache.dirty
+
+
+def test_commit_writes_changed_span_once():
+    datastore = CountingByteArray(size=32)
+    cache = NVMCache(datastore, size=17)
+
+    Counter(0, cache).increment()
+    Counter(7, cache).increment()
+    Flag(16, 3, cache).toggle(True)
+
+    assert cache.commit()
+    assert datastore.writes == [slice(0, 17)]
+    assert datastore[0] == 1
+    assert datastore[7] == 1
+    assert datastore[16] == 0b00001000
+    assert not cache.dirty
+
+
+def test_commit_without_changes_writes_nothing():
+    datastore = CountingByteArray(size=32)
+    cache = NVMCache(datastore, size=17)
+
+    Flag(16, 0, cache).toggle(False)  # already clear
+
+    assert not cache.commit()
+    assert datastore.writes == []
+
+
+def test_window_offset_and_bounds():
+    datastore = ByteArray(size=32)
+    datastore[10] = 5
+    cache = NVMCache(datastore, start=8, size=4)
+
+    assert Counter(10, cache).get() == 5
+    with pytest.raises(IndexError):
+        cache[7]
+    with pytest.raises(IndexError):
+        cache[12] = 1
+
+    cache[8:10] = b"\x01\x02"
+    cache.commit()
+    assert datastore[8:11] == bytearray(b"\x01\x02\x05")
+
+
+def test_context_manager_commits():
+    datastore = CountingByteArray(size=32)
+    cache = NVMCache(datastore, size=17)
+
+    with cache:
+        Counter(0, cache).increment()
+        Counter(0, cache).increment()
+
+    assert datastore[0] == 2
+    assert len(datastore.writes) == 1
+
+
+def test_discard_reloads_datastore():
+    datastore = ByteArray(size=32)
+    cache = NVMCache(datastore, size=17)
+
+    Counter(0, cache).increment()
+    cache.discard()
+
+    assert Counter(0, cache).get() == 0
+    assert not cache.dirty
+
+
+def test_open_and_negative_slices():
+    datastore = ByteArray(size=16)
+    datastore[0:4] = b"\x01\x02\x03\x04"
+    cache = NVMCache(datastore, size=8)
+
+    assert cache[:4] == bytearray(b"\x01\x02\x03\x04")
+    assert cache[6:] == bytearray(2)
+    assert cache[-2:] == bytearray(2)
+    assert cache[3:3] == bytearray()
+
+    cache[:2] = b"\x09\x09"
+    cache[-1:] = b"\x07"
+    cache.commit()
+    assert datastore[0:8] == bytearray(b"\x09\x09\x03\x04\x00\x00\x00\x07")
+
+    with pytest.raises(ValueError):
+        cache[:2] = b"\x01"
+    with pytest.raises(ValueError):
+        cache[::2]
+
+
+def test_flags_sharing_a_byte_through_the_cache_keep_each_other():
+    datastore = ByteArray(size=32)
+    cache = NVMCache(datastore, size=32)
+    softboot = Flag(16, 0, cache)
+    fsk = Flag(16, 7, cache)
+
+    fsk.toggle(True)
+    cache.commit()
+    softboot.toggle(True)
+    cache.commit()
+
+    assert Flag(16, 7, datastore).get()
+    assert Flag(16, 0, datastore).get()
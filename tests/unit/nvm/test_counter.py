@@ -1,3 +1,5 @@
+import pytest
+
 import pysquared.nvm.counter as counter
 from mocks.circuitpython.byte_array import ByteArray
 
@@ -31,3 +33,92 @@ def test_writing_to_multiple_counters_in_same_datastore():
     count_2.increment()
     assert count_1.get() == 0
     assert count_2.get() == 1
+
+
+def test_wide_counter_counts_past_a_byte():
+    datastore = ByteArray(size=40)
+    count = counter.WideCounter(0, datastore, slots=8)
+    assert count.get() == 0
+
+    for _ in range(300):
+        count.increment()
+    assert count.get() == 300
+
+
+def test_wide_counter_rotates_slots():
+    datastore = ByteArray(size=40)
+    count = counter.WideCounter(0, datastore, slots=8)
+
+    written = set()
+    for _ in range(8):
+        before = bytearray(datastore.memory)
+        count.increment()
+        changed = [i for i in range(40) if datastore.memory[i] != before[i]]
+        written.add(min(changed) // 5)
+    assert written == set(range(8))
+
+
+def test_wide_counter_recovers_value_at_boot():
+    datastore = ByteArray(size=80)
+    count = counter.WideCounter(20, datastore, slots=4)
+    for _ in range(1000):
+        count.increment()
+
+    rebooted = counter.WideCounter(20, datastore, slots=4)
+    assert rebooted.get() == 1000
+
+    rebooted.increment()
+    assert counter.WideCounter(20, datastore, slots=4).get() == 1001
+
+
+def test_wide_counter_recovers_across_sequence_rollover():
+    datastore = ByteArray(size=40)
+    count = counter.WideCounter(0, datastore, slots=7)
+    for _ in range(256 * 3 + 5):
+        count.increment()
+
+    assert counter.WideCounter(0, datastore, slots=7).get() == 256 * 3 + 5
+
+
+def test_wide_counter_erased_region_reads_zero():
+    datastore = ByteArray(size=40)
+    datastore.memory[:] = b"\xff" * 40
+
+    count = counter.WideCounter(0, datastore, slots=8)
+    assert count.get() == 0
+    count.increment()
+    assert counter.WideCounter(0, datastore, slots=8).get() == 1
+
+
+def test_wide_counter_slot_bounds():
+    datastore = ByteArray(size=2000)
+    with pytest.raises(ValueError):
+        counter.WideCounter(0, datastore, slots=1)
+    with pytest.raises(ValueError):
+        counter.WideCounter(0, datastore, slots=256)
+
+
+def test_wide_counter_migrates_a_legacy_counter_once():
+    datastore = ByteArray(size=41)
+    legacy = counter.Counter(40, datastore)
+    datastore[40] = 17
+    count = counter.WideCounter(0, datastore, slots=8)
+
+    assert count.migrate(legacy)
+    assert count.get() == 17
+
+    count.increment()
+    datastore[40] = 3
+    assert not count.migrate(legacy)
+    assert count.get() == 18
+
+    # the value is read back from NVM after a reset
+    assert counter.WideCounter(0, datastore, slots=8).get() == 18
+
+
+def test_wide_counter_skips_an_empty_legacy_counter():
+    datastore = ByteArray(size=41)
+    count = counter.WideCounter(0, datastore, slots=8)
+
+    assert not count.migrate(counter.Counter(40, datastore))
+    assert count.get() == 0
@@ -1,7 +1,7 @@
 import pytest
 
 from mocks.circuitpython.byte_array import ByteArray
-from pysquared.nvm.flag import Flag
+from pysquared.nvm.flag import Flag, FlagSet
 
 
 @pytest.fixture
@@ -55,3 +55,67 @@ def test_edge_cases(setup_datastore):
     last_bit.toggle(True)
     assert setup_datastore[0] == 0b10000001
     assert last_bit.get()
+
+
+class CountingByteArray(ByteArray):
+    def __init__(self, size: int = 1024) -> None:
+        super().__init__(size)
+        self.reads = 0
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+
+def test_flag_set_reads_once():
+    datastore = CountingByteArray(size=17)
+    flags = FlagSet(
+        [
+            ("softboot", Flag(16, 0, datastore)),
+            ("brownout", Flag(16, 3, datastore)),
+            ("burned", Flag(16, 6, datastore)),
+        ]
+    )
+    datastore.memory[16] = 0b01001000
+
+    flags.read()
+    assert flags.as_dict() == {"softboot": False, "brownout": True, "burned": True}
+    assert flags.get("burned")
+    assert datastore.reads == 1
+
+
+def test_flag_set_snapshot_is_stable_until_read():
+    datastore = ByteArray(size=17)
+    softboot = Flag(16, 0, datastore)
+    flags = FlagSet([("softboot", softboot)]).read()
+
+    softboot.toggle(True)
+    assert not flags.get("softboot")
+    assert flags.read().get("softboot")
+
+
+def test_flag_set_telemetry_field():
+    datastore = ByteArray(size=17)
+    flags = FlagSet(
+        [("softboot", Flag(16, 0, datastore)), ("burned", Flag(16, 6, datastore))]
+    )
+    datastore.memory[16] = 0b01000000
+
+    assert flags.read().to_bytes() == b"\x02"
+    assert flags.from_bytes(b"\x02") == {"softboot": False, "burned": True}
+
+
+def test_flag_set_spanning_bytes_uses_two_byte_field():
+    datastore = ByteArray(size=4)
+    flags = FlagSet([(f"f{i}", Flag(i // 8, i % 8, datastore)) for i in range(10)])
+    datastore.memory[1] = 0b10
+
+    assert flags.read().to_bytes() == (1 << 9).to_bytes(2, "little")
+
+
+def test_flag_set_size_bounds():
+    datastore = ByteArray(size=4)
+    with pytest.raises(ValueError):
+        FlagSet([])
+    with pytest.raises(ValueError):
+        FlagSet([(f"f{i}", Flag(i // 8, i % 8, datastore)) for i in range(17)])
@@ -0,0 +1,118 @@
+import pytest
+
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.nvm.kvstore import KVStore
+
+
+class CountingByteArray(ByteArray):
+    def __init__(self, size: int = 1024) -> None:
+        super().__init__(size)
+        self.reads = 0
+        self.writes = 0
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+    def __setitem__(self, index, value) -> None:
+        self.writes += 1
+        super().__setitem__(index, value)
+
+
+def test_empty_region_loads_empty():
+    store = KVStore(ByteArray(size=256), 0, 256)
+
+    assert len(store) == 0
+    assert store.get("missing", 5) == 5
+    assert not store.load()
+
+
+def test_values_persist_across_loads():
+    datastore = ByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+
+    store.set("tca_ok", [0, 1, 4])
+    store.set("mode", "normal")
+    assert store.commit()
+
+    loaded = KVStore(datastore, 0, 256)
+    assert loaded.get("tca_ok") == [0, 1, 4]
+    assert loaded.get("mode") == "normal"
+    assert loaded.generation == 1
+
+
+def test_commits_alternate_banks_in_one_write():
+    datastore = CountingByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+
+    store.set("a", 1)
+    store.commit()
+    store.set("a", 2)
+    store.commit()
+
+    assert datastore.writes == 2
+    assert datastore.memory[0:2] == b"KV"
+    assert datastore.memory[128:130] == b"KV"
+
+
+def test_load_reads_once():
+    datastore = CountingByteArray(size=256)
+    KVStore(datastore, 0, 256)
+
+    assert datastore.reads == 1
+
+
+def test_commit_without_changes_writes_nothing():
+    datastore = CountingByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+    store.set("a", 1)
+    store.commit()
+
+    store.set("a", 1)
+    assert not store.commit()
+    assert datastore.writes == 1
+
+
+def test_torn_write_falls_back_to_previous_bank():
+    datastore = ByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+    store.set("count", 1)
+    store.commit()
+    store.set("count", 2)
+    store.commit()
+
+    # corrupt the newest bank, as if power failed mid write
+    datastore.memory[128 + 14] ^= 0xFF
+
+    loaded = KVStore(datastore, 0, 256)
+    assert loaded.get("count") == 1
+    assert loaded.generation == 1
+
+    # the next commit overwrites the damaged bank
+    loaded.set("count", 3)
+    loaded.commit()
+    assert KVStore(datastore, 0, 256).get("count") == 3
+
+
+def test_values_too_large_are_rejected():
+    store = KVStore(ByteArray(size=64), 0, 64)
+
+    store.set("blob", "x" * 100)
+    with pytest.raises(ValueError):
+        store.commit()
+
+
+def test_delete_and_clear():
+    datastore = ByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.commit()
+
+    store.delete("a")
+    store.commit()
+    assert KVStore(datastore, 0, 256).keys() == ["b"]
+
+    store.clear()
+    store.commit()
+    assert len(KVStore(datastore, 0, 256)) == 0
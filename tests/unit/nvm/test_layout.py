@@ -0,0 +1,115 @@
+import pytest
+
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.nvm import register
+from pysquared.nvm.layout import BITFLAGS, BYTES, FLOAT, U8, U16, U32, Field, Layout
+
+
+class CountingByteArray(ByteArray):
+    def __init__(self, size: int = 1024) -> None:
+        super().__init__(size)
+        self.reads = 0
+        self.writes = 0
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+    def __setitem__(self, index, value) -> None:
+        self.writes += 1
+        super().__setitem__(index, value)
+
+
+@pytest.fixture
+def layout():
+    return Layout(
+        Field("count", U8),
+        Field("total", U32),
+        Field("voltage", FLOAT),
+        Field("flags", BITFLAGS, bits={"armed": 0, "deployed": 9}),
+        Field("raw", BYTES, offset=20, size=3),
+        Field("short", U16),
+    )
+
+
+def test_offsets_are_assigned_in_order(layout):
+    assert layout.offset("count") == 0
+    assert layout.offset("total") == 1
+    assert layout.offset("voltage") == 5
+    assert layout.offset("flags") == 9
+    assert layout["flags"].size == 2
+    assert layout.offset("raw") == 20
+    assert layout.offset("short") == 23
+    assert (layout.start, layout.end) == (0, 25)
+
+
+def test_overlap_is_rejected():
+    with pytest.raises(ValueError):
+        Layout(Field("a", U32, offset=0), Field("b", U8, offset=3))
+
+
+def test_duplicate_names_are_rejected():
+    with pytest.raises(ValueError):
+        Layout(Field("a", U8), Field("a", U8))
+
+
+def test_invalid_fields_are_rejected():
+    with pytest.raises(ValueError):
+        Field("raw", BYTES)
+    with pytest.raises(ValueError):
+        Field("wide", BITFLAGS, bits={"too_high": 32})
+    with pytest.raises(ValueError):
+        Field("bad", 99)
+
+
+def test_get_and_set_single_fields(layout):
+    datastore = ByteArray(size=32)
+
+    layout.set(datastore, "total", 70000)
+    layout.set(datastore, "voltage", 3.5)
+    layout.set(datastore, "raw", b"abc")
+
+    assert layout.get(datastore, "total") == 70000
+    assert layout.get(datastore, "voltage") == 3.5
+    assert layout.get(datastore, "raw") == b"abc"
+    assert datastore[1:5] == bytearray((70000).to_bytes(4, "little"))
+
+
+def test_read_and_write_all_use_one_slice(layout):
+    datastore = CountingByteArray(size=32)
+
+    layout.write_all(datastore, {"count": 3, "short": 513, "flags": 1 << 9})
+    assert datastore.writes == 1
+
+    values = layout.read_all(datastore)
+    assert values["count"] == 3
+    assert values["short"] == 513
+    assert values["flags"] == 1 << 9
+    assert values["total"] == 0
+    assert datastore.reads == 2  # one for the write, one for the read
+
+
+def test_flags_from_layout(layout):
+    datastore = ByteArray(size=32)
+
+    deployed = layout.flag(datastore, "flags", "deployed")
+    deployed.toggle(True)
+
+    assert layout["flags"].masks["deployed"] == 1 << 9
+    assert layout.get(datastore, "flags") == 1 << 9
+    assert deployed.get()
+    assert not layout.flag(datastore, "flags", "armed").get()
+
+
+def test_satellite_layout_keeps_register_offsets():
+    assert register.BOOTCNT == 0
+    assert register.ERRORCNT == 7
+    assert register.FLAG == 16
+    assert register.LAYOUT["FLAG"].bits == {
+        "softboot": 0,
+        "brownout": 3,
+        "shtdwn": 5,
+        "burned": 6,
+        "fsk": 7,
+    }
+    assert register.CACHE_SIZE <= register.KVSTORE
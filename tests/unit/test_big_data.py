@@ -0,0 +1,93 @@
+from unittest.mock import MagicMock
+
+import pysquared.nvm.counter as counter
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.Big_Data import AllFaces
+from pysquared.log.sinks import RingSink
+from pysquared.logger import Logger
+from pysquared.tca_scan import TCAScanCache
+
+
+class FailingSensor:
+    @property
+    def temperature(self) -> float:
+        raise OSError("I2C read failed")
+
+
+def make_logger() -> tuple[Logger, RingSink]:
+    ring = RingSink()
+    return Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)), sinks=[ring]
+    ), ring
+
+
+def make_scan(cache: TCAScanCache):
+    scanned = []
+
+    def scan(channel: int) -> None:
+        scanned.append(channel)
+        cache.store(channel, [])
+
+    return scan, scanned
+
+
+def test_faces_missing_from_device_map_are_skipped():
+    tca = MagicMock()
+    logger, ring = make_logger()
+
+    faces = AllFaces(tca, logger, [[]] * 5)
+
+    for face in faces.faces:
+        assert not any(face.sensors.values())
+        assert face.devices == []
+    assert faces.failed_channels == set()
+    assert ring.entries() == []
+    tca.__getitem__.assert_not_called()
+
+
+def test_failed_face_read_rescans_only_that_channel():
+    tca = MagicMock()
+    logger, _ = make_logger()
+    cache = TCAScanCache()
+    for channel in range(5):
+        cache.store(channel, [])
+    faces = AllFaces(tca, logger, list(cache.addresses))
+    faces.faces[2].sensors["MCP"] = True
+    faces.faces[2].mcp = FailingSensor()
+
+    results = faces.face_test_all()
+    assert results[2] == [None, None]
+    assert faces.failed_channels == {2}
+
+    scan, scanned = make_scan(cache)
+    refreshed = []
+    faces.refresh(
+        lambda channel: cache.devices(channel, scan),
+        cache.invalidate,
+        lambda: refreshed.append(True),
+    )
+
+    assert scanned == [2]
+    assert len(refreshed) == 1
+    assert faces.failed_channels == set()
+    assert not faces.faces[2].sensors["MCP"]
+
+
+def test_refresh_with_fresh_maps_does_nothing():
+    tca = MagicMock()
+    logger, _ = make_logger()
+    cache = TCAScanCache()
+    for channel in range(5):
+        cache.store(channel, [])
+    faces = AllFaces(tca, logger, list(cache.addresses))
+
+    scan, scanned = make_scan(cache)
+    refreshed = []
+    faces.refresh(
+        lambda channel: cache.devices(channel, scan),
+        cache.invalidate,
+        lambda: refreshed.append(True),
+    )
+
+    assert scanned == []
+    assert refreshed == []
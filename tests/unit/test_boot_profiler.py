@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from pysquared.boot_profiler import BOOT_KEY, BootProfiler
+
+
+def test_records_duration_and_attempts():
+    profiler = BootProfiler()
+
+    with patch("pysquared.boot_profiler.time.monotonic_ns", side_effect=[0, 5000000]):
+        start = profiler.start()
+        profiler.record("IMU", start)
+
+    with patch(
+        "pysquared.boot_profiler.time.monotonic_ns", side_effect=[10000000, 13000000]
+    ):
+        start = profiler.start()
+        profiler.record("IMU", start, success=False)
+
+    assert profiler.entries() == [("IMU", 8, 2, False)]
+
+
+def test_entries_keep_first_recorded_order():
+    profiler = BootProfiler()
+    with patch("pysquared.boot_profiler.time.monotonic_ns", return_value=0):
+        for key in ("I2C0", "SPI0", "I2C0", "TCA"):
+            profiler.record(key, 0)
+
+    assert [entry[0] for entry in profiler.entries()] == ["I2C0", "SPI0", "TCA"]
+
+
+def test_table_is_compact():
+    profiler = BootProfiler()
+    with patch(
+        "pysquared.boot_profiler.time.monotonic_ns",
+        side_effect=[2000000, 3000000, 40000000, 41000000],
+    ):
+        profiler.record("I2C0", 0)
+        profiler.record("TCA", 0, success=False)
+        profiler.record("TCA", 0, success=False)
+        profiler.record("Face0", 0)
+
+    assert profiler.table() == "I2C0:2,TCA:43x2!,Face0:41"
+    assert profiler.total_ms() == 86
+
+
+def test_total_is_the_boot_entry_when_recorded():
+    profiler = BootProfiler()
+    with patch(
+        "pysquared.boot_profiler.time.monotonic_ns",
+        side_effect=[0, 2000000, 5000000, 10000000],
+    ):
+        boot_start = profiler.start()
+        profiler.record("I2C0", profiler.start())
+        profiler.record(BOOT_KEY, boot_start)
+
+    assert profiler.total_ms() == 10
+
+
+def test_reset():
+    profiler = BootProfiler()
+    profiler.record("IMU", profiler.start())
+    profiler.reset()
+
+    assert profiler.entries() == []
+    assert profiler.table() == ""
@@ -0,0 +1,255 @@
+import json
+import struct
+from binascii import crc32
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import pysquared.nvm.counter as counter
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.boot_profiler import BootProfiler
+from pysquared.cdh import MAX_QUERY_RECORDS, CommandDataHandler
+from pysquared.config.config import Config
+from pysquared.log.binary import BinaryLogDecoder
+from pysquared.log.file_sink import BufferedFileSink
+from pysquared.logger import Logger, LogRecord
+from pysquared.packet_manager import PacketManager
+from pysquared.packet_sender import PacketSender
+from pysquared.telemetry import Telemetry, decode
+
+CONFIG_PATH = "tests/unit/files/config.test.json"
+HEADER = b"\x00\x00\x00\x00"
+CODE = b"ABCD"
+
+
+def message(cmd: bytes, args: bytes = b"") -> bytes:
+    return HEADER + CODE + cmd + args
+
+
+@pytest.fixture
+def logger():
+    return Logger(error_counter=counter.Counter(0, ByteArray(size=8)))
+
+
+@pytest.fixture
+def radio_manager():
+    return MagicMock()
+
+
+@pytest.fixture
+def packets():
+    return []
+
+
+@pytest.fixture
+def packet_sender(logger, radio_manager, packets):
+    sender = PacketSender(logger, radio_manager, PacketManager(logger))
+
+    def send_packet_with_retry(packet, seq_num):
+        assert seq_num == len(packets)
+        packets.append(bytes(packet))
+        return True
+
+    sender.send_packet_with_retry = send_packet_with_retry
+    return sender
+
+
+@pytest.fixture
+def config():
+    return Config(CONFIG_PATH)
+
+
+@pytest.fixture
+def cdh(config, logger, radio_manager, packet_sender):
+    return CommandDataHandler(config, logger, radio_manager, packet_sender)
+
+
+@pytest.fixture
+def cubesat():
+    return SimpleNamespace(
+        log_sink=None, boot_profiler=BootProfiler(), telemetry=None, c_gs_resp=0
+    )
+
+
+def received(packet_sender, packets) -> bytes:
+    data = packet_sender.packet_manager.unpack_data(packets)
+    assert data is not None
+    return data
+
+
+def sent(radio_manager) -> list:
+    return [
+        c.args[0] if c.args else c.kwargs["data"]
+        for c in radio_manager.radio.send.call_args_list
+    ]
+
+
+def test_noop(cdh, cubesat, radio_manager):
+    cdh.message_handler(cubesat, message(b"\x8eb"))
+
+    radio_manager.radio.send.assert_not_called()
+
+
+def test_invalid_command(cdh, cubesat, radio_manager):
+    cdh.message_handler(cubesat, message(b"\x00\x00"))
+
+    assert sent(radio_manager) == [b"invalid cmd\x00\x00"]
+
+
+def test_bad_code_is_ignored(cdh, cubesat, radio_manager):
+    cdh.message_handler(cubesat, HEADER + b"WXYZ" + b"\x8eb")
+
+    radio_manager.radio.send.assert_not_called()
+
+
+def test_failing_command_reports_the_error(cdh, cubesat, radio_manager):
+    cdh.message_handler(cubesat, message(b"\x3c\x21", b"not json"))
+
+    assert len(sent(radio_manager)) == 1
+
+
+def test_query_logs(cdh, cubesat, tmp_path, packet_sender, packets):
+    sink = BufferedFileSink(str(tmp_path / "logs"), max_file_size=120)
+    for i in range(20):
+        sink.emit(LogRecord(1000 + i, "INFO", 2, "record", {"i": i}))
+    cubesat.log_sink = sink
+
+    args = struct.pack("<IIBBH", 1005, 1010, 0, 5, 0)
+    cdh.message_handler(cubesat, message(b"\x1c\x4c", args))
+
+    records = BinaryLogDecoder().decode(received(packet_sender, packets))
+    assert [r["i"] for r in records] == [5, 6, 7, 8, 9, 10]
+
+
+def test_query_logs_limit_is_capped(cdh, cubesat, tmp_path, packet_sender, packets):
+    sink = BufferedFileSink(str(tmp_path / "logs"))
+    for i in range(MAX_QUERY_RECORDS + 10):
+        sink.emit(LogRecord(1000 + i, "INFO", 2, "r", {}))
+    cubesat.log_sink = sink
+
+    args = struct.pack("<IIBBH", 0, 0xFFFFFFFF, 0, 5, 0)
+    cdh.message_handler(cubesat, message(b"\x1c\x4c", args))
+
+    records = BinaryLogDecoder().decode(received(packet_sender, packets))
+    assert len(records) == MAX_QUERY_RECORDS
+    assert records[0]["time"] == 1000
+
+
+def test_query_logs_without_store(cdh, cubesat, radio_manager):
+    args = struct.pack("<IIBBH", 0, 10, 0, 5, 0)
+    cdh.message_handler(cubesat, message(b"\x1c\x4c", args))
+
+    assert sent(radio_manager) == [b"no log store"]
+
+
+def test_set_config(cdh, cubesat, config, radio_manager):
+    args = json.dumps(["sleep_duration", 42]).encode()
+    cdh.message_handler(cubesat, message(b"\x3c\x21", args))
+
+    assert config.sleep_duration == 42
+    assert sent(radio_manager) == ["sleep_duration=42"]
+
+
+def test_boot_profile(cdh, cubesat, radio_manager):
+    cubesat.boot_profiler.record("imu", cubesat.boot_profiler.start())
+
+    cdh.message_handler(cubesat, message(b"\x42\x50"))
+
+    assert sent(radio_manager) == [cubesat.boot_profiler.table()]
+
+
+def test_downlink_telemetry(cdh, cubesat, packet_sender, packets):
+    cubesat.telemetry = Telemetry(["battery_voltage"], clock=lambda: 5)
+    cubesat.telemetry.record("battery_voltage", 7.5)
+
+    cdh.message_handler(cubesat, message(b"\x54\x4d", b"\x00battery_voltage"))
+
+    name, tier, period, entries = decode(received(packet_sender, packets))
+    assert (name, tier, period) == ("battery_voltage", 0, 1)
+
+
+def test_downlink_file(cdh, cubesat, tmp_path, packet_sender, packets):
+    path = tmp_path / "data.bin"
+    data = bytes(range(256)) * 2
+    path.write_bytes(data)
+
+    args = struct.pack("<II", 10, 300) + str(path).encode()
+    cdh.message_handler(cubesat, message(b"\x46\x44", args))
+
+    assert received(packet_sender, packets) == data[10:310]
+
+
+def test_file_checksum(cdh, cubesat, tmp_path, radio_manager):
+    path = tmp_path / "data.bin"
+    data = b"checksum me" * 50
+    path.write_bytes(data)
+
+    args = struct.pack("<II", 0, 0) + str(path).encode()
+    cdh.message_handler(cubesat, message(b"\x46\x43", args))
+
+    assert sent(radio_manager) == [f"{path} {crc32(data):08x}"]
+
+
+def test_file_checksum_reports_progress(cdh, cubesat, tmp_path, packet_sender):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(2048))
+    calls = []
+    packet_sender.progress = lambda: calls.append(1)
+
+    args = struct.pack("<II", 0, 0) + str(path).encode()
+    cdh.message_handler(cubesat, message(b"\x46\x43", args))
+
+    assert len(calls) == 4
+
+
+def test_changed_code_applies_to_the_next_message(cdh, cubesat, config, radio_manager):
+    config.set("super_secret_code", "WXYZ")
+
+    cdh.message_handler(cubesat, message(b"\x00\x00"))
+    radio_manager.radio.send.assert_not_called()
+
+    cdh.message_handler(cubesat, HEADER + b"WXYZ" + b"\x00\x00")
+    assert sent(radio_manager) == [b"invalid cmd\x00\x00"]
+
+
+def test_tracebacks(cdh, cubesat, logger, packet_sender, packets):
+    try:
+        raise ValueError("sensor fell off")
+    except ValueError as e:
+        logger.error("Sensor read failed", e)
+
+    cdh.message_handler(cubesat, message(b"\x54\x42"))
+
+    text = received(packet_sender, packets).decode("utf-8")
+    assert "Sensor read failed" in text
+    assert "ValueError: sensor fell off" in text
+
+
+def test_tracebacks_without_errors(cdh, cubesat, radio_manager):
+    cdh.message_handler(cubesat, message(b"\x54\x42"))
+
+    assert sent(radio_manager) == [b"no tracebacks"]
+
+
+def test_repeated_listens_do_not_add_subscribers(cdh, cubesat, config):
+    # functions.listen hands every received message to the same handler
+    subscribers = {key: len(value) for key, value in config._subscribers.items()}
+
+    for _ in range(100):
+        cdh.message_handler(cubesat, message(b"\x8eb"))
+
+    assert {
+        key: len(value) for key, value in config._subscribers.items()
+    } == subscribers
+    assert len(config._subscribers["super_secret_code"]) == 1
+
+
+def test_hreset_resets_even_if_the_radio_fails(cdh, radio_manager):
+    radio_manager.radio.send.side_effect = OSError("radio down")
+    cubesat = MagicMock()
+
+    cdh.message_handler(cubesat, message(b"\xd4\x9f"))
+
+    cubesat.prepare_reset.assert_called_once()
+    cubesat.micro.reset.assert_called_once()
@@ -1,7 +1,15 @@
 import json
 import os
+import random
+import shutil
 
+import pytest
+
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.config.compiled import StringTable, compile_config, read_compiled
 from pysquared.config.config import Config
+from pysquared.config.radio import RADIO_KEYS, RadioConfig
+from pysquared.nvm.kvstore import KVStore
 
 os.path.dirname(__file__)
 file = f"{os.path.dirname(__file__)}/files/config.test.json"
@@ -143,3 +151,204 @@ def test_bools() -> None:
     assert config.orpheus == json_data["orpheus"], "No match for: orpheus"
     assert config.is_licensed == json_data["is_licensed"], "No match for: is_licensed"
     assert config.turbo_clock == json_data["turbo_clock"], "No match for: turbo_clock"
+
+
+def test_compiled_config_matches_json(tmp_path) -> None:
+    with open(file, "r") as f:
+        json_data = json.loads(f.read())
+
+    compiled = str(tmp_path / "config.bin")
+    config = Config(file, compiled)
+
+    assert os.path.exists(compiled)
+    assert isinstance(config.jokes, StringTable)
+    assert list(config.jokes) == json_data["jokes"]
+    assert list(config.joke_reply) == json_data["joke_reply"]
+    assert config.jokes[-1] == json_data["jokes"][-1]
+    assert random.choice(config.joke_reply) in json_data["joke_reply"]
+    assert config.cubesat_name == json_data["cubesat_name"]
+    assert (
+        config.radio.lora.spreading_factor
+        == (json_data["radio"]["lora"]["spreading_factor"])
+    )
+
+
+def test_compiled_config_is_reused_until_source_changes(tmp_path) -> None:
+    source = tmp_path / "config.json"
+    shutil.copy(file, source)
+    compiled = str(tmp_path / "config.bin")
+
+    Config(str(source), compiled)
+    compiled_time = os.stat(compiled).st_mtime_ns
+    Config(str(source), compiled)
+    assert os.stat(compiled).st_mtime_ns == compiled_time
+
+    json_data = json.loads(source.read_text())
+    json_data["cubesat_name"] = "Renamed"
+    source.write_text(json.dumps(json_data))
+
+    assert Config(str(source), compiled).cubesat_name == "Renamed"
+
+
+def test_damaged_compiled_config_is_rebuilt(tmp_path) -> None:
+    compiled = tmp_path / "config.bin"
+    compiled.write_bytes(b"garbage")
+
+    config = Config(file, str(compiled))
+
+    assert len(config.jokes) > 0
+    assert compiled.read_bytes()[:4] == b"PSC1"
+
+
+def test_truncated_compiled_config_is_rebuilt(tmp_path) -> None:
+    compiled = tmp_path / "config.bin"
+    compile_config(file, str(compiled))
+    data = compiled.read_bytes()
+    assert not (tmp_path / "config.bin.tmp").exists()
+
+    # a reset while writing leaves a file with a valid header and stamp
+    for length in (len(data) - 1, len(data) // 2, 30):
+        compiled.write_bytes(data[:length])
+        assert read_compiled(str(compiled), file) is None
+
+        config = Config(file, str(compiled))
+        assert len(config.jokes) > 0
+        assert compiled.read_bytes() == data
+
+
+def test_unwritable_compiled_config_falls_back_to_json(tmp_path) -> None:
+    compiled = str(tmp_path / "missing_dir" / "config.bin")
+
+    config = Config(file, compiled)
+
+    assert isinstance(config.jokes, list)
+
+
+def test_string_table_bounds(tmp_path) -> None:
+    compiled = str(tmp_path / "config.bin")
+    compile_config(file, compiled)
+    jokes = read_compiled(compiled)["jokes"]
+
+    with pytest.raises(IndexError):
+        jokes[len(jokes)]
+
+
+def test_set_notifies_subscribers() -> None:
+    config = Config(file)
+    changes = []
+    config.subscribe("sleep_duration", lambda key, value: changes.append((key, value)))
+
+    config.set("sleep_duration", 90)
+
+    assert config.sleep_duration == 90
+    assert config.get("sleep_duration") == 90
+    assert changes == [("sleep_duration", 90)]
+
+
+def test_set_nested_radio_value() -> None:
+    config = Config(file)
+
+    config.set("radio.lora.transmit_power", 20)
+
+    assert config.radio.lora.transmit_power == 20
+
+
+def test_set_rejects_unknown_keys_and_wrong_types() -> None:
+    config = Config(file)
+
+    with pytest.raises(KeyError):
+        config.set("not_a_setting", 1)
+    with pytest.raises(KeyError):
+        config.subscribe("radio.nothing.here", print)
+    with pytest.raises(TypeError):
+        config.set("sleep_duration", "long")
+    with pytest.raises(TypeError):
+        config.set("heating", 1)
+
+    config.set("normal_charge_current", 1)
+    assert config.normal_charge_current == 1.0
+
+
+def test_permanent_overrides_apply_at_boot() -> None:
+    store = KVStore(ByteArray(size=512), 0, 512)
+    config = Config(file, overrides=store)
+
+    config.set("sleep_duration", 45, permanent=True)
+    config.set("reboot_time", 100)
+
+    rebooted = Config(file, overrides=KVStore(store._datastore, 0, 512))
+    assert rebooted.sleep_duration == 45
+    assert rebooted.reboot_time == Config(file).reboot_time
+
+    rebooted.clear_override("sleep_duration")
+    assert (
+        Config(file, overrides=KVStore(store._datastore, 0, 512)).sleep_duration
+        == Config(file).sleep_duration
+    )
+
+
+def test_permanent_set_needs_a_store() -> None:
+    config = Config(file)
+
+    with pytest.raises(ValueError):
+        config.set("sleep_duration", 45, permanent=True)
+
+
+def test_radio_values_are_range_checked() -> None:
+    config = Config(file)
+
+    with pytest.raises(ValueError):
+        config.set("radio.lora.transmit_power", 40)
+    with pytest.raises(ValueError):
+        config.set("radio.lora.spreading_factor", 5)
+    assert config.radio.lora.transmit_power == Config(file).radio.lora.transmit_power
+
+    with open(file, "r") as f:
+        json_data = json.loads(f.read())
+    json_data["radio"]["lora"]["coding_rate"] = 9
+    with pytest.raises(ValueError):
+        RadioConfig(json_data["radio"])
+
+
+def test_subscribers_are_notified_when_storing_fails() -> None:
+    store = KVStore(ByteArray(size=512), 0, 512)
+    config = Config(file, overrides=store)
+    changes = []
+    config.subscribe("sleep_duration", lambda key, value: changes.append(value))
+
+    def commit():
+        raise OSError("write failed")
+
+    store.commit = commit
+    with pytest.raises(OSError):
+        config.set("sleep_duration", 45, permanent=True)
+
+    assert config.sleep_duration == 45
+    assert changes == [45]
+
+
+def test_unsubscribe() -> None:
+    config = Config(file)
+    changes = []
+
+    def callback(key, value):
+        changes.append(value)
+
+    config.subscribe("sleep_duration", callback)
+    config.unsubscribe("sleep_duration", callback)
+    config.unsubscribe("sleep_duration", callback)
+    config.set("sleep_duration", 90)
+
+    assert changes == []
+
+
+def test_radio_keys_can_be_subscribed() -> None:
+    config = Config(file)
+    changes = []
+    for key in RADIO_KEYS:
+        config.subscribe(key, lambda key, value: changes.append(key))
+
+    config.set("radio.lora.spreading_factor", 9)
+    config.set("radio.transmit_frequency", 915.0)
+
+    assert changes == ["radio.lora.spreading_factor", "radio.transmit_frequency"]
@@ -0,0 +1,71 @@
+from binascii import crc32
+
+import pytest
+
+from pysquared.file_reader import copy_file, file_crc32, file_size, read_chunks
+
+DATA = bytes(range(256)) * 5  # 1280 bytes
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    return str(path)
+
+
+def test_reads_whole_file_in_chunks(data_file):
+    sizes = []
+    data = bytearray()
+    for chunk in read_chunks(data_file, chunk_size=512):
+        assert isinstance(chunk, memoryview)
+        sizes.append(len(chunk))
+        data.extend(chunk)
+
+    assert sizes == [512, 512, 256]
+    assert bytes(data) == DATA
+
+
+def test_reuses_one_buffer(data_file):
+    buffer = bytearray(100)
+    for chunk in read_chunks(data_file, buffer=buffer):
+        assert chunk.obj is buffer
+
+
+def test_offset_and_length(data_file):
+    chunks = [bytes(c) for c in read_chunks(data_file, 64, offset=300, length=150)]
+
+    assert [len(c) for c in chunks] == [64, 64, 22]
+    assert b"".join(chunks) == DATA[300:450]
+
+
+def test_length_past_end_of_file(data_file):
+    data = b"".join(bytes(c) for c in read_chunks(data_file, offset=1200, length=500))
+
+    assert data == DATA[1200:]
+
+
+def test_offset_past_end_of_file(data_file):
+    assert list(read_chunks(data_file, offset=5000)) == []
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(OSError):
+        list(read_chunks(str(tmp_path / "missing.bin")))
+
+
+def test_file_size(data_file):
+    assert file_size(data_file) == len(DATA)
+
+
+def test_file_crc32(data_file):
+    assert file_crc32(data_file, chunk_size=100) == crc32(DATA)
+    assert file_crc32(data_file, offset=10, length=20) == crc32(DATA[10:30])
+
+
+def test_copy_file(data_file, tmp_path):
+    destination = tmp_path / "copy.bin"
+    destination.write_bytes(b"old contents that are longer" * 100)
+
+    assert copy_file(data_file, str(destination), chunk_size=300) == len(DATA)
+    assert destination.read_bytes() == DATA
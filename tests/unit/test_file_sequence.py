@@ -0,0 +1,82 @@
+import json
+
+from pysquared.file_sequence import SEQUENCE_FILE, FileSequence
+
+
+def touch(path):
+    with open(path, "w"):
+        pass
+
+
+def test_first_file_starts_at_zero(tmp_path):
+    sequence = FileSequence(str(tmp_path))
+
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_00000.txt"
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_00001.txt"
+
+
+def test_sequence_persisted(tmp_path):
+    FileSequence(str(tmp_path)).next_path("DATA_", "txt")
+
+    with open(tmp_path / SEQUENCE_FILE) as f:
+        assert json.load(f) == {"DATA_.txt": 1}
+
+    sequence = FileSequence(str(tmp_path))
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_00001.txt"
+    assert sequence.recoveries == 0
+
+
+def test_trailing_slash(tmp_path):
+    sequence = FileSequence(str(tmp_path) + "/")
+
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_00000.txt"
+
+
+def test_recovers_from_directory_listing(tmp_path):
+    touch(tmp_path / "DATA_00000.txt")
+    touch(tmp_path / "DATA_00007.txt")
+    touch(tmp_path / "DATA_00042.bin")
+    touch(tmp_path / "OTHER00099.txt")
+    touch(tmp_path / "DATA_notes.txt")
+
+    sequence = FileSequence(str(tmp_path))
+
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_00008.txt"
+    assert sequence.next_path("DATA_", "bin") == f"{tmp_path}/DATA_00043.bin"
+    assert sequence.recoveries == 2
+
+    sequence.next_path("DATA_", "txt")
+    assert sequence.recoveries == 2
+
+
+def test_damaged_sequence_file_recovers(tmp_path):
+    touch(tmp_path / "DATA_00003.txt")
+    with open(tmp_path / SEQUENCE_FILE, "w") as f:
+        f.write("{not json")
+
+    sequence = FileSequence(str(tmp_path))
+
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_00004.txt"
+    assert sequence.recoveries == 1
+
+
+def test_stale_sequence_skips_existing_files(tmp_path):
+    with open(tmp_path / SEQUENCE_FILE, "w") as f:
+        json.dump({"DATA_.txt": 2}, f)
+    touch(tmp_path / "DATA_00002.txt")
+    touch(tmp_path / "DATA_00003.txt")
+
+    sequence = FileSequence(str(tmp_path))
+
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_00004.txt"
+    assert sequence.recoveries == 0
+
+
+def test_wraps_around(tmp_path):
+    with open(tmp_path / SEQUENCE_FILE, "w") as f:
+        json.dump({"DATA_.txt": 0xFFFE}, f)
+
+    sequence = FileSequence(str(tmp_path))
+
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_65534.txt"
+    assert sequence.next_path("DATA_", "txt") == f"{tmp_path}/DATA_00000.txt"
@@ -1,8 +1,11 @@
+from unittest.mock import patch
+
 import pytest
 
 import pysquared.nvm.counter as counter
 from mocks.circuitpython.byte_array import ByteArray
-from pysquared.logger import Logger, _color
+from pysquared.log.sinks import RingSink
+from pysquared.logger import Deferred, Logger, LogLevel, _color
 
 
 @pytest.fixture
@@ -153,6 +156,16 @@ def test_warning_log_color(capsys, logger_color):
     assert '"cube": "sat"' in captured.out
 
 
+def test_colorized_can_be_changed(capsys, logger):
+    logger.colorized = True
+    logger.info("This is a info message!!")
+    assert _color(msg="INFO", color="green") in capsys.readouterr().out
+
+    logger.colorized = False
+    logger.info("This is a info message!!")
+    assert _color(msg="INFO", color="green") not in capsys.readouterr().out
+
+
 def test_error_log_color(capsys, logger_color):
     logger_color.error(
         "This is an error message",
@@ -187,3 +200,232 @@ def test_critical_log_color(capsys, logger_color):
     assert '"soft": "ware"' in captured.out
     assert '"j": "20"' in captured.out
     assert '"config": "king"' in captured.out
+
+
+def test_filtered_level_skips_formatting(capsys):
+    datastore = ByteArray(size=8)
+    count = counter.Counter(0, datastore)
+    logger = Logger(error_counter=count, log_level=LogLevel.INFO)
+
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        return "value"
+
+    logger.debug("This is a debug message", lazy=Deferred(expensive))
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert calls == []
+    assert not logger.is_enabled_for(LogLevel.DEBUG)
+    assert logger.is_enabled_for(LogLevel.INFO)
+
+
+def test_deferred_value_is_resolved(capsys, logger):
+    logger.info(
+        "Created header", header=Deferred(lambda b: [hex(x) for x in b], b"\x01\x02")
+    )
+    captured = capsys.readouterr()
+    assert '"header": ["0x1", "0x2"]' in captured.out
+
+
+def test_filtered_error_still_counts(capsys):
+    datastore = ByteArray(size=8)
+    count = counter.Counter(0, datastore)
+    logger = Logger(error_counter=count, log_level=LogLevel.CRITICAL)
+
+    logger.error("This is an error message", OSError("Manually creating an OS Error"))
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert logger.get_error_count() == 1
+
+
+def test_set_error_counter(capsys, logger):
+    wide = counter.WideCounter(0, ByteArray(size=40), slots=8)
+    logger.set_error_counter(wide)
+
+    logger.error("This is an error message", OSError("Manually creating an OS Error"))
+
+    assert wide.get() == 1
+    assert logger.get_error_count() == 1
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, record):
+        self.calls += 1
+        return record.message
+
+
+def test_sinks_have_their_own_levels():
+    debug_ring = RingSink(level=LogLevel.DEBUG)
+    error_ring = RingSink(level=LogLevel.ERROR)
+    logger = Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)),
+        sinks=[debug_ring, error_ring],
+    )
+
+    logger.debug("debug message")
+    logger.error("error message", OSError("Manually creating an OS Error"))
+
+    assert len(debug_ring.entries()) == 2
+    assert len(error_ring.entries()) == 1
+    assert "error message" in error_ring.entries()[0]
+
+
+def test_records_are_encoded_once_per_encoder():
+    encoder = CountingEncoder()
+    first = RingSink(encoder=encoder)
+    second = RingSink(encoder=encoder)
+    logger = Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)), sinks=[first, second]
+    )
+
+    logger.info("shared")
+
+    assert encoder.calls == 1
+    assert first.entries() == second.entries() == ["shared"]
+
+
+def test_level_below_every_sink_is_skipped():
+    logger = Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)),
+        sinks=[RingSink(level=LogLevel.WARNING)],
+    )
+
+    assert not logger.is_enabled_for(LogLevel.INFO)
+    assert logger.is_enabled_for(LogLevel.WARNING)
+
+
+def test_add_and_remove_sink(capsys, logger):
+    ring = RingSink()
+    logger.add_sink(ring)
+    logger.info("to both")
+    logger.remove_sink(ring)
+    logger.info("console only")
+
+    assert len(ring.entries()) == 1
+    assert "console only" in capsys.readouterr().out
+
+
+def failing_sensor():
+    raise OSError("Manually creating an OS Error")
+
+
+def raise_and_log(logger, message="There was an error retrieving the gyro values"):
+    try:
+        failing_sensor()
+    except OSError as e:
+        logger.error(message, e)
+
+
+def test_repeated_errors_are_suppressed(capsys):
+    ring = RingSink()
+    logger = Logger(error_counter=counter.Counter(0, ByteArray(size=8)), sinks=[ring])
+
+    with patch("pysquared.logger.time.monotonic", return_value=100.0):
+        for _ in range(5):
+            raise_and_log(logger)
+
+    assert len(ring.entries()) == 1
+    assert logger.get_error_count() == 1
+
+    with patch("pysquared.logger.time.monotonic", return_value=200.0):
+        raise_and_log(logger)
+
+    assert len(ring.entries()) == 2
+    assert '"repeated": 4' in ring.entries()[1]
+    assert logger.get_error_count() == 2
+
+
+def test_distinct_errors_are_not_suppressed():
+    ring = RingSink()
+    logger = Logger(error_counter=counter.Counter(0, ByteArray(size=8)), sinks=[ring])
+
+    with patch("pysquared.logger.time.monotonic", return_value=100.0):
+        raise_and_log(logger, "gyro failed")
+        raise_and_log(logger, "accel failed")
+        logger.error("gyro failed", ValueError("different type"))
+
+    assert len(ring.entries()) == 3
+
+
+def test_flush_repeats_summarizes_finished_storms():
+    ring = RingSink()
+    logger = Logger(error_counter=counter.Counter(0, ByteArray(size=8)), sinks=[ring])
+
+    with patch("pysquared.logger.time.monotonic", return_value=100.0):
+        for _ in range(3):
+            raise_and_log(logger)
+        logger.flush_repeats()
+
+    assert len(ring.entries()) == 1
+
+    with patch("pysquared.logger.time.monotonic", return_value=200.0):
+        logger.flush_repeats()
+        logger.flush_repeats()
+
+    assert len(ring.entries()) == 2
+    assert '"repeated": 2' in ring.entries()[1]
+    assert '"err_type": "OSError"' in ring.entries()[1]
+    assert "test_logger.py" in ring.entries()[1]
+
+
+def test_suppression_can_be_disabled():
+    ring = RingSink()
+    logger = Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)),
+        sinks=[ring],
+        suppression_window=0,
+    )
+
+    for _ in range(3):
+        raise_and_log(logger)
+
+    assert len(ring.entries()) == 3
+    assert logger.get_error_count() == 3
+
+
+def test_error_logs_compact_signature():
+    ring = RingSink()
+    logger = Logger(error_counter=counter.Counter(0, ByteArray(size=8)), sinks=[ring])
+
+    raise_and_log(logger)
+
+    entry = ring.entries()[0]
+    assert "OSError: Manually creating an OS Error (" in entry
+    assert "test_logger.py:" in entry
+    assert "Traceback" not in entry
+
+
+def test_full_tracebacks_can_be_enabled():
+    ring = RingSink()
+    logger = Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)),
+        sinks=[ring],
+        full_tracebacks=True,
+    )
+
+    raise_and_log(logger)
+
+    assert "Traceback" in ring.entries()[0]
+
+
+def test_recent_tracebacks_are_bounded():
+    logger = Logger(
+        error_counter=counter.Counter(0, ByteArray(size=8)),
+        sinks=[],
+        max_recent_errors=2,
+    )
+
+    for i in range(3):
+        raise_and_log(logger, f"error {i}")
+
+    tracebacks = logger.get_recent_tracebacks()
+    assert len(tracebacks) == 2
+    assert "error 1" in tracebacks[0]
+    assert "error 2" in tracebacks[1]
+    assert "Traceback" in tracebacks[1]
+    assert "failing_sensor" in tracebacks[1]
@@ -0,0 +1,259 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+import pysquared.nvm.counter as counter
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.log.sinks import RingSink
+from pysquared.logger import Logger
+from pysquared.scheduler import Scheduler
+from pysquared.watchdog import Watchdog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePin:
+    value = False
+
+
+def make_scheduler(watchdog=False):
+    ring = RingSink(capacity=20)
+    logger = Logger(error_counter=counter.Counter(0, ByteArray(size=8)), sinks=[ring])
+    clock = FakeClock()
+    dog = Watchdog(FakePin(), logger, clock) if watchdog else None
+    return Scheduler(logger, dog, clock), clock, ring, dog
+
+
+def run_pending(scheduler):
+    return asyncio.run(scheduler.run_pending())
+
+
+def test_runs_due_tasks_by_priority():
+    scheduler, _, _, _ = make_scheduler()
+    order = []
+    scheduler.add("low", lambda: order.append("low"), 10, priority=1)
+    scheduler.add("high", lambda: order.append("high"), 10, priority=5)
+    scheduler.add("later", lambda: order.append("later"), 10, priority=9, delay=5)
+
+    assert run_pending(scheduler) == 2
+    assert order == ["high", "low"]
+
+
+def test_periods():
+    scheduler, clock, _, _ = make_scheduler()
+    runs = []
+    scheduler.add("fast", lambda: runs.append(("fast", clock.now)), 2)
+    scheduler.add("slow", lambda: runs.append(("slow", clock.now)), 5)
+
+    for now in range(0, 11):
+        clock.now = now
+        run_pending(scheduler)
+
+    assert [t for name, t in runs if name == "fast"] == [0, 2, 4, 6, 8, 10]
+    assert [t for name, t in runs if name == "slow"] == [0, 5, 10]
+    assert scheduler.get("fast").runs == 6
+
+
+def test_next_due():
+    scheduler, clock, _, _ = make_scheduler()
+    assert scheduler.next_due() is None
+
+    scheduler.add("a", lambda: None, 10, delay=3)
+    scheduler.add("b", lambda: None, 10, delay=7)
+    assert scheduler.next_due() == 3
+
+    clock.now = 4
+    assert scheduler.next_due() == 0
+
+
+def test_missed_deadline_skips_behind_runs():
+    scheduler, clock, ring, _ = make_scheduler()
+    task = scheduler.add("a", lambda: None, 10, deadline=2)
+
+    clock.now = 1
+    run_pending(scheduler)
+    assert task.missed == 0
+    assert task.next_run == 10
+
+    clock.now = 35
+    run_pending(scheduler)
+    assert task.missed == 1
+    assert task.next_run == 45
+    assert "missed its deadline" in ring.entries()[-1]
+
+
+def test_coroutine_tasks():
+    scheduler, _, _, _ = make_scheduler()
+    done = []
+
+    async def work():
+        await asyncio.sleep(0)
+        done.append(True)
+
+    scheduler.add("async", work, 1)
+    run_pending(scheduler)
+
+    assert done == [True]
+
+
+def test_failing_task_is_logged_and_rescheduled():
+    scheduler, clock, ring, _ = make_scheduler()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    task = scheduler.add("fail", fail, 5)
+    run_pending(scheduler)
+
+    assert task.errors == 1
+    assert task.runs == 0
+    assert task.next_run == 5
+    assert "Scheduled task failed" in ring.entries()[-1]
+
+
+def test_invalid_tasks():
+    scheduler, _, _, _ = make_scheduler()
+    scheduler.add("a", lambda: None, 1)
+
+    with pytest.raises(ValueError):
+        scheduler.add("a", lambda: None, 1)
+    with pytest.raises(ValueError):
+        scheduler.add("b", lambda: None, 0)
+
+
+def test_watched_tasks_check_in():
+    scheduler, clock, _, watchdog = make_scheduler(watchdog=True)
+
+    def fail():
+        raise RuntimeError("stuck")
+
+    scheduler.add("good", lambda: None, 10, deadline=5)
+    scheduler.add("pet", watchdog.pet, 1, watch=False)
+
+    for now in range(0, 30):
+        clock.now = now
+        run_pending(scheduler)
+    assert watchdog.stalled() == []
+
+    scheduler.add("bad", fail, 10, deadline=5)
+    for now in range(30, 50):
+        clock.now = now
+        run_pending(scheduler)
+
+    assert watchdog.stalled() == ["bad"]
+    assert not watchdog.pet()
+
+
+def test_run_until_stopped():
+    logger = Logger(error_counter=counter.Counter(0, ByteArray(size=8)))
+    scheduler = Scheduler(logger)
+    calls = []
+
+    def work():
+        calls.append(True)
+        if len(calls) == 3:
+            scheduler.stop()
+
+    scheduler.add("work", work, 0.01)
+    asyncio.run(asyncio.wait_for(scheduler.run(), 1))
+
+    assert len(calls) == 3
+
+
+def test_watchdog_task_runs_next_to_the_scheduler():
+    logger = Logger(error_counter=counter.Counter(0, ByteArray(size=8)))
+    watchdog = Watchdog(FakePin(), logger)
+    scheduler = Scheduler(logger, watchdog)
+    calls = []
+
+    def work():
+        calls.append(True)
+        if len(calls) == 5:
+            scheduler.stop()
+
+    scheduler.add("work", work, 0.02)
+
+    async def flight_loop():
+        watchdog_task = asyncio.create_task(
+            watchdog.run(interval=0.005, pulse_width=0.001)
+        )
+        try:
+            await scheduler.run()
+        finally:
+            watchdog_task.cancel()
+
+    asyncio.run(asyncio.wait_for(flight_loop(), 1))
+
+    assert len(calls) == 5
+    assert watchdog.pets > 0
+
+
+def long_listen(scheduler, clock, watchdog, pets, report_progress):
+    # a command downlinking packets for 60 s, each packet feeding the watchdog
+    def listen():
+        for _ in range(30):
+            clock.now += 2
+            if report_progress:
+                scheduler.check_in()
+            pets.append(watchdog.pet())
+
+    return listen
+
+
+@pytest.mark.parametrize("report_progress", [True, False])
+def test_long_listen_checks_in_while_running(report_progress):
+    scheduler, clock, _, watchdog = make_scheduler(watchdog=True)
+    pets = []
+    scheduler.add(
+        "listen",
+        long_listen(scheduler, clock, watchdog, pets, report_progress),
+        4,
+        deadline=4,
+    )
+
+    run_pending(scheduler)
+
+    if report_progress:
+        assert all(pets)
+        assert watchdog.stalled() == []
+    else:
+        # without check ins the task looks stalled once it runs past its timeout
+        assert not all(pets)
+    assert scheduler.current is None
+
+
+def test_check_in_outside_a_run_is_ignored():
+    scheduler, clock, _, watchdog = make_scheduler(watchdog=True)
+    scheduler.add("listen", lambda: None, 4, deadline=4)
+
+    clock.now = 20
+    scheduler.check_in()
+
+    assert watchdog.stalled() == ["listen"]
+
+
+def test_scheduled_flush_reports_finished_error_storms():
+    scheduler, clock, ring, _ = make_scheduler()
+    logger = scheduler._logger
+    scheduler.add("flush_repeats", logger.flush_repeats, 10, deadline=100)
+
+    with patch("pysquared.logger.time.monotonic", return_value=100.0):
+        for _ in range(3):
+            logger.error("Sensor failed", OSError("no sensor"))
+        run_pending(scheduler)
+    assert len(ring.entries()) == 1
+
+    # the storm stopped, its window closes before the next scheduled flush
+    clock.now = 70
+    with patch("pysquared.logger.time.monotonic", return_value=170.0):
+        run_pending(scheduler)
+
+    assert len(ring.entries()) == 2
+    assert '"repeated": 2' in ring.entries()[1]
@@ -0,0 +1,76 @@
+from pysquared.sensor_cache import SensorCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSensor:
+    def __init__(self, values) -> None:
+        self.values = list(values)
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        return self.values.pop(0)
+
+
+def test_fresh_reading_is_served_from_cache():
+    clock = FakeClock()
+    cache = SensorCache(clock)
+    sensor = FakeSensor([(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)])
+
+    assert cache.read("gyro", sensor, max_age=1.0) == (1.0, 2.0, 3.0)
+    clock.now += 0.5
+    assert cache.read("gyro", sensor, max_age=1.0) == (1.0, 2.0, 3.0)
+
+    assert sensor.reads == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.age("gyro") == 0.5
+
+
+def test_stale_reading_reads_again():
+    clock = FakeClock()
+    cache = SensorCache(clock)
+    sensor = FakeSensor([20.0, 21.0])
+
+    cache.read("temp", sensor, max_age=1.0)
+    clock.now += 2.0
+
+    assert cache.read("temp", sensor, max_age=1.0) == 21.0
+    assert cache.get("temp") == (102.0, 21.0)
+
+
+def test_zero_max_age_always_reads():
+    cache = SensorCache(FakeClock())
+    sensor = FakeSensor([1, 2])
+
+    cache.read("mag", sensor)
+    assert cache.read("mag", sensor) == 2
+    assert sensor.reads == 2
+
+
+def test_failed_reads_are_not_cached():
+    cache = SensorCache(FakeClock())
+    sensor = FakeSensor([None, 7])
+
+    assert cache.read("accel", sensor, max_age=10.0) is None
+    assert cache.get("accel") is None
+    assert cache.read("accel", sensor, max_age=10.0) == 7
+
+
+def test_invalidate():
+    cache = SensorCache(FakeClock())
+    cache.read("a", lambda: 1)
+    cache.read("b", lambda: 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+    cache.invalidate()
+    assert cache.age("b") is None
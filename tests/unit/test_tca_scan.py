@@ -0,0 +1,67 @@
+from pysquared.tca_scan import TCAScanCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def scanner(cache: TCAScanCache, found: list):
+    scanned = []
+
+    def scan(channel: int) -> None:
+        scanned.append(channel)
+        cache.store(channel, found[channel])
+
+    return scan, scanned
+
+
+def test_unscanned_channel_is_scanned():
+    cache = TCAScanCache(clock=FakeClock())
+    scan, scanned = scanner(cache, [[0x1B, 0x10]] * 5)
+
+    assert cache.devices(1, scan) == [0x1B, 0x10]
+    assert scanned == [1]
+
+
+def test_fresh_map_is_not_rescanned():
+    clock = FakeClock()
+    cache = TCAScanCache(rescan_interval=60.0, clock=clock)
+    scan, scanned = scanner(cache, [[0x1B]] * 5)
+    cache.store(3, [0x1B, 0x10])
+
+    clock.now += 59.0
+    assert cache.devices(3, scan) == [0x1B, 0x10]
+    assert scanned == []
+
+    clock.now += 1.0
+    assert cache.devices(3, scan) == [0x1B]
+    assert scanned == [3]
+
+
+def test_invalidate_rescans_only_that_channel():
+    cache = TCAScanCache(clock=FakeClock())
+    for channel in range(5):
+        cache.store(channel, [0x1B])
+    scan, scanned = scanner(cache, [[0x10]] * 5)
+
+    cache.invalidate(2)
+
+    assert [cache.devices(channel, scan) for channel in range(5)] == [
+        [0x1B],
+        [0x1B],
+        [0x10],
+        [0x1B],
+        [0x1B],
+    ]
+    assert scanned == [2]
+
+
+def test_failed_scan_returns_no_devices():
+    cache = TCAScanCache(clock=FakeClock())
+
+    assert cache.devices(0, lambda channel: None) == []
+    assert not cache.is_fresh(0)
@@ -0,0 +1,96 @@
+import pytest
+
+from pysquared.telemetry import RingBuffer, Telemetry, TelemetryChannel, decode
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def test_ring_buffer_overwrites_oldest():
+    ring = RingBuffer(3)
+    for value in range(5):
+        ring.append(value)
+
+    assert ring.values() == [2.0, 3.0, 4.0]
+    assert ring[-1] == 4.0
+    assert len(ring) == 3
+    with pytest.raises(IndexError):
+        ring[3]
+
+    ring.clear()
+    assert ring.values() == []
+
+
+def test_samples_aggregate_per_second():
+    channel = TelemetryChannel(((1, 10), (60, 10)))
+    channel.record(1.0, 0)
+    channel.record(3.0, 0)
+    channel.record(5.0, 1)
+
+    assert channel.tier(0) == [(0, 1.0, 3.0, 2.0)]
+
+
+def test_tiers_roll_up_with_min_max_mean():
+    channel = TelemetryChannel(((1, 120), (60, 10), (900, 4)))
+    # a period is rolled up once a sample of the next finest period arrives
+    for second in range(122):
+        channel.record(float(second % 60), second)
+
+    minutes = channel.tier(1)
+    assert minutes == [(0, 0.0, 59.0, 29.5), (60, 0.0, 59.0, 29.5)]
+    assert channel.tier(2) == []
+
+
+def test_coarse_tier_mean_is_weighted_by_samples():
+    channel = TelemetryChannel(((1, 4), (10, 4), (20, 4)))
+    channel.record(0.0, 0)  # one sample in the first 10 s
+    for second in range(10, 15):
+        channel.record(6.0, second)  # five samples in the next
+    channel.record(0.0, 20)  # closes the first 20 s period
+    channel.record(0.0, 40)
+    channel.record(0.0, 41)
+
+    assert channel.tier(2)[0] == (0, 0.0, 6.0, 5.0)
+
+
+def test_memory_is_bounded():
+    channel = TelemetryChannel(((1, 5), (60, 3)))
+    for second in range(1000):
+        channel.record(1.0, second)
+
+    assert len(channel.tier(0)) == 5
+    assert len(channel.tier(1)) == 3
+
+
+def test_record_skips_missing_values():
+    clock = FakeClock()
+    telemetry = Telemetry(["battery_voltage"], clock=clock)
+
+    telemetry.record("battery_voltage", None)
+    telemetry.record("battery_voltage", 7.4)
+    clock.now = 1
+    telemetry.record("battery_voltage", 7.2)
+
+    assert telemetry.channel("battery_voltage").tier(0) == [
+        (0, pytest.approx(7.4), pytest.approx(7.4), pytest.approx(7.4))
+    ]
+    with pytest.raises(KeyError):
+        telemetry.record("unknown", 1.0)
+
+
+def test_encoded_tier_decodes_on_the_ground():
+    clock = FakeClock()
+    telemetry = Telemetry(["mag_norm"], tiers=((1, 10), (60, 10)), clock=clock)
+    for second in range(3):
+        clock.now = second
+        telemetry.record("mag_norm", 2.0 * second)
+
+    name, tier, period, entries = decode(telemetry.encode("mag_norm", 0))
+
+    assert (name, tier, period) == ("mag_norm", 0, 1)
+    assert entries == [(0, 0.0, 0.0, 0.0), (1, 2.0, 2.0, 2.0)]
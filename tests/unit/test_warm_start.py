@@ -0,0 +1,143 @@
+from collections import OrderedDict
+
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.nvm.kvstore import KVStore
+from pysquared.warm_start import WARM_START_KEY, WarmStart
+
+
+def make_hardware(**values):
+    hardware = OrderedDict(
+        [("I2C1", False), ("TCA", False), ("Face0", False), ("Face1", False)]
+    )
+    hardware.update(values)
+    return hardware
+
+
+def test_snapshot_survives_reset():
+    datastore = ByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+    WarmStart.save(
+        store, make_hardware(I2C1=True, TCA=True, Face0=True), [[0x44, 0x48], []]
+    )
+    store.commit()
+
+    snapshot = WarmStart.take(KVStore(datastore, 0, 256), make_hardware())
+
+    assert snapshot.is_good("I2C1")
+    assert snapshot.is_good("Face0")
+    assert not snapshot.is_good("Face1")
+    assert not snapshot.is_good("Unknown")
+    assert snapshot.addresses(0) == [0x44, 0x48]
+    assert snapshot.addresses(1) == []
+    assert snapshot.addresses(4) is None
+
+
+def test_snapshot_is_only_used_once():
+    datastore = ByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+    WarmStart.save(store, make_hardware(TCA=True), [])
+    store.commit()
+
+    assert WarmStart.take(KVStore(datastore, 0, 256), make_hardware()) is not None
+    assert WarmStart.take(KVStore(datastore, 0, 256), make_hardware()) is None
+
+
+def test_no_snapshot_is_a_cold_boot():
+    store = KVStore(ByteArray(size=256), 0, 256)
+
+    assert WarmStart.take(store, make_hardware()) is None
+
+
+def test_snapshot_for_other_hardware_is_discarded():
+    store = KVStore(ByteArray(size=256), 0, 256)
+    store.set(WARM_START_KEY, {"keys": 1234, "hw": 0xFFFF, "tca": []})
+
+    assert WarmStart.take(store, make_hardware()) is None
+    assert WARM_START_KEY not in store
+
+
+def test_malformed_snapshot_is_discarded():
+    store = KVStore(ByteArray(size=256), 0, 256)
+    store.set(WARM_START_KEY, {"hw": "bad"})
+
+    assert WarmStart.take(store, make_hardware()) is None
+
+
+# Satellite.hardware as declared before the hardware is initialized
+SATELLITE_HARDWARE_KEYS = [
+    "I2C0",
+    "SPI0",
+    "I2C1",
+    "UART",
+    "IMU",
+    "Mag",
+    "SDcard",
+    "NEOPIX",
+    "WDT",
+    "TCA",
+    "Face0",
+    "Face1",
+    "Face2",
+    "Face3",
+    "Face4",
+    "RTC",
+]
+
+
+def test_snapshot_follows_the_boot_order():
+    datastore = ByteArray(size=256)
+
+    # boot: the snapshot is taken before init, then init marks the devices it found
+    hardware = OrderedDict([(key, False) for key in SATELLITE_HARDWARE_KEYS])
+    assert WarmStart.take(KVStore(datastore, 0, 256), hardware) is None
+    for key in ("I2C0", "SPI0", "I2C1", "UART", "SDcard", "TCA", "Face2"):
+        hardware[key] = True
+
+    store = KVStore(datastore, 0, 256)
+    WarmStart.save(store, hardware, [None, None, [0x44], None, None])
+    store.commit()
+
+    rebooted = OrderedDict([(key, False) for key in SATELLITE_HARDWARE_KEYS])
+    snapshot = WarmStart.take(KVStore(datastore, 0, 256), rebooted)
+
+    assert snapshot is not None
+    assert snapshot.is_good("SDcard")
+    assert snapshot.is_good("Face2")
+    assert snapshot.addresses(2) == [0x44]
+
+
+def test_snapshot_with_other_keys_is_discarded():
+    datastore = ByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+    hardware = make_hardware(TCA=True)
+    hardware["SD Card"] = True
+    WarmStart.save(store, hardware, [])
+    store.commit()
+
+    assert WarmStart.take(KVStore(datastore, 0, 256), make_hardware()) is None
+
+
+def test_snapshot_that_does_not_fit_is_dropped():
+    datastore = ByteArray(size=512)
+    store = KVStore(datastore, 0, 512)
+    store.set("config", {f"override_{i}": i for i in range(12)})
+    WarmStart.save(
+        store,
+        make_hardware(TCA=True),
+        [[0x40 + i for i in range(12)] for _ in range(5)],
+    )
+
+    assert not WarmStart.commit(store)
+
+    reloaded = KVStore(datastore, 0, 512)
+    assert WARM_START_KEY not in reloaded
+    assert reloaded.get("config")["override_11"] == 11
+
+
+def test_snapshot_that_fits_is_committed():
+    datastore = ByteArray(size=256)
+    store = KVStore(datastore, 0, 256)
+    WarmStart.save(store, make_hardware(TCA=True), [[0x44]])
+
+    assert WarmStart.commit(store)
+    assert WARM_START_KEY in KVStore(datastore, 0, 256)
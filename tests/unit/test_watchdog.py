@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+import pysquared.nvm.counter as counter
+from mocks.circuitpython.byte_array import ByteArray
+from pysquared.log.sinks import RingSink
+from pysquared.logger import Logger
+from pysquared.watchdog import Watchdog
+
+
+class FakePin:
+    def __init__(self):
+        self._value = False
+        self.pulses = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if self._value and not value:
+            self.pulses += 1
+        self._value = value
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_watchdog():
+    ring = RingSink(capacity=10)
+    logger = Logger(error_counter=counter.Counter(0, ByteArray(size=8)), sinks=[ring])
+    pin = FakePin()
+    clock = FakeClock()
+    return Watchdog(pin, logger, clock), pin, clock, ring
+
+
+def test_pets_without_registered_tasks():
+    watchdog, pin, _, _ = make_watchdog()
+
+    assert watchdog.pet()
+    assert watchdog.pet()
+    assert pin.pulses == 2
+    assert not pin.value
+    assert watchdog.pets == 2
+
+
+def test_withholds_pet_when_a_task_is_stalled():
+    watchdog, pin, clock, ring = make_watchdog()
+    watchdog.register("listen", timeout=10)
+    watchdog.register("beacon", timeout=30)
+
+    clock.now = 5
+    assert watchdog.pet()
+
+    clock.now = 11
+    assert watchdog.stalled() == ["listen"]
+    assert not watchdog.pet()
+    assert not watchdog.pet()
+    assert pin.pulses == 1
+
+    # the stall is only reported once
+    assert len(ring.entries()) == 1
+    assert "listen" in ring.entries()[0]
+
+    watchdog.check_in("listen")
+    assert watchdog.pet()
+    assert pin.pulses == 2
+
+
+def test_every_task_must_check_in():
+    watchdog, _, clock, _ = make_watchdog()
+    watchdog.register("listen", timeout=10)
+    watchdog.register("beacon", timeout=10)
+
+    clock.now = 8
+    watchdog.check_in("listen")
+    clock.now = 12
+
+    assert watchdog.stalled() == ["beacon"]
+    assert not watchdog.pet()
+
+
+def test_unregister():
+    watchdog, _, clock, _ = make_watchdog()
+    watchdog.register("listen", timeout=10)
+
+    clock.now = 20
+    assert not watchdog.pet()
+
+    watchdog.unregister("listen")
+    assert watchdog.pet()
+    watchdog.unregister("listen")
+
+
+def test_check_in_unknown_task():
+    watchdog, _, _, _ = make_watchdog()
+
+    with pytest.raises(KeyError):
+        watchdog.check_in("missing")
+
+
+def test_run_pulses_while_healthy():
+    watchdog, pin, clock, _ = make_watchdog()
+    watchdog.register("listen", timeout=10)
+
+    async def scenario():
+        task = asyncio.create_task(watchdog.run(interval=0.01, pulse_width=0.001))
+        await asyncio.sleep(0.05)
+        healthy_pulses = pin.pulses
+
+        clock.now = 20
+        await asyncio.sleep(0.05)
+        stalled_pulses = pin.pulses
+        task.cancel()
+        return healthy_pulses, stalled_pulses
+
+    healthy_pulses, stalled_pulses = asyncio.run(scenario())
+
+    assert healthy_pulses >= 2
+    # at most a pulse already in progress completes after the stall
+    assert stalled_pulses - healthy_pulses <= 1
+    assert watchdog.pets == pin.pulses